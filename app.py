@@ -1,15 +1,68 @@
+from __future__ import annotations
+
 import streamlit as st
-import pandas as pd
-import gspread
-from google.oauth2 import service_account
-from datetime import datetime
-import shutil
+from datetime import datetime, timedelta
+import functools
 import os
+import threading
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import auth_store
+import fake_sheet
+import lazy_import
+import ledger_registry
+import metrics
+import perf_trace
+
+# 데이터/구글 라이브러리는 처음 사용할 때 import 합니다. (로그인 화면은 이 비용 없이 바로 표시)
+# 로그인 직후 start_warmup() 이 백그라운드에서 미리 불러오고 워크시트 연결까지 만들어 둡니다.
+pd = lazy_import.module("pandas")
+np = lazy_import.module("numpy")
+gspread = lazy_import.module("gspread")
+service_account = lazy_import.module("google.oauth2.service_account")
+change_journal = lazy_import.module("change_journal")
+column_schema = lazy_import.module("column_schema")
+customer_alias = lazy_import.module("customer_alias")
+customer_report = lazy_import.module("customer_report")
+due_index = lazy_import.module("due_index")
+editor_delta = lazy_import.module("editor_delta")
+form_ingest = lazy_import.module("form_ingest")
+id_allocator = lazy_import.module("id_allocator")
+ledger_export = lazy_import.module("ledger_export")
+lead_time = lazy_import.module("lead_time")
+sheets_http = lazy_import.module("sheets_http")
+snapshot_store = lazy_import.module("snapshot_store")
+status_board = lazy_import.module("status_board")
+timeline = lazy_import.module("timeline")
+validation = lazy_import.module("validation")
+
+# 워밍업 순서 (무거운 것부터)
+WARMUP_MODULES = [
+    "pandas", "numpy", "gspread", "google.oauth2.service_account",
+    "due_index", "validation", "editor_delta", "change_journal", "snapshot_store", "ledger_export", "id_allocator",
+    "customer_report", "lead_time", "form_ingest", "customer_alias", "column_schema", "ledger_registry",
+    "sheets_http", "status_board", "timeline",
+]
 
 st.set_page_config(page_title="신성EP 샘플 관리 대장", layout="wide")
 
+# 기본 대장. 여러 대장을 한 프로세스에서 서비스하려면 ssep_ledgers.json 에 목록을 적습니다. (ledger_registry.py 참고)
 SHEET_ID = "1aHe7GQsPnZfMjZVPy4jt0elCEADKubWSSeonhZTKR9E"
 WORKSHEET_NAME = "Form_Responses 1"  # Google Form 실제 응답 탭 이름
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 정기 데이터 스냅샷 주기 (초). 마지막 스냅샷 이후 이 시간이 지나면 페이지 로드 시 자동 스냅샷
+SNAPSHOT_INTERVAL_SEC = int(os.environ.get("SSEP_SNAPSHOT_INTERVAL_SEC", 3600))
+
+# 열려 있는 화면이 공유 대장 캐시의 변경을 확인하는 주기 (초). 0 이면 자동 반영 안 함
+LIVE_POLL_SEC = int(os.environ.get("SSEP_LIVE_POLL_SEC", 15))
+
+# 🗂️ 진행 보드에서 상태별로 처음 보여 줄 카드 수 ("더 보기" 한 번에 같은 수만큼 더)
+BOARD_PAGE_SIZE = int(os.environ.get("SSEP_BOARD_PAGE", 10))
+
+# 에디터에 표시하는 검증 결과 컬럼 (시트에는 저장하지 않음)
+VALIDATION_COL = "⚠️ 검증"
 
 # 1. 구글 시트와 앱의 순서를 100% 일치시키기 위한 기준 리스트
 # 시트에 적힌 실제 제목과 정확히 일치해야 합니다.
@@ -20,6 +73,12 @@ COLUMN_ORDER = [
     "샘플단가", "샘플금액", "도면접수일", "자재준비", "샘플 완료일", 
     "출하일", "진행상태", "출하 장소"
 ]
+# 샘플 번호(NO)는 시트 마지막 열에 저장합니다. (폼 응답 열 뒤에 두어 폼이 채우는 열 위치와 겹치지 않음)
+ID_COL = "NO"
+SHEET_COLUMNS = COLUMN_ORDER + [ID_COL]
+# 시트에서 읽을 때: 앱이 다시 계산하는 열은 내려받지 않고, 수량/단가는 표시 형식 없는 숫자로 읽습니다. (form_ingest.ColumnProjection)
+DERIVED_COLUMNS = ["샘플금액", "진행상태"]
+UNFORMATTED_COLUMNS = ["요청수량", "샘플단가"]
 
 def get_credentials_info():
     if "connections" in st.secrets and "gsheets" in st.secrets["connections"]:
@@ -35,77 +94,241 @@ def get_credentials_info():
     return info
 
 @st.cache_resource
-def get_worksheet():
+def get_sheets_client():
+    """모든 대장이 공유하는 구글 시트 클라이언트 (인증 1회)."""
+    if fake_sheet.is_enabled():
+        # 오프라인 모드: SSEP_SHEET_BACKEND=fake (fake_sheet.py 참고)
+        return fake_sheet.get_fake_client()
     info = get_credentials_info()
     scopes = [
         "https://www.googleapis.com/auth/spreadsheets",
         "https://www.googleapis.com/auth/drive",
     ]
     creds = service_account.Credentials.from_service_account_info(info, scopes=scopes)
-    client = gspread.authorize(creds)
-    sh = client.open_by_key(SHEET_ID)
-    if WORKSHEET_NAME:
+    # keep-alive 연결 풀 / gzip / 백그라운드 토큰 갱신을 설정한 세션 하나로 모든 시트 호출 (sheets_http.py 참고)
+    session = sheets_http.make_session(creds)
+    sheets_http.register_metrics(session)
+    return gspread.authorize(creds, session=session)
+
+def open_worksheet(config: ledger_registry.LedgerConfig):
+    """대장 설정의 스프레드시트/탭을 엽니다. (대장마다 처음 한 번, LedgerState 가 보관)"""
+    sh = get_sheets_client().open_by_key(config.sheet_id)
+    if config.worksheet:
         try:
-            ws = sh.worksheet(WORKSHEET_NAME)
+            ws = sh.worksheet(config.worksheet)
         except gspread.WorksheetNotFound:
-            ws = sh.add_worksheet(title=WORKSHEET_NAME, rows=1000, cols=30)
+            ws = sh.add_worksheet(title=config.worksheet, rows=1000, cols=30)
             # 새 시트 생성 시 기본 헤더는 시트 구조에 맞게 설정
     else:
         ws = sh.sheet1
-    return ws
+    # 시트 API 호출 수/시간/오류를 metrics 에 기록하는 프록시로 감싸서 돌려줍니다.
+    metrics.CACHE_MISSES.inc(cache="worksheet")
+    return metrics.InstrumentedWorksheet(ws)
 
-def load_sheet_as_dataframe():
-    ws = get_worksheet()
-    values = ws.get_all_values()
-    
-    if not values or len(values) < 1:
-        return pd.DataFrame(columns=["NO"] + COLUMN_ORDER), ws
-
-    # 1. 시트의 실제 헤더와 데이터를 분리합니다. 
-    raw_header = [str(h).strip() for h in values[0]]
-    raw_data = values[1:]
-
-    # 2. 시트 원본 순서대로 데이터프레임을 생성합니다. 
-    df = pd.DataFrame(raw_data, columns=raw_header)
-
-    # 3. [데이터 밀림 방지 로직] - COLUMN_ORDER에 정의된 모든 컬럼을 순서대로 보장
-    # 시트에 없는 열은 빈 값("")으로 생성하여 밀림을 방지합니다.
-    for col in COLUMN_ORDER:
-        if col not in df.columns:
-            df[col] = ""  # 시트에 없는 열은 빈 값으로 생성
-
-    # 4. [중요] COLUMN_ORDER 순서로 엄격히 재배치 (데이터 밀림 완전 방지)
-    df_reordered = pd.DataFrame()
-    for col in COLUMN_ORDER:
-        if col in df.columns:
-            df_reordered[col] = df[col]
-        else:
-            df_reordered[col] = ""
-    df = df_reordered.copy()
-
-    # 5. [중요] 숫자 컬럼을 먼저 변환 (fillna 전에 처리하여 타입 유지)
-    num_cols = ["요청수량", "샘플단가", "샘플금액"]
-    for col in num_cols:
-        if col in df.columns:
-            # 문자열로 변환 후 숫자만 추출하여 정수로 변환
-            df[col] = df[col].astype(str).str.replace(r'[^0-9\-]', '', regex=True)
-            df[col] = df[col].replace('', '0').replace('-', '0')
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+@st.cache_resource
+def get_ledger_registry() -> ledger_registry.LedgerRegistry:
+    default = ledger_registry.LedgerConfig("main", SHEET_ID, WORKSHEET_NAME, "샘플 관리 대장", BASE_DIR)
+    configs, budget_mb = ledger_registry.load_configs(BASE_DIR, default)
+    return ledger_registry.LedgerRegistry(configs, open_worksheet, make_ledger_feed, budget_mb)
+
+def current_ledger() -> ledger_registry.LedgerState:
+    """이 세션이 보고 있는 대장 (사이드바에서 선택, 기본은 첫 번째 대장)."""
+    return get_ledger_registry().get(st.session_state.get("ledger_key"))
+
+def get_worksheet():
+    return current_ledger().worksheet()
+
+@st.cache_resource
+def start_warmup():
+    """
+    로그인 성공 시 프로세스당 한 번, 백그라운드 스레드에서 데이터 라이브러리를 import 하고
+    인증/스프레드시트 연결(get_worksheet)까지 만들어 둡니다. 실패해도 화면 스레드에서 다시 시도하며 오류를 표시합니다.
+    """
+    def run():
+        lazy_import.preload(WARMUP_MODULES)
+        try:
+            get_ledger_registry().get().worksheet()  # 세션 정보가 없는 스레드이므로 기본 대장
+        except BaseException:  # st.stop() (StopException) 포함
+            pass
+
+    thread = threading.Thread(target=run, name="ssep-warmup", daemon=True)
+    thread.start()
+    return thread
+
+@st.cache_resource
+def start_metrics_exporter():
+    """SSEP_METRICS_PORT / SSEP_METRICS_FILE 설정 시 프로세스당 한 번만 내보내기 시작."""
+    return metrics.start_exporters_from_env()
+
+def sheet_revision(ws):
+    """스프레드시트 수정 시각 (Drive 메타데이터). 알 수 없으면 None (새로고침마다 새 행 범위를 읽음)."""
+    spreadsheet = getattr(ws, "spreadsheet", None)
+    if spreadsheet is None or not hasattr(spreadsheet, "get_lastUpdateTime"):
+        return None
+    try:
+        return spreadsheet.get_lastUpdateTime()
+    except Exception:
+        return None
+
+def ledger_projection() -> form_ingest.ColumnProjection:
+    """시트에서 읽을 열: 앱이 다시 계산하는 열 제외, 수량/단가는 표시 형식 없는 숫자로. (벤치마크도 같은 설정 사용)"""
+    return form_ingest.ColumnProjection(
+        [c for c in SHEET_COLUMNS if c not in DERIVED_COLUMNS], unformatted=UNFORMATTED_COLUMNS)
+
+def make_ledger_feed(ledger: ledger_registry.LedgerState) -> form_ingest.LedgerFeed:
+    """
+    대장별로 프로세스가 공유하는 캐시. 평소에는 시트 수정 시각만 확인하고, 바뀌었을 때 새 폼 응답 행만 읽어 붙입니다.
+    앱에서 저장한 행은 apply_updates 로 반영합니다. (form_ingest.py 참고)
+    """
+    return form_ingest.LedgerFeed(functools.partial(sheet_rows_to_dataframe, ledger=ledger),
+                                  revision=sheet_revision, projection=ledger_projection())
+
+def get_ledger_feed() -> form_ingest.LedgerFeed:
+    return current_ledger().feed
+
+@perf_trace.traced("load_ledger")
+def load_ledger():
+    """
+    화면용 대장 로드. 공유 캐시(get_ledger_feed)를 최신으로 맞추고 그 frame 을 그대로 돌려줍니다.
+    세션은 대장을 복사해 두지 않고 마지막으로 본 version 만 보관하므로, 대장 메모리는 세션 수와 관계없이
+    대장마다 한 벌이고 메모리 예산(enforce_budget)으로 비우면 실제로 풀립니다.
+    돌려준 frame 은 공유 객체이므로 고치지 말 것 (화면에서 바꿀 때는 .copy() 후. 편집 내용은 에디터 상태에만 있음)
+    """
+    ledger = current_ledger()
+    with perf_trace.span("get_worksheet"):
+        metrics.CACHE_LOOKUPS.inc(cache="worksheet")
+        ws = ledger.worksheet()
+    feed = ledger.feed
+    with perf_trace.span("load.fetch"):
+        feed.refresh(ws)
+        frame, version = feed.snapshot()
+    # 여러 대장을 띄운 경우: 메모리 예산을 넘으면 오래 안 쓴 다른 대장의 캐시를 비움
+    get_ledger_registry().enforce_budget(keep=ledger.key)
+
+    with perf_trace.span("load.sync_session"):
+        seen = st.session_state.get("ledger_version")
+        if st.session_state.get("ledger_frame_key") == ledger.key and seen is not None:
+            changes = feed.changes_since(seen) or []
+            appended = sum(len(rows) for _, kind, rows in changes if kind == "append" and rows is not None)
+            if appended:
+                st.toast(f"📥 새로 들어온 행 {appended}건을 반영했습니다.")
+    st.session_state.ledger_version = version
+    st.session_state.ledger_frame_key = ledger.key
+
+    metrics.ROWS_LOADED.set(len(frame))
+    return frame, ws
+
+def render_live_status():
+    """
+    LIVE_POLL_SEC 마다 이 부분만 다시 실행해 공유 캐시를 새로고침하고 version 을 비교합니다.
+    바뀌었으면 화면 전체를 다시 실행(load_ledger 가 새 공유 frame 을 씀)하고, 저장하지 않은 편집이 있으면 알림만 표시합니다.
+    시트 호출은 프로세스 전체에서 POLL_INTERVAL_SEC 에 한 번(수정 시각 확인)이므로 열린 화면 수와 무관합니다.
+    """
+    ledger = current_ledger()
+    if ledger.key != st.session_state.get("ledger_frame_key"):
+        return  # 대장을 바꾼 직후: 화면 전체 rerun 에서 load_ledger 가 처리
+    feed = ledger.feed
+    try:
+        feed.refresh(ledger.worksheet())
+    except Exception:
+        return  # 다음 주기에 다시 시도 (로드 오류 표시는 load_ledger 에서)
+    if feed.version == st.session_state.get("ledger_version"):
+        return
+    if editor_delta.has_edits(st.session_state.get("main_editor")):
+        st.caption("🔔 다른 곳에서 대장이 바뀌었습니다. 저장하거나 '🔄 시트 다시 불러오기'를 누르면 반영됩니다.")
+    else:
+        st.rerun(scope="app")
+
+if LIVE_POLL_SEC > 0 and hasattr(st, "fragment"):  # st.fragment(run_every) 는 streamlit 1.37 이상
+    render_live_status = st.fragment(run_every=LIVE_POLL_SEC)(render_live_status)
+
+def sheet_rows_to_dataframe(ws, raw_header, raw_data, first_row=2, ledger=None, known_ids=None):
+    """
+    시트 원본 행(raw_data, first_row 행부터)을 정규화된 대장 DataFrame 으로 바꿉니다.
+    전체 로드와 새 폼 응답 tail-read(form_ingest) 가 같은 정규화를 씁니다.
+    ledger: NO 번호를 발급할 대장 (기본: 이 세션의 대장)
+    """
+    if not raw_header:
+        return pd.DataFrame(columns=["NO"] + COLUMN_ORDER)
+
+    with perf_trace.span("load.reorder"):
+        # 2. 시트 원본 순서대로 데이터프레임을 생성합니다. 
+        #    index 는 시트 행 번호(헤더=1행)로 두어 저장 시 바뀐 행만 해당 위치에 기록합니다.
+        df = pd.DataFrame(raw_data, columns=raw_header, index=range(first_row, first_row + len(raw_data)))
+
+        # 3. [데이터 밀림 방지 로직] - COLUMN_ORDER에 정의된 모든 컬럼을 순서대로 보장
+        # 시트에 없는 열은 빈 값("")으로 생성하여 밀림을 방지합니다.
+        for col in COLUMN_ORDER:
+            if col not in df.columns:
+                df[col] = ""  # 시트에 없는 열은 빈 값으로 생성
+
+        # 4. [중요] COLUMN_ORDER 순서로 엄격히 재배치 (데이터 밀림 완전 방지)
+        df_reordered = pd.DataFrame()
+        for col in COLUMN_ORDER:
+            if col in df.columns:
+                df_reordered[col] = df[col]
+            else:
+                df_reordered[col] = ""
+        raw_ids = df[ID_COL] if ID_COL in df.columns else pd.Series("", index=df.index)
+        df = df_reordered.copy()
+
+    with perf_trace.span("load.numeric"):
+        # 5. [중요] 숫자 컬럼을 먼저 변환 (fillna 전에 처리하여 타입 유지)
+        num_cols = ["요청수량", "샘플단가", "샘플금액"]
+        for col in num_cols:
+            if col in df.columns:
+                # 숫자(형식 없이 읽은 값)/숫자 문자열은 그대로 변환하고,
+                # 나머지("1,000", "10개" 등)만 문자열에서 숫자만 추출하여 정수로 변환
+                num = pd.to_numeric(df[col], errors='coerce')
+                rest = num.isna()
+                if rest.any():
+                    digits = df.loc[rest, col].astype(str).str.replace(r'[^0-9\-]', '', regex=True)
+                    num[rest] = pd.to_numeric(digits.replace({'': '0', '-': '0'}), errors='coerce')
+                df[col] = num.fillna(0).astype(int)
     
-    # 6. 숫자 컬럼이 아닌 나머지 컬럼의 NaN 값을 빈 문자열로 처리
-    for col in df.columns:
-        if col not in num_cols:
-            df[col] = df[col].fillna("")
+        # 6. 숫자 컬럼이 아닌 나머지 컬럼의 NaN 값을 빈 문자열로 처리
+        for col in df.columns:
+            if col not in num_cols:
+                df[col] = df[col].fillna("")
 
-    # 7. 샘플금액 자동 계산: 요청수량 * 샘플단가
-    if "요청수량" in df.columns and "샘플단가" in df.columns and "샘플금액" in df.columns:
-        df["샘플금액"] = (df["요청수량"] * df["샘플단가"]).astype(int)
+        # 7. 샘플금액 자동 계산: 요청수량 * 샘플단가
+        if "요청수량" in df.columns and "샘플단가" in df.columns and "샘플금액" in df.columns:
+            df["샘플금액"] = (df["요청수량"] * df["샘플단가"]).astype(int)
 
     # 8. 진행상태 자동 트리거 로직
     if "진행상태" not in df.columns:
         df["진행상태"] = ""
     
     # 진행상태 자동 설정 (우선순위: 출하일 > 샘플 완료일 > 자재준비 > 기본값)
+    with perf_trace.span("load.status"):
+        derive_progress_status(df)
+
+    # 9. NO(번호): 시트의 번호 열 값을 쓰고, 비어 있거나 중복된 행에만 새 번호를 발급해 시트에 기록합니다. (맨 앞에 표시)
+    with perf_trace.span("load.ids"):
+        df.insert(0, ID_COL, assign_row_ids(ws, raw_header, raw_ids, first_row, get_id_allocator(ledger), known_ids))
+    return df
+
+def get_id_allocator(ledger=None) -> id_allocator.IdAllocator:
+    return (ledger or current_ledger()).resource("ids", id_allocator.IdAllocator)
+
+def assign_row_ids(ws, header, raw_ids: pd.Series, first_row=2, allocator=None, known_ids=None):
+    """
+    시트 번호 열의 빈/중복 NO 를 채운 int64 배열. 시트 기록에 실패하면 이번 화면에서만 쓰는 번호로 채웁니다.
+    known_ids: 일부 행만 정규화할 때 대장의 나머지 행이 쓰는 NO (이 번호와 겹치면 새로 발급)
+    """
+    allocator = allocator or get_id_allocator()
+    try:
+        ids, assigned = id_allocator.ensure_sheet_ids(allocator, ws, header, raw_ids, first_row=first_row,
+                                                      known=known_ids)
+        metrics.IDS_ASSIGNED.inc(assigned)
+        return ids
+    except Exception as e:
+        metrics.ERRORS.inc(kind="id_assign_failed")
+        st.warning(f"NO 번호를 시트에 기록하지 못했습니다. (다음 로드 때 다시 발급) {e}")
+        return allocator.assign_missing(raw_ids, known_ids)[0]
+
+def derive_progress_status(df: pd.DataFrame) -> pd.DataFrame:
+    """진행상태 자동 설정 (우선순위: 출하일 > 샘플 완료일 > 자재준비 > 기본값). df 를 직접 수정합니다."""
     for idx in df.index:
         status = "접수"  # 기본값
         
@@ -128,27 +351,106 @@ def load_sheet_as_dataframe():
                                 status = "생산중"
         
         df.at[idx, "진행상태"] = status
+    return df
 
-    # 9. NO(번호) 컬럼은 앱 전용이므로 맨 앞에 추가합니다. 
-    df.insert(0, "NO", range(1, len(df) + 1))
-    df["NO"] = df["NO"].astype(int)
-
-    return df, ws
-
+@perf_trace.traced("save_dataframe_to_sheet")
 def save_dataframe_to_sheet(df: pd.DataFrame, ws):
-    """저장 시 NO를 제외하고 COLUMN_ORDER 순서로 시트에 기록합니다."""
+    """저장 시 SHEET_COLUMNS 순서(COLUMN_ORDER + NO)로 시트에 기록합니다."""
     try:
-        # NO 컬럼은 시트 저장용이 아니므로 제외합니다. 
-        to_save = df[COLUMN_ORDER].copy().fillna("")
+        to_save = df[SHEET_COLUMNS].copy().fillna("")
         
-        ws.clear() # 기존 데이터를 지우고 새로 씁니다. 
-        # 헤더를 포함하여 한 번에 업데이트합니다. 
-        ws.update('A1', [to_save.columns.tolist()] + to_save.values.tolist())
+        with metrics.SAVE_LATENCY.time():
+            ws.clear() # 기존 데이터를 지우고 새로 씁니다. 
+            # 헤더를 포함하여 한 번에 업데이트합니다. 
+            ws.update('A1', [to_save.columns.tolist()] + to_save.values.tolist())
+        return True
+    except Exception as e:
+        metrics.ERRORS.inc(kind="save_failed")
+        st.error(f"구글 시트 저장 실패: {e}")
+        return False
+
+@perf_trace.traced("save_delta_to_sheet")
+def save_delta_to_sheet(delta: editor_delta.EditorDelta, ws, ledger_df: pd.DataFrame):
+    """
+    에디터에서 건드린 행만 시트에 기록합니다. (수정 행 batch_update, 새 행 append, 삭제 행 deleteDimension)
+    시트의 열 순서가 SHEET_COLUMNS 와 다르면 한 번 전체를 SHEET_COLUMNS 로 다시 씁니다.
+    (헤더는 저장 직전에 1행만 읽어 확인. DataFrame.attrs 에 두면 pandas 연산마다 deepcopy 되어 느려짐)
+    수정/삭제할 행의 NO 가 시트와 다르면(다른 곳에서 행을 지우거나 끼워 넣음) 쓰지 않고
+    대장을 다시 동기화하도록 요청한 뒤 편집을 버립니다.
+    """
+    row_ids = pd.concat([delta.updates[ID_COL], ledger_df[ID_COL].reindex(delta.deletes)])
+    try:
+        with metrics.SAVE_LATENCY.time():
+            sheet_header = [str(h).strip() for h in ws.row_values(1)]
+            if sheet_header[:len(SHEET_COLUMNS)] != SHEET_COLUMNS:
+                ws.clear()
+                to_save = editor_delta.apply_delta(ledger_df, delta)[SHEET_COLUMNS].fillna("")
+                ws.update('A1', [SHEET_COLUMNS] + to_save.values.tolist())
+            else:
+                editor_delta.write_delta(ws, delta, SHEET_COLUMNS, row_ids=row_ids, id_col=ID_COL)
         return True
+    except editor_delta.RowMismatchError:
+        metrics.ERRORS.inc(kind="save_conflict")
+        get_ledger_feed().request_sync()
+        forget_unsaved_edits()
+        st.error("저장하지 않았습니다. 다른 곳에서 시트의 행이 추가/삭제되어 행 위치가 달라졌습니다. "
+                 "최신 대장을 다시 불러오니 다시 편집해 주세요.")
+        return False
     except Exception as e:
+        metrics.ERRORS.inc(kind="save_failed")
         st.error(f"구글 시트 저장 실패: {e}")
         return False
 
+def with_hidden_columns(frame: pd.DataFrame, ledger_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    역할 때문에 에디터에 없던 컬럼을 대장 값으로 채운 frame. (index = 시트 행 번호)
+    수정 행을 시트에 쓸 때 보이지 않던 칸이 빈 값으로 덮이지 않게 합니다.
+    """
+    hidden = [c for c in ledger_df.columns if c not in frame.columns]
+    if not hidden or frame.empty:
+        return frame
+    return frame.join(ledger_df.loc[frame.index, hidden])
+
+def find_blocking_errors(delta: editor_delta.EditorDelta):
+    """저장을 막을 검증 오류 목록. 기존 행은 이번에 편집한 칸만, 새 행은 모든 칸을 봅니다."""
+    problems = []
+    for row, col, message in validation.validate(delta.updates).cells():
+        if col in delta.edited_columns.get(row, ()):
+            problems.append(f"NO {delta.updates.at[row, 'NO']} · {col}: {message}")
+    for row, col, message in validation.validate(delta.inserts).cells():
+        problems.append(f"새 행 {delta.inserts.index.get_loc(row) + 1} · {col}: {message}")
+    return problems
+
+def normalize_rows(frame: pd.DataFrame, qty_col) -> pd.DataFrame:
+    """저장 전 값 정리: 선택 컬럼 빈 값, 수량/단가 정수화, 샘플금액·진행상태 재계산. (건드린 행에만 적용)"""
+    frame = frame.copy()
+
+    # 운송편 / 자재준비 값 정리
+    for col in ("운송편", "자재준비"):
+        if col in frame.columns:
+            frame[col] = frame[col].fillna("").astype(str)
+
+    # 수량/단가 숫자 처리
+    for col in dict.fromkeys(c for c in (qty_col, "샘플단가") if c):
+        if col in frame.columns:
+            # 숫자는 그대로, "1,000" 같은 문자열은 숫자만 추출, 나머지는 0
+            cleaned = frame[col].astype(str).str.replace(r"[^0-9\-]", "", regex=True)
+            frame[col] = (
+                pd.to_numeric(frame[col], errors="coerce")
+                .fillna(pd.to_numeric(cleaned, errors="coerce"))
+                .fillna(0)
+                .astype(int)
+            )
+
+    # 샘플금액 자동 재계산: 요청수량 * 샘플단가
+    if "요청수량" in frame.columns and "샘플단가" in frame.columns and "샘플금액" in frame.columns:
+        frame["샘플금액"] = (frame["요청수량"] * frame["샘플단가"]).astype(int)
+
+    # 진행상태 자동 재계산 (우선순위: 출하일 > 샘플 완료일 > 자재준비 > 기본값)
+    if "진행상태" in frame.columns:
+        derive_progress_status(frame)
+    return frame
+
 def parse_date_safe(x):
     x = str(x).strip()
     if not x:
@@ -161,6 +463,7 @@ def parse_date_safe(x):
     return None
 
 # 논리적 중복 컬럼 제거: '요청수량'과 '요청수량_2' 같이 있으면 원본만 남기고 뒤의 것 삭제
+@perf_trace.traced("drop_logical_duplicate_columns")
 def drop_logical_duplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
     cols = list(df.columns)
     keep = []
@@ -189,61 +492,141 @@ def drop_logical_duplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df[keep]
 
 # 간단 로그인 시스템 ---------------------------------
-ADMIN_ID = "admin"
-ADMIN_PW = "1234"
+# 계정은 ssep_users.json 에 해시로 저장합니다. 파일이 없으면 st.secrets 의 [auth] 또는
+# 환경 변수(SSEP_ADMIN_PASSWORD, SSEP_CLIENTS)의 초기 계정으로 한 번 만듭니다. (auth_store.py 참고)
+# 이후 추가/변경은 python auth_store.py set <역할> <아이디> 로 합니다.
+
+@st.cache_resource
+def get_auth_store() -> auth_store.AuthStore:
+    try:
+        section = st.secrets["auth"] if "auth" in st.secrets else None
+    except Exception:  # secrets.toml 이 없음
+        section = None
+    return auth_store.AuthStore(BASE_DIR, seed=auth_store.seed_from(section))
+
+def get_snapshot_store() -> snapshot_store.SnapshotStore:
+    return current_ledger().resource("snapshots", snapshot_store.SnapshotStore)
+
+def render_snapshot_panel(ledger_df: pd.DataFrame, ws):
+    """🔄 백업/복원: 대장 데이터 스냅샷 생성 및 선택한 스냅샷으로 시트 복원 (관리자 전용)."""
+    store = get_snapshot_store()
+    st.markdown("### 🔄 백업/복원")
+
+    msg = st.session_state.pop("snapshot_msg", None)
+    if msg:
+        st.success(msg)
+
+    if st.button("💾 현재 데이터 스냅샷", help="현재 대장 데이터를 스냅샷으로 저장합니다 (바뀐 부분만 저장)"):
+        try:
+            m = store.take(ledger_df, SHEET_COLUMNS, reason="수동")
+            if m["unchanged"]:
+                st.info(f"직전 스냅샷과 동일합니다: {m['ts']}")
+            else:
+                st.success(f"✅ 스냅샷 저장: {m['ts']} ({m['rows']:,}행, 새 청크 {m['new_chunks']}개)")
+        except Exception as e:
+            st.error(f"❌ 스냅샷 실패: {e}")
+
+    snapshots = store.list_snapshots()
+    if not snapshots:
+        st.caption("저장된 스냅샷이 없습니다.")
+        return
+
+    labels = {s["id"]: f"{s['ts'].replace('T', ' ')} · {s['rows']:,}행 · {s['reason']}" for s in snapshots}
+    selected = st.selectbox("복원할 스냅샷", list(labels), format_func=labels.get, key="restore_snapshot_id")
+    confirm = st.checkbox("현재 시트 내용을 선택한 스냅샷으로 덮어씁니다", key="restore_confirm")
+    if st.button("⏮️ 선택한 스냅샷으로 복원", disabled=not confirm):
+        try:
+            # 복원 전 현재 상태를 먼저 남겨 되돌릴 수 있게 합니다.
+            store.take(ledger_df, SHEET_COLUMNS, reason="복원 전 자동")
+            written = store.restore_to_sheet(selected, ledger_df, ws)
+            restored = store.load(selected)
+            if ID_COL in restored.columns:  # NO 를 시트에 기록한 뒤의 스냅샷
+                restored[ID_COL] = pd.to_numeric(restored[ID_COL], errors="coerce")
+            else:
+                restored.insert(0, ID_COL, range(1, len(restored) + 1))
+            record_changes(ledger_df, ledger_df, restored)
+            get_ledger_feed().request_sync()
+            st.session_state.snapshot_msg = f"✅ 복원 완료: {labels[selected]} ({written:,}행 기록)"
+            st.rerun()
+        except Exception as e:
+            st.error(f"❌ 복원 실패: {e}")
 
-CLIENTS = {
-    # 아이디: (비밀번호, 업체명)
-    "infac": ("1234", "infac"),
-    "sample": ("1234", "sample"),  # 필요하면 나중에 추가 / 수정
-}
+def render_profile_panel():
+    """⏱️ 성능 프로파일: 구간별 p50/p95/p99 (프로세스 전체 최근 측정) + 직전 rerun 구간별 시간."""
+    st.markdown("### ⏱️ 성능 프로파일")
+    with st.expander("구간별 소요 시간 (ms)", expanded=False):
+        rows = perf_trace.summary()
+        if rows:
+            st.dataframe(pd.DataFrame(rows).set_index("stage"), use_container_width=True)
+        else:
+            st.caption("아직 측정값이 없습니다.")
+
+        last = st.session_state.get("last_profile") or []
+        if last:
+            st.caption("직전 실행 (rerun)")
+            st.dataframe(pd.DataFrame(last, columns=["stage", "ms"]), use_container_width=True, hide_index=True)
+
+        session = getattr(getattr(get_sheets_client(), "http_client", None), "session", None)
+        if hasattr(session, "adapters"):
+            http = sheets_http.pool_stats(session)
+            st.caption(f"시트 HTTP: 요청 {http['requests']:,}건 · 새 연결 {http['connections']:,}개 "
+                       f"(연결 재사용 {http['reuse_ratio']:.0%})")
+
+        registry = get_ledger_registry()
+        if len(registry.configs) > 1:
+            st.caption(f"대장 캐시 (예산 {registry.budget_bytes // 1024 // 1024:,}MB, 비운 횟수 {registry.evictions})")
+            st.dataframe(pd.DataFrame(registry.stats()), use_container_width=True, hide_index=True)
+
+        st.download_button(
+            "📥 측정값 JSONL 내보내기",
+            data=perf_trace.export_jsonl(),
+            file_name=f"ssep_profile_{datetime.now():%Y%m%d_%H%M%S}.jsonl",
+            mime="application/json",
+        )
+
+def forget_unsaved_edits():
+    """대장을 바꾸면 이전 대장에서 저장하지 않은 편집은 버립니다. (행 번호가 다른 대장에 적용되지 않도록)"""
+    st.session_state.pop("main_editor", None)
 
 def require_login():
+    """로그인 상태면 사이드바를 그리고 백업/복원 패널 자리(container)를 돌려줍니다. 미로그인 시 로그인 화면 후 stop."""
     if "logged_in" not in st.session_state:
         st.session_state.logged_in = False
         st.session_state.role = None
         st.session_state.client_name = None
 
+    if st.session_state.logged_in and get_auth_store().resolve(st.session_state.get("auth_token")) is None:
+        # 토큰 만료 / 비밀번호 변경으로 폐기됨
+        st.session_state.logged_in = False
+        st.session_state.role = None
+        st.session_state.client_name = None
+        st.warning("로그인이 만료되었습니다. 다시 로그인해 주세요.")
+
     if st.session_state.logged_in:
         with st.sidebar:
             st.markdown(f"**접속자:** {st.session_state.role}")
             if st.session_state.role == "고객사" and st.session_state.client_name:
                 st.markdown(f"**고객사:** {st.session_state.client_name}")
+            registry = get_ledger_registry()
+            if len(registry.configs) > 1:
+                st.selectbox("대장", registry.keys(), format_func=lambda k: registry.configs[k].title,
+                             key="ledger_key", on_change=forget_unsaved_edits)
             
             st.markdown("---")
-            st.markdown("### 🔄 백업/복원")
-            
-            # 현재 상태를 백업 버전으로 저장
-            if st.button("💾 현재 상태 백업 (Ver1로 저장)", help="현재 app.py를 app_ver1.py로 백업합니다"):
-                try:
-                    if os.path.exists("app.py"):
-                        shutil.copy("app.py", "app_ver1.py")
-                        st.success("✅ 백업 완료: app_ver1.py에 저장되었습니다.")
-                    else:
-                        st.error("❌ app.py 파일을 찾을 수 없습니다.")
-                except Exception as e:
-                    st.error(f"❌ 백업 실패: {e}")
-            
-            # Ver1로 복원
-            if st.button("⏮️ Ver1로 복원", help="app_ver1.py를 app.py로 복원합니다"):
-                try:
-                    if os.path.exists("app_ver1.py"):
-                        shutil.copy("app_ver1.py", "app.py")
-                        st.success("✅ 복원 완료: app_ver1.py를 app.py로 복원했습니다.")
-                        st.info("⚠️ 페이지를 새로고침하거나 앱을 재시작해야 변경사항이 적용됩니다.")
-                    else:
-                        st.error("❌ app_ver1.py 파일을 찾을 수 없습니다.")
-                except Exception as e:
-                    st.error(f"❌ 복원 실패: {e}")
-            
-            st.markdown("---")
+            # 🔄 백업/복원 패널은 데이터 로드 후 render_snapshot_panel() 이 이 자리에 그립니다.
+            backup_slot = st.container()
+
+            if st.session_state.role == "관리자":
+                render_profile_panel()
+                st.markdown("---")
             
             if st.button("로그아웃"):
+                get_auth_store().revoke(st.session_state.pop("auth_token", None))
                 st.session_state.logged_in = False
                 st.session_state.role = None
                 st.session_state.client_name = None
                 st.rerun()
-        return
+        return backup_slot
 
     st.title("로그인")
 
@@ -251,48 +634,478 @@ def require_login():
     user_id = st.text_input("아이디")
     user_pw = st.text_input("비밀번호", type="password")
 
+    if not get_auth_store().has_accounts():
+        st.warning("등록된 계정이 없습니다. secrets 의 [auth] 또는 SSEP_ADMIN_PASSWORD 환경 변수로 초기 계정을 설정하거나 "
+                   "`python auth_store.py set 관리자 admin` 으로 계정을 만든 뒤 다시 시작해 주세요.")
+
     if st.button("로그인"):
-        if role == "관리자":
-            if user_id == ADMIN_ID and user_pw == ADMIN_PW:
-                st.session_state.logged_in = True
-                st.session_state.role = "관리자"
-                st.session_state.client_name = None
+        # 비밀번호 해시 확인은 인증 스레드 풀에서 (동시 로그인이 몰려도 CPU/메모리 사용량이 풀 크기로 제한됨)
+        store = get_auth_store()
+        with st.spinner("확인 중..."):
+            account = store.submit(role, user_id.strip(), user_pw).result()
+        if account is None:
+            st.error(f"{role} 아이디 또는 비밀번호가 올바르지 않습니다.")
+        else:
+            # 이후 rerun 은 토큰만 확인합니다. (비밀번호 재확인 없음)
+            st.session_state.auth_token = store.issue_token(account)
+            st.session_state.logged_in = True
+            st.session_state.role = account.role
+            st.session_state.client_name = account.client_name
+            if account.role == "관리자":
                 st.success("관리자 로그인 성공")
-                st.rerun()
             else:
-                st.error("관리자 아이디 또는 비밀번호가 올바르지 않습니다.")
+                st.success(f"고객사 '{account.client_name}' 로그인 성공")
+            start_warmup()
+            st.rerun()
+
+    st.stop()
+
+def get_change_journal() -> change_journal.ChangeJournal:
+    return current_ledger().resource("journal", change_journal.ChangeJournal)
+
+def current_user_label():
+    role = st.session_state.get("role") or ""
+    client_name = st.session_state.get("client_name")
+    return f"{role}:{client_name}" if client_name else role
+
+def record_changes(ledger_df: pd.DataFrame, before: pd.DataFrame, after: pd.DataFrame):
+    """저장 성공 후 변경 이력 저널에 diff 를 추가합니다. 실패해도 저장 자체는 성공으로 둡니다."""
+    try:
+        journal = get_change_journal()
+        journal.write_baseline(ledger_df, COLUMN_ORDER)
+        journal.append(change_journal.diff_frames(before, after, COLUMN_ORDER), user=current_user_label())
+    except Exception as e:
+        st.warning(f"변경 이력 기록 실패: {e}")
+
+def render_history_panel():
+    """🕘 변경 이력: NO 기준으로 저널에서 해당 샘플의 변경 내역을 조회합니다."""
+    with st.expander("🕘 변경 이력 조회", expanded=False):
+        row_id = st.number_input("NO", min_value=1, step=1, key="history_row_id")
+        include_archived = st.checkbox("보관된(컴팩션된) 이력 포함", key="history_archived")
+        entries = get_change_journal().history(int(row_id), include_archived=include_archived)
+        if entries:
+            hist_df = pd.DataFrame(entries)
+            show_cols = [c for c in ["ts", "user", "op", "col", "old", "new"] if c in hist_df.columns]
+            st.dataframe(hist_df[show_cols], use_container_width=True, hide_index=True)
         else:
-            if user_id in CLIENTS and CLIENTS[user_id][0] == user_pw:
-                st.session_state.logged_in = True
-                st.session_state.role = "고객사"
-                st.session_state.client_name = CLIENTS[user_id][1]
-                st.success(f"고객사 '{st.session_state.client_name}' 로그인 성공")
-                st.rerun()
+            st.caption("기록된 변경 이력이 없습니다.")
+
+@st.cache_resource
+def get_export_cache() -> ledger_export.ExportCache:
+    return ledger_export.ExportCache()
+
+def render_export_panel(view_df: pd.DataFrame, filter_key: str):
+    """📥 내보내기: 현재 보고 있는 목록(고객사/미출하 필터 적용)을 XLSX/CSV 로. 같은 데이터·필터면 캐시된 파일을 그대로 사용."""
+    with st.expander("📥 엑셀/CSV 내보내기", expanded=False):
+        fmt = st.radio("형식", ["xlsx", "csv"], horizontal=True, key="export_fmt")
+        if st.button("파일 만들기", key="export_build"):
+            with perf_trace.span("export.build"):
+                columns = [c for c in ["NO"] + COLUMN_ORDER if c in view_df.columns]
+                key, _, hit = get_export_cache().get_or_build(view_df, columns, filter_key, fmt)
+            st.session_state.export_key = key
+            st.session_state.export_info = (
+                f"{datetime.now():%H:%M:%S} 생성 · {len(view_df):,}행" + (" · 캐시 사용" if hit else "")
+            )
+
+        key = st.session_state.get("export_key")
+        data = get_export_cache().get(key) if key and key[1:] == (filter_key, fmt) else None
+        if data is not None:
+            st.download_button(
+                f"⬇️ {fmt.upper()} 다운로드",
+                data=data,
+                file_name=f"ssep_{filter_key}_{datetime.now():%Y%m%d}.{fmt}",
+                mime=ledger_export.XLSX_MIME if fmt == "xlsx" else ledger_export.CSV_MIME,
+                key="export_download",
+            )
+            st.caption(st.session_state.get("export_info", ""))
+
+def render_report_panel(ledger_df: pd.DataFrame):
+    """📑 업체별 리포트: 전체 업체의 월간 요약을 한 번에 만들어 XLSX/JSON 으로 내려받습니다. (관리자 전용)"""
+    with st.expander("📑 업체별 리포트", expanded=False):
+        months = customer_report.available_months(ledger_df)
+        month = st.selectbox("기간 (신청일자 기준)", ["전체"] + months, key="report_month")
+        if st.button("리포트 만들기", key="report_build"):
+            with perf_trace.span("report.build"):
+                report = customer_report.build_report(ledger_df, None if month == "전체" else month)
+                st.session_state.report_files = {
+                    "month": month,
+                    "rows": len(report.summary),
+                    "xlsx": report.to_xlsx(),
+                    "json": report.to_json(indent=2).encode("utf-8"),
+                }
+
+        files = st.session_state.get("report_files")
+        if files and files["month"] == month:
+            st.caption(f"{files['rows']}개 업체")
+            c1, c2 = st.columns(2)
+            with c1:
+                st.download_button("⬇️ XLSX", data=files["xlsx"], file_name=f"ssep_report_{month}.xlsx",
+                                   mime=ledger_export.XLSX_MIME, key="report_xlsx")
+            with c2:
+                st.download_button("⬇️ JSON", data=files["json"], file_name=f"ssep_report_{month}.json",
+                                   mime="application/json", key="report_json")
+
+@st.cache_resource
+def get_column_schema() -> column_schema.ColumnSchema:
+    """편집기 컬럼 스키마 (column_schema.DEFAULT_SCHEMA + ssep_columns.json + 화면 전용 검증 컬럼)."""
+    schema = column_schema.ColumnSchema.load(BASE_DIR)
+    schema.add(column_schema.ColumnSpec(
+        VALIDATION_COL, editable_by=(),
+        help="규칙에 맞지 않는 컬럼 (운송편/자재준비 허용값, 날짜 형식, 0 이상 수량/단가, 샘플금액=요청수량×샘플단가)",
+    ))
+    return schema
+
+def get_alias_store() -> customer_alias.AliasStore:
+    return current_ledger().resource("aliases", customer_alias.AliasStore)
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_alias_index(ledger_key, version, alias_revision, _ledger_df: pd.DataFrame, _aliases) -> customer_alias.CustomerAliasIndex:
+    """대장 / 대장 버전(공유 캐시 version) / 별칭 파일 revision 마다 한 번만 만듭니다. 세션 간 공유."""
+    return customer_alias.CustomerAliasIndex(_ledger_df, _aliases)
+
+def current_alias_index(ledger_df: pd.DataFrame) -> customer_alias.CustomerAliasIndex:
+    store = get_alias_store()
+    return get_alias_index(st.session_state.get("ledger_frame_key"), st.session_state.get("ledger_version"),
+                           store.revision, ledger_df, store.aliases)
+
+def customer_rows(ledger_df: pd.DataFrame, client_name) -> pd.DataFrame:
+    """고객사 업체명에 해당하는 대장 행 (표기가 달라도 별칭 인덱스로 매칭)."""
+    return ledger_df.loc[current_alias_index(ledger_df).rows_for(client_name)]
+
+def render_alias_panel(ledger_df: pd.DataFrame):
+    """🏷️ 업체명 매칭 점검: 고객사 계정에 연결되지 않은 대장 업체명을 보고 별칭으로 연결합니다. (관리자 전용)"""
+    with st.expander("🏷️ 업체명 매칭 점검", expanded=False):
+        store = get_alias_store()
+        index = current_alias_index(ledger_df)
+        customers = get_auth_store().client_names()
+        for customer in customers:
+            names = index.matched_names(customer)
+            suggested = index.suggestions(customer)
+            st.caption(f"**{customer}**: {len(index.rows_for(customer)):,}건 · " + (", ".join(names) or "매칭 없음")
+                       + (f" · 추천(별칭 추가 전에는 안 보임): {', '.join(suggested)}" if suggested else ""))
+
+        unmatched = index.unmatched(customers)
+        if unmatched.empty:
+            st.success("모든 업체명이 고객사 계정에 연결되어 있습니다.")
+            return
+        st.markdown(f"연결되지 않은 업체명 {len(unmatched)}개")
+        st.dataframe(unmatched, use_container_width=True, hide_index=True)
+
+        customer = st.selectbox("고객사 계정", customers, key="alias_customer")
+        names = st.multiselect("이 계정에 연결할 업체명", unmatched["업체명"].tolist(), key="alias_names")
+        if st.button("별칭 추가", disabled=not names, key="alias_add"):
+            store.add(customer, names)
+            st.rerun()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def get_lead_time_analysis(version: str, _ledger_df: pd.DataFrame) -> dict:
+    """대장 버전(분석에 쓰는 컬럼의 내용 지문)별로 한 번만 계산합니다."""
+    return lead_time.analyze(_ledger_df)
+
+def render_lead_time_tab(ledger_df: pd.DataFrame):
+    """⏱️ 리드타임 분석: 단계별 소요일, 업체/차종/운송편별 리드타임 백분위, 주간 처리량 (관리자 전용)."""
+    with perf_trace.span("lead_time"):
+        version = ledger_export.frame_version(ledger_df, lead_time.INPUT_COLUMNS)
+        result = get_lead_time_analysis(version, ledger_df)
+
+    st.subheader("⏱️ 단계별 소요일 (일)")
+    st.caption("각 단계 날짜까지 직전에 기록된 단계부터 걸린 일수. 날짜가 없거나 순서가 뒤집힌 건은 제외합니다.")
+    st.dataframe(result["stages"].round(1), use_container_width=True)
+
+    st.subheader("📦 주간 처리량")
+    if not result["weekly"].empty:
+        st.line_chart(result["weekly"])
+    else:
+        st.caption("접수/출하 날짜가 없습니다.")
+
+    st.subheader(f"🏷️ 리드타임 백분위 ({lead_time.TOTAL_STAGE}, 일)")
+    for label, tab in zip(("업체", "차종", "운송편"), st.tabs(["업체별", "차종별", "운송편별"])):
+        with tab:
+            table = result[f"by_{label}"]
+            if table.empty:
+                st.caption("출하까지 완료된 건이 없습니다.")
             else:
-                st.error("고객사 아이디 또는 비밀번호가 올바르지 않습니다.")
+                st.dataframe(table.round(1), use_container_width=True, hide_index=True)
 
-    st.stop()
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_timeline(ledger_key, version, _ledger_df: pd.DataFrame) -> timeline.Timeline:
+    """대장 / 대장 버전(공유 캐시 version) 마다 한 번만 만듭니다. 세션 간 공유. (단위별 집계는 처음 볼 때 만들어 보관)"""
+    return timeline.Timeline(_ledger_df)
+
+def render_timeline_tab(ledger_df: pd.DataFrame):
+    """📅 일정 타임라인: 납기(예정) / 출하 일정을 일·주·월 단위로 집계하고, 고른 구간의 행만 펼쳐 봅니다. (관리자 전용)"""
+    with perf_trace.span("timeline"):
+        tl = get_timeline(st.session_state.get("ledger_frame_key"), st.session_state.get("ledger_version"), ledger_df)
+    events = tl.events()
+    if not events:
+        st.caption("납기일 / 출하일 컬럼이 없습니다.")
+        return
+
+    today = datetime.today().date()
+    c1, c2, c3 = st.columns([1, 1, 2])
+    with c1:
+        event = st.radio("일정", events, horizontal=True, key="timeline_event",
+                         help="납기: 납기일(예정)이 있으면 그 날짜, 없으면 납기일")
+    with c2:
+        unit = st.radio("단위", timeline.UNITS, index=1, horizontal=True, key="timeline_unit")
+    with c3:
+        period = st.date_input("기간", value=(today - timedelta(days=14), today + timedelta(days=84)), key="timeline_period")
+    if len(period) != 2:
+        st.caption("기간의 끝 날짜를 골라 주세요.")
+        return
+    start, end = period
+
+    with perf_trace.span("timeline.query"):
+        buckets = tl.buckets(event, unit, start, end)
+        customers = tl.customers(event, unit, start, end)
+    m1, m2 = st.columns(2)
+    m1.metric(f"{event} 건수", f"{int(buckets['건수'].sum()):,} 건")
+    m2.metric("요청수량 합계", f"{int(buckets['요청수량'].sum()):,} EA")
+    if buckets.empty:
+        st.info("기간 안에 일정이 없습니다.")
+        return
+
+    if unit == "일":
+        st.dataframe(tl.calendar(event, start, end), use_container_width=True)
+    else:
+        st.bar_chart(buckets["건수"])
+    left, right = st.columns(2)
+    with left:
+        st.dataframe(buckets, use_container_width=True)
+    with right:
+        st.dataframe(customers, use_container_width=True, hide_index=True, height=min(400, 50 + len(customers) * 35))
+
+    # 드릴다운: 고른 버킷의 행만 대장에서 꺼냄
+    labels = {d.date(): f"{d.date()} · {n:,}건" for d, n in buckets["건수"].items()}
+    bucket = st.selectbox(f"{unit} 단위 상세", list(labels), format_func=labels.get, index=None,
+                          placeholder="펼쳐 볼 구간을 고르세요", key="timeline_bucket")
+    if bucket is not None:
+        rows = tl.bucket_rows(event, unit, bucket)
+        show_cols = [c for c in ["NO", "업체명", "품명", "part no", "요청수량", "납기일", "납기일(예정)", "출하일", "진행상태"]
+                     if c in ledger_df.columns]
+        st.dataframe(ledger_df.loc[rows, show_cols], use_container_width=True, hide_index=True)
+
+def get_due_index(df: pd.DataFrame) -> due_index.DueDateIndex:
+    """세션별 납기일 인덱스를 df 기준으로 증분 갱신하여 돌려줍니다."""
+    if "due_index" not in st.session_state:
+        st.session_state.due_index = due_index.DueDateIndex()
+    index = st.session_state.due_index
+    metrics.CACHE_LOOKUPS.inc(cache="due_index")
+    if index.sync(df):
+        metrics.CACHE_MISSES.inc(cache="due_index")
+    return index
+
+def compute_dashboard_metrics(stats_df: pd.DataFrame, qty_col, due_idx: due_index.DueDateIndex, today) -> dict:
+    """상단 대시보드 6개 지표 계산 (총건수, 수량, 출하완료, 미납, 완료율, 납기지연)."""
+    total = len(stats_df)
+
+    # 총 요청 수량
+    total_qty = None
+    if qty_col and qty_col in stats_df.columns:
+        total_qty = int(stats_df[qty_col].fillna(0).sum())
+
+    # 출하완료 / 미납 (= 전체 - 출하완료) / 완료율
+    completed = 0
+    if "진행상태" in stats_df.columns:
+        completed = int((stats_df["진행상태"].astype(str) == "출하완료").sum())
+    pending = max(total - completed, 0)
+    completion_rate = (completed / total * 100) if total > 0 else 0
+
+    return {
+        "total": total,
+        "total_qty": total_qty,
+        "completed": completed,
+        "pending": pending,
+        "completion_rate": completion_rate,
+        "delayed": due_idx.overdue_count(today),
+    }
+
+def render_due_soon_panel(df: pd.DataFrame, due_idx: due_index.DueDateIndex, today, role):
+    """📅 납기 임박 패널: 지연 건 + N일 이내 납기 예정 미출하건."""
+    st.subheader("📅 납기 임박")
+
+    p1, p2 = st.columns([1, 3])
+    with p1:
+        days = st.number_input("기준 일수 (오늘부터)", min_value=0, max_value=90, value=7, step=1, key="due_soon_days")
+        overdue_ids = due_idx.overdue_row_ids(today)
+        soon_ids = due_idx.due_within(today, int(days))
+        st.metric("납기 지연", f"{len(overdue_ids):,} 건")
+        st.metric(f"{int(days)}일 이내 납기", f"{len(soon_ids):,} 건")
+
+    with p2:
+        show_ids, show_ords = due_idx.due_until(today, int(days))
+        if len(show_ids) and "NO" in df.columns:
+            show_cols = [c for c in ["NO", "업체명", "품명", "part no", "요청수량", "납기일", "진행상태"] if c in df.columns]
+            rows = df.set_index("NO", drop=False).loc[show_ids, show_cols].copy()
+            rows.insert(0, "D-day", show_ords - due_index.to_day_ordinal(today))
+            st.dataframe(rows, use_container_width=True, hide_index=True, height=min(400, 50 + len(rows) * 35))
+        else:
+            st.info("지연 또는 임박한 미출하건이 없습니다.")
+
+    # 업체별 지연 건수 (관리자만)
+    if role == "관리자":
+        by_customer = due_idx.delayed_by_customer(today)
+        if by_customer:
+            delayed_df = pd.DataFrame(
+                sorted(by_customer.items(), key=lambda kv: -kv[1]),
+                columns=["업체명", "납기 지연 건수"],
+            )
+            st.dataframe(delayed_df, use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+
+def get_status_index(df: pd.DataFrame) -> status_board.StatusIndex:
+    """세션별 진행상태 인덱스를 df 기준으로 증분 갱신하여 돌려줍니다."""
+    if "status_index" not in st.session_state:
+        st.session_state.status_index = status_board.StatusIndex()
+    index = st.session_state.status_index
+    metrics.CACHE_LOOKUPS.inc(cache="status_index")
+    if index.sync(df):
+        metrics.CACHE_MISSES.inc(cache="status_index")
+    return index
+
+def move_card(ledger_df: pd.DataFrame, ws, row_id, target, qty_col) -> bool:
+    """
+    카드 하나를 target 상태로 옮깁니다. 진행상태를 정하는 칸(출하일/샘플 완료일/자재준비)만 고쳐
+    그 행만 시트에 기록하고(save_delta_to_sheet), 공유 캐시와 변경 이력에 반영합니다.
+    """
+    labels = ledger_df.index[ledger_df[ID_COL].to_numpy() == int(row_id)]
+    if not len(labels):
+        st.error(f"NO {row_id} 를 찾을 수 없습니다. 시트를 다시 불러와 주세요.")
+        return False
+    before = ledger_df.loc[labels[:1]]
+    changes = status_board.transition(before.iloc[0], target, datetime.today().date())
+    if not changes:
+        return True
+    updated = before.copy()
+    for col, value in changes.items():
+        updated[col] = value
+    updated = normalize_rows(updated, qty_col)
+    delta = editor_delta.EditorDelta(updated, updated.iloc[0:0], [], {labels[0]: set(changes)})
+    problems = find_blocking_errors(delta)
+    if problems:
+        st.error("옮기지 않았습니다. " + problems[0])
+        return False
+    if not save_delta_to_sheet(delta, ws, ledger_df):
+        return False
+    get_ledger_feed().apply_updates(delta.updates)
+    record_changes(ledger_df, before, delta.updates)
+    return True
+
+def render_status_board(df: pd.DataFrame, ledger_df: pd.DataFrame, ws):
+    """🗂️ 진행 보드: 진행상태별 카드 (상태마다 납기일 순 상위 BOARD_PAGE_SIZE 건, 더 보기). ◀ ▶ 로 한 단계씩 옮깁니다."""
+    msg = st.session_state.pop("board_msg", None)
+    if msg:
+        st.success(msg)
+
+    with perf_trace.span("status_board"):
+        index = get_status_index(df)
+        statuses = index.statuses()
+        qty_col = "요청수량" if "요청수량" in df.columns else ("수량" if "수량" in df.columns else None)
+        pages = {s: index.page(s, st.session_state.get(f"board_limit_{s}", BOARD_PAGE_SIZE)) for s in statuses}
+        shown = np.concatenate(list(pages.values())) if pages else np.empty(0, dtype=np.int64)
+        # 화면에 그릴 카드의 행만 꺼냄 (대장 전체를 카드로 만들지 않음)
+        cards = df.set_index(ID_COL, drop=False).loc[shown] if len(shown) else df.iloc[0:0]
+
+    st.caption("카드는 상태마다 납기일 빠른 순(출하완료는 최근 납기부터)으로 표시합니다. "
+               "◀ ▶ 는 출하일 / 샘플 완료일 / 자재준비 칸을 고쳐 그 행만 시트에 저장합니다.")
+    for status, column in zip(statuses, st.columns(len(statuses))):
+        with column:
+            total = index.count(status)
+            st.markdown(f"**{status}** · {total:,}건")
+            for row_id in pages[status].tolist():
+                card = cards.loc[row_id]
+                with st.container(border=True):
+                    st.markdown(f"**NO {row_id}** · {card.get('업체명', '')}")
+                    qty = f" · {card[qty_col]:,} EA" if qty_col and isinstance(card[qty_col], (int, np.integer)) else ""
+                    st.caption(f"{card.get('품명', '')} {card.get('part no', '')}{qty} · 납기 {card.get('납기일', '') or '-'}")
+                    if status in status_board.STATUSES:
+                        level = status_board.STATUSES.index(status)
+                        b1, b2 = st.columns(2)
+                        targets = [(b1, level - 1, "◀"), (b2, level + 1, "▶")]
+                        for slot, to_level, arrow in targets:
+                            if 0 <= to_level < len(status_board.STATUSES):
+                                target = status_board.STATUSES[to_level]
+                                if slot.button(arrow, key=f"board_{row_id}_{target}", help=f"{target}(으)로"):
+                                    if move_card(ledger_df, ws, row_id, target, qty_col):
+                                        st.session_state.board_msg = f"✅ NO {row_id}: {status} → {target}"
+                                        st.rerun()
+            if total > len(pages[status]):
+                if st.button(f"더 보기 ({len(pages[status]):,}/{total:,})", key=f"board_more_{status}"):
+                    st.session_state[f"board_limit_{status}"] = len(pages[status]) + BOARD_PAGE_SIZE
+                    st.rerun()
 
 def main():
+    # rerun 단위 구간 타이밍 수집 (관리자 사이드바 ⏱️ 성능 프로파일에 표시)
+    start_metrics_exporter()
+    metrics.touch_session(get_session_id())
+    perf_trace.begin_run()
+    try:
+        render_page()
+    finally:
+        st.session_state.last_profile = perf_trace.end_run(get_session_id())
+
+def get_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else ""
+
+def render_page():
     # 0) 로그인 체크 (미로그인 시 여기서 stop)
-    require_login()
+    backup_slot = require_login()
 
     # 1) 시트 데이터 로드
-    df, ws = load_sheet_as_dataframe()
+    try:
+        df, ws = load_ledger()
+    except Exception as e:
+        metrics.ERRORS.inc(kind="load_failed")
+        st.error(f"데이터 로드 실패: {e}")
+        st.stop()
 
     # 논리적 중복 컬럼 제거 (ex: '요청수량', '요청수량_2')
     df = drop_logical_duplicate_columns(df)
+    ledger_df = df  # 역할/필터 적용 전 전체 대장 (변경 이력 기준점 등에 사용)
+
+    # 정기 스냅샷 (마지막 스냅샷 후 SNAPSHOT_INTERVAL_SEC 경과 시, 바뀐 청크만 기록)
+    try:
+        get_snapshot_store().take_if_due(ledger_df, SHEET_COLUMNS, SNAPSHOT_INTERVAL_SEC, reason="정기")
+    except Exception as e:
+        st.warning(f"정기 스냅샷 실패: {e}")
+
+    if st.session_state.get("role") == "관리자":
+        with backup_slot:
+            render_snapshot_panel(ledger_df, ws)
 
     # 역할에 따라 데이터 필터링
     role = st.session_state.get("role")
     client_name = st.session_state.get("client_name")
 
     if role == "고객사" and client_name and "업체명" in df.columns:
-        df = df[df["업체명"] == client_name].copy()
+        df = customer_rows(df, client_name).copy()
+    # 역할별로 볼 수 없는 컬럼(고객사: 연락처/이메일/샘플단가/샘플금액)은 화면·내보내기·편집기에 넘기기 전에 뺌
+    visible = get_column_schema().visible_columns(df.columns, role)
+    if len(visible) < len(df.columns):
+        df = df[visible]
 
-    st.caption(f"현재 시트 ID: {SHEET_ID}, 탭: {ws.title}")
+    st.caption(f"현재 시트 ID: {current_ledger().config.sheet_id}, 탭: {ws.title}")
     st.caption(f"현재 로그인: {role} / 표시 데이터: {len(df)}건")
+    render_live_status()
+
+    if role == "관리자":
+        ledger_tab, board_tab, timeline_tab, lead_time_tab = st.tabs(
+            ["📋 샘플 대장", "🗂️ 진행 보드", "📅 일정 타임라인", "⏱️ 리드타임 분석"])
+        with board_tab:
+            render_status_board(df, ledger_df, ws)
+        with timeline_tab:
+            render_timeline_tab(ledger_df)
+        with lead_time_tab:
+            render_lead_time_tab(ledger_df)
+        with ledger_tab:
+            render_ledger(df, ledger_df, ws, role, client_name)
+    else:
+        render_ledger(df, ledger_df, ws, role, client_name)
 
+def render_ledger(df: pd.DataFrame, ledger_df: pd.DataFrame, ws, role, client_name):
+    """대시보드 / 일정 / 샘플 목록 편집·저장. df 는 역할 필터가 적용된 대장, ledger_df 는 전체 대장."""
     # 숫자 컬럼 이름
     qty_col = "요청수량" if "요청수량" in df.columns else ("수량" if "수량" in df.columns else None)
     price_cols = [c for c in ["샘플단가", "샘플금액"] if c in df.columns]
@@ -314,53 +1127,34 @@ def main():
     # ----- 상단 대시보드 (한 줄에 모두 표시) -----
     st.subheader("📊 샘플 대시보드")
 
-    # 총건수, 수량, 출하완료, 미납, 완료율, 납기지연 → 6개 한 줄
-    c1, c2, c3, c4, c5, c6 = st.columns(6)
+    with perf_trace.span("dashboard"):
+        # 납기일 인덱스는 세션에 유지하고 바뀐 행만 다시 반영합니다. (매 렌더 전체 날짜 파싱 방지)
+        today = datetime.today().date()
+        due_idx = get_due_index(stats_df)
+        dash = compute_dashboard_metrics(stats_df, qty_col, due_idx, today)
 
-    # 1) 총 샘플 건수
-    with c1:
-        st.metric("총 샘플 건수", f"{len(stats_df):,} 건")
-
-    # 2) 총 요청 수량
-    with c2:
-        if qty_col and qty_col in stats_df.columns:
-            total_qty = int(stats_df[qty_col].fillna(0).sum())
-            st.metric("총 요청 수량", f"{total_qty:,.0f} EA")
-        else:
-            st.metric("총 요청 수량", "-")
-
-    # 3) 출하완료 건수
-    with c3:
-        completed = 0
-        if "진행상태" in stats_df.columns:
-            completed = (stats_df["진행상태"].astype(str) == "출하완료").sum()
-        st.metric("출하완료 건수", f"{completed:,} 건")
-
-    # 4) 미납 건수 (= 전체 - 출하완료)
-    with c4:
-        pending = max(len(stats_df) - completed, 0)
-        st.metric("미납 건수", f"{pending:,} 건")
-
-    # 5) 완료율
-    with c5:
-        completion_rate = (completed / len(stats_df) * 100) if len(stats_df) > 0 else 0
-        st.metric("완료율", f"{completion_rate:,.1f} %")
-
-    # 6) 납기 지연 건수 (같은 줄에 표시)
-    with c6:
-        delayed = 0
-        if "납기일" in stats_df.columns:
-            today = datetime.today().date()
-            dates = stats_df["납기일"].apply(parse_date_safe)
-            mask = dates.notna()
-            if "진행상태" in stats_df.columns:
-                not_done = stats_df["진행상태"].astype(str) != "출하완료"
-                delayed = ((dates < today) & mask & not_done).sum()
+        # 총건수, 수량, 출하완료, 미납, 완료율, 납기지연 → 6개 한 줄
+        c1, c2, c3, c4, c5, c6 = st.columns(6)
+        with c1:
+            st.metric("총 샘플 건수", f"{dash['total']:,} 건")
+        with c2:
+            if dash["total_qty"] is not None:
+                st.metric("총 요청 수량", f"{dash['total_qty']:,.0f} EA")
             else:
-                delayed = ((dates < today) & mask).sum()
-        st.metric("납기 지연 건수", f"{delayed:,} 건")
+                st.metric("총 요청 수량", "-")
+        with c3:
+            st.metric("출하완료 건수", f"{dash['completed']:,} 건")
+        with c4:
+            st.metric("미납 건수", f"{dash['pending']:,} 건")
+        with c5:
+            st.metric("완료율", f"{dash['completion_rate']:,.1f} %")
+        with c6:
+            st.metric("납기 지연 건수", f"{dash['delayed']:,} 건")
 
-    st.markdown("---")
+        st.markdown("---")
+
+    with perf_trace.span("due_soon_panel"):
+        render_due_soon_panel(stats_df, due_idx, today, role)
     
     # 고객사 로그인 시 간략한 일정 표시
     if role == "고객사":
@@ -440,215 +1234,107 @@ def main():
         if "진행상태" in df.columns:
             df = df[df["진행상태"].astype(str) != "출하완료"].copy()
             st.info(f"📊 미출하건 필터 적용: {len(df)}건 표시 중")
+
+    export_filter = (client_name if role == "고객사" and client_name else "전체") + ("_미출하" if filter_pending else "")
+    render_export_panel(df, export_filter)
     
     st.subheader("📋 샘플 목록 편집")
 
-    # 2) 편집용 데이터 준비 (에디터에 보이는 게 기준)
-    edit_df = df.copy()
-    
-    # COLUMN_ORDER 순서로 컬럼 재정렬 (NO는 맨 앞, 나머지는 COLUMN_ORDER 순서)
-    # NO가 있으면 맨 앞에, 그 다음 COLUMN_ORDER 순서대로
-    ordered_cols = ["NO"] if "NO" in edit_df.columns else []
-    for col in COLUMN_ORDER:
-        if col in edit_df.columns:
-            ordered_cols.append(col)
-    # COLUMN_ORDER에 없는 다른 컬럼들도 추가 (예: _삭제 등)
-    for col in edit_df.columns:
-        if col not in ordered_cols:
-            ordered_cols.append(col)
-    edit_df = edit_df[ordered_cols].copy()
-    
-    # [중요] 숫자 컬럼 타입 재확인 및 변환 (st.data_editor 전에 필수)
-    num_cols = ["요청수량", "샘플단가", "샘플금액"]
-    for col in num_cols:
-        if col in edit_df.columns:
-            # 타입이 숫자가 아니면 강제 변환
-            try:
-                if not pd.api.types.is_integer_dtype(edit_df[col]):
-                    # 문자열로 변환 후 숫자만 추출
-                    edit_df[col] = edit_df[col].astype(str).str.replace(r'[^0-9\-]', '', regex=True)
-                    edit_df[col] = edit_df[col].replace('', '0').replace('-', '0')
-                    edit_df[col] = pd.to_numeric(edit_df[col], errors='coerce').fillna(0).astype(int)
-            except Exception as e:
-                # 변환 실패 시 0으로 설정
-                edit_df[col] = 0
-                edit_df[col] = edit_df[col].astype(int)
-    
-    # ✅ 행 삭제용 체크박스 컬럼 추가 (먼저 추가하여 타입 확정)
-    if "_삭제" not in edit_df.columns:
-        edit_df["_삭제"] = False
-    edit_df["_삭제"] = edit_df["_삭제"].astype(bool)
-    
-    # 2. st.data_editor 설정 시 타입 명시
-    column_config = {}
-    
-    # NO 컬럼: 수정 불가
-    if "NO" in edit_df.columns:
-        column_config["NO"] = st.column_config.NumberColumn("NO", disabled=True, format="%d")
-    
-    # 타임스탬프: 수정 불가
-    if "타임스탬프" in edit_df.columns:
-        column_config["타임스탬프"] = st.column_config.TextColumn("타임스탬프", disabled=True)
-    
-    # 요청수량: 숫자 형식, 수정 가능하도록 설정
-    if "요청수량" in edit_df.columns:
-        # 타입이 정수형인지 확인하고, 아니면 강제 변환
-        if not pd.api.types.is_integer_dtype(edit_df["요청수량"]):
-            try:
-                edit_df["요청수량"] = edit_df["요청수량"].astype(str).str.replace(r'[^0-9\-]', '', regex=True)
-                edit_df["요청수량"] = edit_df["요청수량"].replace('', '0').replace('-', '0')
-                edit_df["요청수량"] = pd.to_numeric(edit_df["요청수량"], errors='coerce').fillna(0).astype(int)
-            except:
-                edit_df["요청수량"] = 0
-                edit_df["요청수량"] = edit_df["요청수량"].astype(int)
-        # NumberColumn 설정 (disabled=False로 명시하여 수정 가능하게)
-        # format="%,d"는 Streamlit에서 지원하지 않으므로 "%d" 사용
-        column_config["요청수량"] = st.column_config.NumberColumn(
-            "요청수량", 
-            format="%d",  # 천단위 콤마 없이 정수 형식
-            disabled=False  # 수정 가능하도록 명시
-        )
-    
-    # 샘플단가: 천단위 콤마 형식
-    if "샘플단가" in edit_df.columns:
-        column_config["샘플단가"] = st.column_config.NumberColumn("샘플단가", format="#,###")
-    
-    # 샘플금액: 천단위 콤마 형식, 수정 불가 (자동 계산)
-    if "샘플금액" in edit_df.columns:
-        column_config["샘플금액"] = st.column_config.NumberColumn("샘플금액", format="#,###", disabled=True)
-
-    # 운송편: Selectbox
-    if "운송편" in edit_df.columns:
-        column_config["운송편"] = st.column_config.SelectboxColumn(
-            "운송편",
-            options=["", "항공", "선박", "핸드캐리"],
-            required=False,
-        )
+    with perf_trace.span("editor.prepare"):
+        # 2) 편집용 데이터 준비 (에디터에 보이는 게 기준)
+        # COLUMN_ORDER 순서로 컬럼 재정렬 (NO는 맨 앞, 나머지는 COLUMN_ORDER 순서)
+        # NO가 있으면 맨 앞에, 그 다음 COLUMN_ORDER 순서대로
+        ordered_cols = ["NO"] if "NO" in df.columns else []
+        for col in COLUMN_ORDER:
+            if col in df.columns:
+                ordered_cols.append(col)
+        # COLUMN_ORDER에 없는 다른 컬럼들도 추가 (예: _삭제 등)
+        for col in df.columns:
+            if col not in ordered_cols:
+                ordered_cols.append(col)
+        edit_df = df[ordered_cols].copy()
     
-    # 자재준비: Selectbox
-    if "자재준비" in edit_df.columns:
-        column_config["자재준비"] = st.column_config.SelectboxColumn(
-            "자재준비",
-            options=["", "준비중", "완료"],
-            required=False,
-        )
-    
-    # 진행상태: Selectbox, 수정 불가 권장 (자동 계산되므로)
-    if "진행상태" in edit_df.columns:
-        column_config["진행상태"] = st.column_config.SelectboxColumn(
-            "진행상태",
-            options=["접수", "자재준비", "생산중", "생산완료", "출하완료"],
-            disabled=True,  # 자동 계산되므로 수정 불가
-        )
-    
-    # 납기일: 텍스트 형식 (날짜 입력 가능)
-    if "납기일" in edit_df.columns:
-        column_config["납기일"] = st.column_config.TextColumn("납기일", help="날짜 형식: YYYY-MM-DD 또는 YYYY.MM.DD")
+        # [중요] 숫자 컬럼 타입 재확인 및 변환 (st.data_editor 전에 필수)
+        #       스키마의 정수 컬럼 중 정수형이 아닌 것만 변환 (평소에는 dtype 확인만)
+        schema = get_column_schema()
+        column_schema.coerce_frame(edit_df, schema)
     
-    # 납기일(예정): 텍스트 형식, 관리자가 입력 가능
-    if "납기일(예정)" in edit_df.columns:
-        column_config["납기일(예정)"] = st.column_config.TextColumn("납기일(예정)", help="예상 납기일 입력 (날짜 형식: YYYY-MM-DD 또는 YYYY.MM.DD)")
-
-    # 삭제 체크박스 컬럼
-    if "_삭제" in edit_df.columns:
-        column_config["_삭제"] = st.column_config.CheckboxColumn(
-            "삭제",
-            help="체크한 행은 저장 시 삭제됩니다.",
-        )
+        # ✅ 행 삭제용 체크박스 컬럼 추가 (먼저 추가하여 타입 확정)
+        if "_삭제" not in edit_df.columns:
+            edit_df["_삭제"] = False
+        edit_df["_삭제"] = edit_df["_삭제"].astype(bool)
+
+    with perf_trace.span("editor.validate"):
+        # ⚠️ 검증: 허용값/날짜 형식/음수/금액 규칙 위반 컬럼을 행마다 표시 (저장 시에는 건드린 칸만 차단)
+        check = validation.validate(edit_df)
+        if not check.ok:
+            edit_df.insert(1, VALIDATION_COL, check.row_labels())
+            st.caption(f"⚠️ 검증 오류 {check.error_count():,}칸 ({int(check.row_mask().sum()):,}행) - '{VALIDATION_COL}' 열을 확인하세요.")
+
+    with perf_trace.span("editor.column_config"):
+        # 2. st.data_editor 설정 시 타입 명시 (컬럼 스키마에서 컬럼 목록/역할별로 한 번만 생성해 공유)
+        column_config = schema.editor_config(edit_df.columns, role, st.column_config)
 
     # 📋 여기서 사용자가 필터/정렬/수정/삭제 체크 모두 수행
-    edited_df = st.data_editor(
-        edit_df,
-        use_container_width=True,
-        num_rows="dynamic",
-        column_config=column_config,
-        key="main_editor",
-    )
+    with perf_trace.span("editor.render"):
+        st.data_editor(
+            edit_df,
+            use_container_width=True,
+            hide_index=True,  # index 는 시트 행 번호 (NO 컬럼으로 표시)
+            num_rows="dynamic",
+            column_config=column_config,
+            key="main_editor",
+        )
 
     # 4) 저장 / 다시 불러오기
     b1, b2 = st.columns(2)
     with b1:
         if st.button("💾 변경 내용 저장", type="primary"):
-            to_save = edited_df.copy()
-
-            # 4-1) 삭제 체크된 행 제거
-            if "_삭제" in to_save.columns:
-                to_save = to_save[~to_save["_삭제"].fillna(False)].drop(columns=["_삭제"])
-
-            # 4-2) 운송편 값 정리
-            if "운송편" in to_save.columns:
-                valid = {"", "항공", "선박", "핸드캐리"}
-                to_save["운송편"] = to_save["운송편"].fillna("")
-                to_save["운송편"] = to_save["운송편"].apply(
-                    lambda x: x if x in valid else str(x)
-                )
-
-            # 4-3) 자재준비 값 정리
-            if "자재준비" in to_save.columns:
-                valid = {"", "준비중", "완료"}
-                to_save["자재준비"] = to_save["자재준비"].fillna("")
-                to_save["자재준비"] = to_save["자재준비"].apply(
-                    lambda x: x if x in valid else str(x)
-                )
-
-            # 4-4) 수량/단가 숫자 처리
-            if qty_col and qty_col in to_save.columns:
-                to_save[qty_col] = (
-                    to_save[qty_col]
-                    .fillna(0)
-                    .astype(str)
-                    .str.replace(r"[^0-9\\-]", "", regex=True)
-                    .replace("", "0")
-                    .astype(int)
-                )
-            if "샘플단가" in to_save.columns:
-                to_save["샘플단가"] = (
-                    to_save["샘플단가"]
-                    .fillna(0)
-                    .astype(str)
-                    .str.replace(r"[^0-9\\-]", "", regex=True)
-                    .replace("", "0")
-                    .astype(int)
-                )
-
-            # 4-5) 샘플금액 자동 재계산: 요청수량 * 샘플단가
-            if "요청수량" in to_save.columns and "샘플단가" in to_save.columns and "샘플금액" in to_save.columns:
-                to_save["샘플금액"] = (to_save["요청수량"] * to_save["샘플단가"]).astype(int)
-
-            # 4-6) 진행상태 자동 재계산 (우선순위: 출하일 > 샘플 완료일 > 자재준비 > 기본값)
-            if "진행상태" in to_save.columns:
-                for idx in to_save.index:
-                    status = "접수"  # 기본값
-                    
-                    # 1순위: 출하일이 있으면 "출하완료"
-                    if "출하일" in to_save.columns:
-                        출하일값 = str(to_save.at[idx, "출하일"]).strip()
-                        if 출하일값 and 출하일값 != "" and 출하일값.lower() != "nan":
-                            status = "출하완료"
-                        else:
-                            # 2순위: 샘플 완료일이 있으면 "생산완료"
-                            if "샘플 완료일" in to_save.columns:
-                                완료일값 = str(to_save.at[idx, "샘플 완료일"]).strip()
-                                if 완료일값 and 완료일값 != "" and 완료일값.lower() != "nan":
-                                    status = "생산완료"
-                                else:
-                                    # 3순위: 자재준비가 "완료"이면 "생산중"
-                                    if "자재준비" in to_save.columns:
-                                        자재준비값 = str(to_save.at[idx, "자재준비"]).strip()
-                                        if 자재준비값 == "완료":
-                                            status = "생산중"
-                    
-                    to_save.at[idx, "진행상태"] = status
-
-            # 4-7) 시트 저장
-            ok = save_dataframe_to_sheet(to_save, ws)
-            if ok:
-                st.success("구글 시트에 저장되었습니다.")
-                st.rerun()
+            with perf_trace.span("save.normalize"):
+                # 4-1) 에디터 변경분(edited_rows / added_rows / deleted_rows)만 추출
+                #      삭제 체크된 행은 삭제로, 나머지 수정 행과 새 행만 정리/재계산 대상
+                delta = editor_delta.collect_delta(edit_df, st.session_state.get("main_editor"), display_cols=[VALIDATION_COL])
+                delta.updates = with_hidden_columns(delta.updates, ledger_df)
+                # 4-2) 운송편/자재준비 정리, 수량/단가 숫자 처리, 샘플금액·진행상태 재계산
+                delta.updates = normalize_rows(delta.updates, qty_col)
+                delta.inserts = normalize_rows(delta.inserts, qty_col)
+                # 4-3) 건드린 행만 검증 (기존 행은 이번에 편집한 칸, 새 행은 모든 칸)
+                problems = find_blocking_errors(delta)
+
+            if delta.is_empty():
+                st.info("변경된 내용이 없습니다.")
+            elif problems:
+                st.error("저장하지 않았습니다. 아래 값을 고쳐 주세요.\n\n" + "\n".join(f"- {p}" for p in problems[:20]))
+            else:
+                # 4-4) 새 행에 NO 발급 후 시트 저장 (건드린 행만)
+                delta.inserts[ID_COL] = get_id_allocator().allocate(len(delta.inserts))
+                if save_delta_to_sheet(delta, ws, ledger_df):
+                    # 공유 캐시에 바로 반영 (새 행은 다음 로드의 범위 읽기로, 삭제는 행 위치가 바뀌므로 동기화)
+                    if delta.deletes:
+                        get_ledger_feed().request_sync()
+                    else:
+                        get_ledger_feed().apply_updates(delta.updates)
+                    # 4-5) 변경 이력 기록 (건드린 행만 편집 전/후 diff)
+                    before = with_hidden_columns(edit_df.loc[list(delta.updates.index) + delta.deletes].drop(
+                        columns=["_삭제", VALIDATION_COL], errors="ignore"), ledger_df)
+                    record_changes(ledger_df, before, pd.concat([delta.updates, delta.inserts]))
+                    # 4-6) 저장된 시트 내용 스냅샷 (바뀐 청크만 기록)
+                    try:
+                        get_snapshot_store().take(editor_delta.apply_delta(ledger_df, delta), SHEET_COLUMNS, reason="저장")
+                    except Exception as e:
+                        st.warning(f"스냅샷 저장 실패: {e}")
+                    st.success(f"구글 시트에 저장되었습니다. ({delta.summary()})")
+                    st.rerun()
 
     with b2:
         if st.button("🔄 시트 다시 불러오기"):
+            get_ledger_feed().request_sync()
             st.rerun()
 
+    if role == "관리자":
+        render_history_panel()
+        render_report_panel(ledger_df)
+        render_alias_panel(ledger_df)
+
 if __name__ == "__main__":
     main()
@@ -3,6 +3,10 @@ import pandas as pd
 import gspread
 from google.oauth2 import service_account
 from datetime import datetime
+import os
+
+import fake_sheet
+import id_allocator
 
 # ----------------------------
 # 기본 설정
@@ -107,15 +111,19 @@ def get_worksheet():
     아니면 첫 번째 탭(sheet1)을 사용.
     """
     try:
-        creds_info = get_credentials_info()
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
-        credentials = service_account.Credentials.from_service_account_info(
-            creds_info, scopes=scopes
-        )
-        client = gspread.authorize(credentials)
+        if fake_sheet.is_enabled():
+            # 오프라인 모드: SSEP_SHEET_BACKEND=fake (fake_sheet.py 참고)
+            client = fake_sheet.get_fake_client()
+        else:
+            creds_info = get_credentials_info()
+            scopes = [
+                "https://www.googleapis.com/auth/spreadsheets",
+                "https://www.googleapis.com/auth/drive",
+            ]
+            credentials = service_account.Credentials.from_service_account_info(
+                creds_info, scopes=scopes
+            )
+            client = gspread.authorize(credentials)
 
         sh = client.open_by_key(SHEET_ID)
 
@@ -138,6 +146,12 @@ def get_worksheet():
 # ----------------------------
 # 시트 → DataFrame
 # ----------------------------
+@st.cache_resource
+def get_id_allocator(name):
+    """NO 발급기 (프로세스 공용, 상한은 대장마다 ssep_ids_<시트ID>_<탭ID>.json 에 기록)."""
+    return id_allocator.IdAllocator(os.path.dirname(os.path.abspath(__file__)), name=name)
+
+
 def load_sheet_as_dataframe():
     try:
         ws = get_worksheet()
@@ -163,19 +177,13 @@ def load_sheet_as_dataframe():
 
         df = pd.DataFrame(normalized, columns=[str(h).strip() for h in header])
 
-        # NO 컬럼이 없으면 자동 생성
-        if "NO" not in df.columns:
-            df.insert(0, "NO", range(1, len(df) + 1))
+        # NO 처리: 비어 있거나 중복된 번호만 발급기에서 새로 받아 채우고 그 칸만 시트에 바로 기록 (기존 번호는 유지)
+        raw_ids = df["NO"] if "NO" in df.columns else pd.Series("", index=df.index)
+        ids, _ = id_allocator.ensure_sheet_ids(get_id_allocator(id_allocator.state_name(ws)), ws, df.columns, raw_ids)
+        if "NO" in df.columns:
+            df["NO"] = ids
         else:
-            # 비어 있으면 채워주기
-            if df["NO"].isna().any() or (df["NO"] == "").any():
-                df["NO"] = pd.to_numeric(df["NO"], errors="coerce")
-                next_no = int(df["NO"].max()) + 1 if df["NO"].notna().any() else 1
-                for i, v in df["NO"].items():
-                    if pd.isna(v):
-                        df.at[i, "NO"] = next_no
-                        next_no += 1
-            df["NO"] = df["NO"].astype(int)
+            df.insert(0, "NO", ids)
 
         # 운송편 컬럼 없으면 생성
         if "운송편" not in df.columns:
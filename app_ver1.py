@@ -1,8 +1,16 @@
+from __future__ import annotations
+
 import streamlit as st
-import pandas as pd
-import gspread
-from google.oauth2 import service_account
 from datetime import datetime
+import threading
+
+import fake_sheet
+import lazy_import
+
+# 로그인 화면에서는 불러오지 않고 처음 사용할 때 import (로그인 직후 start_warmup() 이 미리 불러옴)
+pd = lazy_import.module("pandas")
+gspread = lazy_import.module("gspread")
+service_account = lazy_import.module("google.oauth2.service_account")
 
 st.set_page_config(page_title="신성EP 샘플 관리 대장", layout="wide")
 
@@ -34,13 +42,17 @@ def get_credentials_info():
 
 @st.cache_resource
 def get_worksheet():
-    info = get_credentials_info()
-    scopes = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive",
-    ]
-    creds = service_account.Credentials.from_service_account_info(info, scopes=scopes)
-    client = gspread.authorize(creds)
+    if fake_sheet.is_enabled():
+        # 오프라인 모드: SSEP_SHEET_BACKEND=fake (fake_sheet.py 참고)
+        client = fake_sheet.get_fake_client()
+    else:
+        info = get_credentials_info()
+        scopes = [
+            "https://www.googleapis.com/auth/spreadsheets",
+            "https://www.googleapis.com/auth/drive",
+        ]
+        creds = service_account.Credentials.from_service_account_info(info, scopes=scopes)
+        client = gspread.authorize(creds)
     sh = client.open_by_key(SHEET_ID)
     if WORKSHEET_NAME:
         try:
@@ -51,6 +63,20 @@ def get_worksheet():
         ws = sh.sheet1
     return ws
 
+@st.cache_resource
+def start_warmup():
+    """로그인 성공 시 프로세스당 한 번, 백그라운드에서 pandas/gspread import 와 워크시트 연결을 미리 해 둡니다."""
+    def run():
+        lazy_import.preload(["pandas", "gspread", "google.oauth2.service_account"])
+        try:
+            get_worksheet()
+        except BaseException:  # 실패 시 화면 스레드에서 다시 시도하며 오류 표시
+            pass
+
+    thread = threading.Thread(target=run, name="ssep-warmup", daemon=True)
+    thread.start()
+    return thread
+
 def load_sheet_as_dataframe():
     ws = get_worksheet()
     values = ws.get_all_values()
@@ -194,6 +220,7 @@ def require_login():
                 st.session_state.role = "관리자"
                 st.session_state.client_name = None
                 st.success("관리자 로그인 성공")
+                start_warmup()
                 st.rerun()
             else:
                 st.error("관리자 아이디 또는 비밀번호가 올바르지 않습니다.")
@@ -203,6 +230,7 @@ def require_login():
                 st.session_state.role = "고객사"
                 st.session_state.client_name = CLIENTS[user_id][1]
                 st.success(f"고객사 '{st.session_state.client_name}' 로그인 성공")
+                start_warmup()
                 st.rerun()
             else:
                 st.error("고객사 아이디 또는 비밀번호가 올바르지 않습니다.")
@@ -0,0 +1,246 @@
+"""
+로그인 계정 저장소 (비밀번호는 salt + scrypt 해시로만 저장).
+
+- 계정 파일 base_dir/ssep_users.json 에서 관리자/고객사 계정을 읽음. 파일이 없으면 seed 계정으로 처음 한 번 만듦
+  (seed 는 코드에 두지 않고 st.secrets 의 [auth] 또는 환경 변수에서 읽음. seed_from 참고)
+- 만료된 세션 토큰은 새 토큰을 발급할 때 함께 정리
+- 비밀번호 확인(scrypt, 1회 수십 ms / 16MB)은 크기가 정해진 스레드 풀에서 실행
+  동시에 로그인이 몰려도 CPU/메모리 사용은 workers 개 만큼으로 묶이고, 나머지는 대기열에서 기다림
+- 확인에 성공하면 만료 시각이 있는 세션 토큰을 발급. 이후 rerun 은 토큰 조회(dict 1회)만 하고 비밀번호는 다시 확인하지 않음
+- 모든 계정/토큰은 프로세스(streamlit 서버) 하나에서 공유합니다. (st.cache_resource)
+
+파일 형식:
+    {"accounts": {"관리자": {"admin": {"hash": "scrypt$16384$8$1$<salt>$<hash>"}},
+                  "고객사": {"infac": {"hash": "...", "client_name": "infac"}}},
+     "updated_at": "..."}
+
+초기 계정 (계정 파일이 없을 때만 사용):
+    .streamlit/secrets.toml
+        [auth]
+        admin_id = "admin"
+        admin_password = "..."
+        [auth.clients]
+        infac = { password = "...", client_name = "INFAC 일렉스" }
+    또는 환경 변수 SSEP_ADMIN_ID(기본 admin) / SSEP_ADMIN_PASSWORD /
+        SSEP_CLIENTS='{"infac": {"password": "...", "client_name": "INFAC 일렉스"}}'
+
+비밀번호 변경 (프로젝트 루트에서):
+    python auth_store.py set 관리자 admin
+    python auth_store.py set 고객사 infac --client-name "INFAC 일렉스"
+"""
+import argparse
+import base64
+import getpass
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+STORE_NAME = "ssep_users.json"
+ROLES = ("관리자", "고객사")
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1  # 약 16MB / 1회
+TOKEN_TTL_SEC = 12 * 3600
+WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def hash_password(password: str, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P) -> str:
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, n, r, p)
+    return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(digest)}"
+
+
+def check_password(password: str, encoded: str) -> bool:
+    """encoded(hash_password 결과)와 비교. 비교는 상수 시간."""
+    try:
+        scheme, n, r, p, salt, digest = encoded.split("$")
+    except (AttributeError, ValueError):
+        return False
+    if scheme != "scrypt":
+        return False
+    expected = base64.b64decode(digest)
+    actual = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p), len(expected))
+    return hmac.compare_digest(actual, expected)
+
+
+def _scrypt(password, salt, n, r, p, dklen=32):
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=2 * 128 * r * (n + p + 2), dklen=dklen)
+
+
+def seed_from(section=None, environ=None):
+    """
+    초기 계정 {역할: {아이디: (비밀번호, 업체명 또는 None)}}. section(st.secrets["auth"]) 을 먼저 보고,
+    없는 항목은 환경 변수에서 읽는다. 설정된 계정이 하나도 없으면 None.
+    """
+    section = dict(section or {})
+    env = os.environ if environ is None else environ
+    seed = {}
+    admin_pw = section.get("admin_password") or env.get("SSEP_ADMIN_PASSWORD")
+    if admin_pw:
+        admin_id = section.get("admin_id") or env.get("SSEP_ADMIN_ID") or "admin"
+        seed["관리자"] = {admin_id: (admin_pw, None)}
+    clients = section.get("clients")
+    if clients is None and env.get("SSEP_CLIENTS"):
+        clients = json.loads(env["SSEP_CLIENTS"])
+    users = {uid: (c["password"], c.get("client_name") or uid) for uid, c in dict(clients or {}).items()
+             if c.get("password")}
+    if users:
+        seed["고객사"] = users
+    return seed or None
+
+
+class Account:
+    def __init__(self, role, user_id, client_name=None):
+        self.role = role
+        self.user_id = user_id
+        self.client_name = client_name
+
+    def __repr__(self):
+        return f"Account({self.role!r}, {self.user_id!r}, {self.client_name!r})"
+
+
+class AuthStore:
+    """
+    seed: 계정 파일이 없을 때 만들 계정 {역할: {아이디: (비밀번호, 업체명 또는 None)}}
+    """
+
+    def __init__(self, base_dir=".", seed=None, workers=WORKERS, token_ttl=TOKEN_TTL_SEC, clock=time.time):
+        self.path = os.path.join(base_dir, STORE_NAME)
+        self.token_ttl = token_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ssep-auth")
+        self._tokens = {}  # 토큰 -> (Account, 만료 시각)
+        if not os.path.exists(self.path) and seed:
+            self._write({role: {uid: self._record(pw, name) for uid, (pw, name) in users.items()}
+                         for role, users in seed.items()})
+        self._accounts = self._read()
+        # 없는 아이디도 같은 시간이 걸리도록 비교할 더미 해시
+        self._dummy = hash_password(secrets.token_hex(8))
+
+    # ----- 계정 파일 -----
+    @staticmethod
+    def _record(password, client_name=None):
+        record = {"hash": hash_password(password)}
+        if client_name:
+            record["client_name"] = client_name
+        return record
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("accounts", {})
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, accounts):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"accounts": accounts, "updated_at": datetime.now().isoformat(timespec="seconds")},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def set_password(self, role, user_id, password, client_name=None):
+        """계정 추가/비밀번호 변경. 그 계정으로 발급된 토큰은 모두 폐기."""
+        if role not in ROLES:
+            raise ValueError(f"알 수 없는 역할: {role}")
+        record = self._record(password, client_name or self._accounts.get(role, {}).get(user_id, {}).get("client_name"))
+        with self._lock:
+            accounts = self._read()
+            accounts.setdefault(role, {})[user_id] = record
+            self._write(accounts)
+            self._accounts = accounts
+            self._tokens = {t: v for t, v in self._tokens.items()
+                            if (v[0].role, v[0].user_id) != (role, user_id)}
+
+    def has_accounts(self):
+        return any(self._accounts.get(role) for role in ROLES)
+
+    def client_names(self):
+        """고객사 계정의 업체명 목록."""
+        return [r.get("client_name") or uid for uid, r in self._accounts.get("고객사", {}).items()]
+
+    # ----- 로그인 -----
+    def verify(self, role, user_id, password):
+        """맞으면 Account, 아니면 None. (호출한 스레드에서 바로 해시 계산)"""
+        record = self._accounts.get(role, {}).get(user_id)
+        ok = check_password(password or "", record["hash"] if record else self._dummy)
+        if not (ok and record):
+            return None
+        return Account(role, user_id, record.get("client_name"))
+
+    def submit(self, role, user_id, password):
+        """verify 를 스레드 풀에서 실행하는 Future."""
+        return self._pool.submit(self.verify, role, user_id, password)
+
+    # ----- 세션 토큰 -----
+    def issue_token(self, account: Account) -> str:
+        """새 토큰을 발급하고, 그동안 만료된 토큰(로그아웃 없이 떠난 세션)은 정리한다."""
+        token = secrets.token_urlsafe(32)
+        now = self._clock()
+        with self._lock:
+            self._purge_locked(now)
+            self._tokens[token] = (account, now + self.token_ttl)
+        return token
+
+    def resolve(self, token):
+        """유효한 토큰이면 Account, 없거나 만료됐으면 None."""
+        if not token:
+            return None
+        with self._lock:
+            entry = self._tokens.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= self._clock():
+                del self._tokens[token]
+                return None
+            return entry[0]
+
+    def revoke(self, token):
+        with self._lock:
+            self._tokens.pop(token, None)
+
+    def purge_expired(self):
+        with self._lock:
+            self._purge_locked(self._clock())
+
+    def _purge_locked(self, now):
+        for token in [t for t, (_, expires) in self._tokens.items() if expires <= now]:
+            del self._tokens[token]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 계정 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    set_cmd = sub.add_parser("set", help="계정 추가 / 비밀번호 변경")
+    set_cmd.add_argument("role", choices=ROLES)
+    set_cmd.add_argument("user_id")
+    set_cmd.add_argument("--client-name", default=None, help="고객사 계정의 업체명 (대장 표기와 다르면 관리자 화면 '업체명 매칭 점검'에서 연결)")
+    sub.add_parser("list", help="계정 목록")
+    parser.add_argument("--dir", default=os.path.dirname(os.path.abspath(__file__)))
+    args = parser.parse_args()
+
+    store = AuthStore(args.dir, workers=1)
+    if args.command == "set":
+        password = getpass.getpass("새 비밀번호: ")
+        if password != getpass.getpass("새 비밀번호 확인: "):
+            raise SystemExit("비밀번호가 일치하지 않습니다.")
+        store.set_password(args.role, args.user_id, password, args.client_name)
+        print(f"저장: {store.path}")
+    else:
+        for role, users in store._accounts.items():
+            for user_id, record in users.items():
+                print(f"{role}\t{user_id}\t{record.get('client_name', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+로그인 처리량 벤치마크: 동시 로그인 N 건 (기본 100) 을 auth_store 로 확인.
+
+  - plaintext:   기존 방식 (코드의 평문 비밀번호와 == 비교)
+  - caller:      세션 스레드마다 직접 scrypt 확인 (풀 없이 N 개가 동시에 해시 계산)
+  - pool-<k>:    AuthStore.submit (인증 스레드 풀 k 개) 로 확인
+  - token_resolve: 로그인 후 rerun 마다 하는 토큰 조회 1회
+
+각 방식의 전체 시간, 초당 로그인 수, 로그인 1건 대기 시간 p50/p95 를 재고 JSON 으로 저장합니다.
+CPU 코어 수에 따라 결과가 크게 달라지므로 결과 파일에 cpu_count 를 함께 남깁니다.
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_auth.py
+    python benchmarks/bench_auth.py --logins 100 --workers 1 2 4
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import auth_store  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SEED = {
+    "관리자": {"admin": ("admin-pw", None)},
+    "고객사": {f"client{i:03d}": (f"pw{i:03d}", f"고객사{i:03d}") for i in range(100)},
+}
+
+
+def _git_label():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "local"
+
+
+def _logins(n):
+    """(역할, 아이디, 비밀번호) n 건. 10건 중 1건은 틀린 비밀번호."""
+    out = []
+    for i in range(n):
+        user_id = f"client{i % 100:03d}"
+        out.append(("고객사", user_id, f"pw{i % 100:03d}" if i % 10 else "wrong"))
+    return out
+
+
+def _concurrent(logins, check):
+    """logins 를 세션마다 스레드 하나씩 동시에 시작해 check(역할, 아이디, 비밀번호) 를 실행."""
+    latencies = [0.0] * len(logins)
+    results = [None] * len(logins)
+    start = threading.Barrier(len(logins) + 1)
+
+    def session(i, login):
+        start.wait()
+        t0 = time.perf_counter()
+        results[i] = check(*login)
+        latencies[i] = time.perf_counter() - t0
+
+    threads = [threading.Thread(target=session, args=(i, login)) for i, login in enumerate(logins)]
+    for t in threads:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    ok = sum(r is not None for r in results)
+    return {
+        "seconds": round(elapsed, 4),
+        "logins_per_sec": round(len(logins) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 2),
+        "accepted": ok,
+    }
+
+
+def run(n_logins, workers_list):
+    logins = _logins(n_logins)
+    result = {"logins": n_logins, "methods": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = {uid: pw for uid, (pw, _) in SEED["고객사"].items()}
+        result["methods"]["plaintext"] = _concurrent(
+            logins, lambda role, uid, pw: uid if plain.get(uid) == pw else None)
+
+        store = auth_store.AuthStore(tmp, seed=SEED, workers=1)
+        result["methods"]["caller"] = _concurrent(logins, store.verify)
+        for workers in workers_list:
+            pooled = auth_store.AuthStore(tmp, workers=workers)
+            result["methods"][f"pool-{workers}"] = _concurrent(
+                logins, lambda role, uid, pw, s=pooled: s.submit(role, uid, pw).result())
+
+        account = store.verify("관리자", "admin", "admin-pw")
+        token = store.issue_token(account)
+        t0 = time.perf_counter()
+        for _ in range(10_000):
+            store.resolve(token)
+        result["token_resolve_us"] = round((time.perf_counter() - t0) / 10_000 * 1e6, 3)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 처리량 벤치마크")
+    parser.add_argument("--logins", type=int, default=100, help="동시 로그인 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, auth_store.WORKERS, 4}))
+    parser.add_argument("--label", default=None, help="결과 파일 이름 (기본: git 커밋 해시)")
+    args = parser.parse_args()
+
+    label = args.label or _git_label()
+    report = {
+        "label": label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "scrypt": {"n": auth_store.SCRYPT_N, "r": auth_store.SCRYPT_R, "p": auth_store.SCRYPT_P},
+        "runs": [run(args.logins, args.workers)],
+    }
+    result = report["runs"][0]
+    print(f"\n=== 동시 로그인 {args.logins}건 (CPU {os.cpu_count()}개) ===")
+    for name, m in result["methods"].items():
+        print(f"  {name:<10} {m['seconds']:>8.3f}s  {m['logins_per_sec']:>8.1f}/s  "
+              f"p50 {m['p50_ms']:>9.2f}ms  p95 {m['p95_ms']:>9.2f}ms  승인 {m['accepted']}")
+    print(f"  token_resolve {result['token_resolve_us']} µs / rerun")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"auth-{label}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+콜드 스타트 벤치마크: 앱 모듈 import 시간과 로그인 화면 첫 렌더 시간.
+
+매 측정마다 새 파이썬 프로세스를 띄워 (import 캐시 없는 상태)
+  - import:      `import app` (bare 모드) 소요 시간과 그 시점에 로드된 무거운 모듈
+  - first_paint: streamlit AppTest 로 로그인 화면을 한 번 렌더하는 시간 (AppTest 자체 import 제외)
+를 재고, 반복 측정의 중앙값을 JSON 으로 저장합니다. 가짜 시트 모드(SSEP_SHEET_BACKEND=fake)로 실행합니다.
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --apps app.py app_ver1.py --repeat 5
+    python benchmarks/bench_cold_start.py --compare benchmarks/results/cold_start-<이전커밋>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_APPS = ["app.py", "app_ver1.py"]
+HEAVY_MODULES = ["pandas", "numpy", "gspread", "google.oauth2.service_account"]
+
+_IMPORT_PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+import streamlit  # streamlit 자체 import 는 앱과 무관하므로 제외
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_PAINT_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+t0 = time.perf_counter()
+at = AppTest.from_file({path!r}, default_timeout=120)
+at.run()
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "exception": bool(at.exception),
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _git_label():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "local"
+
+
+def _probe(code):
+    env = dict(os.environ, SSEP_SHEET_BACKEND="fake")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(app_file, repeat):
+    module = os.path.splitext(app_file)[0]
+    path = os.path.join(ROOT, app_file)
+    imports = [_probe(_IMPORT_PROBE.format(root=ROOT, module=module, heavy=HEAVY_MODULES)) for _ in range(repeat)]
+    paints = [_probe(_PAINT_PROBE.format(path=path, heavy=HEAVY_MODULES)) for _ in range(repeat)]
+    return {
+        "app": app_file,
+        "import_seconds": round(statistics.median(r["seconds"] for r in imports), 4),
+        "import_loaded": imports[-1]["loaded"],
+        "first_paint_seconds": round(statistics.median(r["seconds"] for r in paints), 4),
+        "first_paint_loaded": paints[-1]["loaded"],
+        "first_paint_exception": any(r["exception"] for r in paints),
+    }
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    base_runs = {r["app"]: r for r in baseline["runs"]}
+    print(f"\n비교 기준: {baseline_path} ({baseline.get('label')})")
+    for run in current["runs"]:
+        base = base_runs.get(run["app"])
+        if not base:
+            continue
+        for key in ("import_seconds", "first_paint_seconds"):
+            if base[key]:
+                print(f"{run['app']:<16} {key:<20} {base[key]:>8.4f}s → {run[key]:>8.4f}s (x{run[key] / base[key]:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 콜드 스타트(import / 로그인 화면 첫 렌더) 벤치마크")
+    parser.add_argument("--apps", nargs="+", default=DEFAULT_APPS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--label", default=None, help="결과 파일 이름 (기본: git 커밋 해시)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    label = args.label or _git_label()
+    report = {
+        "label": label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": [],
+    }
+    for app_file in args.apps:
+        run = measure(app_file, args.repeat)
+        report["runs"].append(run)
+        print(f"{app_file:<16} import {run['import_seconds']:>7.4f}s  (로드됨: {', '.join(run['import_loaded']) or '-'})")
+        print(f"{'':<16} 로그인 화면 {run['first_paint_seconds']:>7.4f}s  (로드됨: {', '.join(run['first_paint_loaded']) or '-'})")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"cold_start-{label}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
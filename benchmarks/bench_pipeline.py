@@ -0,0 +1,218 @@
+"""
+app.py 로드(LedgerFeed) → 정규화 → 대시보드 → 저장(전체 / 변경분) 파이프라인 벤치마크.
+
+ssep_data.json 모양의 합성 대장(1k / 10k / 100k 행)을 가짜 워크시트에 올려두고
+앱과 같은 설정의 LedgerFeed(app.ledger_projection)로 읽은 대장에 대해
+단계별 실행 시간, 최대 메모리(tracemalloc), 시트 API 호출 수를 측정하여 JSON 으로 저장합니다.
+NO 번호는 임시 폴더의 대장에서 발급하며, 실행 뒤 프로젝트의 ssep_ids*.json 이 그대로인지 확인합니다.
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_pipeline.py                       # 1k, 10k, 100k
+    python benchmarks/bench_pipeline.py --sizes 1000 10000
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<이전커밋>.json
+"""
+import argparse
+import functools
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402  (bare 모드로 import, main() 은 실행되지 않음)
+from due_index import DueDateIndex  # noqa: E402
+from editor_delta import collect_delta  # noqa: E402
+from fake_sheet import FakeConfig, FakeWorksheet, synthetic_ledger_values  # noqa: E402
+import ledger_registry  # noqa: E402
+from timeline import Timeline  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+TODAY = date(2025, 6, 1)
+
+
+def _git_label():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "local"
+
+
+def isolated_ledger(base_dir):
+    """NO 발급 상태를 base_dir 에 두는 벤치마크용 대장. (기본 대장이면 프로젝트의 ssep_ids.json 에서 번호를 가져감)"""
+    def make_feed(ledger):
+        return app.form_ingest.LedgerFeed(functools.partial(app.sheet_rows_to_dataframe, ledger=ledger),
+                                          poll_interval=0, projection=app.ledger_projection())
+    return ledger_registry.LedgerState(ledger_registry.LedgerConfig("bench", "", "", base_dir=base_dir),
+                                       open_worksheet=None, make_feed=make_feed)
+
+
+def id_files():
+    """프로젝트 폴더의 NO 번호 파일 {경로: 내용}."""
+    files = {}
+    for path in glob.glob(os.path.join(ROOT, "ssep_ids*.json")):
+        with open(path, "rb") as f:
+            files[path] = f.read()
+    return files
+
+
+def _stage(results, name, ws, fn, *args, measure_memory=True):
+    """fn(*args) 를 실행하고 시간/메모리/API 호출 수를 results[name] 에 기록."""
+    calls_before = sum(ws.api_calls.values())
+    if measure_memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn(*args)
+    elapsed = time.perf_counter() - t0
+    peak = 0
+    if measure_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    results[name] = {
+        "seconds": round(elapsed, 6),
+        "peak_mb": round(peak / 1024 / 1024, 3),
+        "api_calls": sum(ws.api_calls.values()) - calls_before,
+    }
+    return out
+
+
+def run_size(n_rows, base_dir, measure_memory=True, latency_ms=0.0):
+    values = synthetic_ledger_values(n_rows, seed=n_rows)
+    ws = FakeWorksheet(values, config=FakeConfig(latency_ms=latency_ms))
+    stages = {}
+
+    # 앱과 같은 경로로 로드: 필요한 열만 읽어 정규화한 공유 대장 (이후 tail / sync 단계도 같은 feed)
+    feed_ws = FakeWorksheet(values, config=FakeConfig(latency_ms=latency_ms))
+    feed = isolated_ledger(base_dir).feed
+    _stage(stages, "ledger_feed.full", feed_ws, feed.refresh, feed_ws, measure_memory=measure_memory)
+    df, _ = feed.snapshot()
+    df = _stage(stages, "drop_logical_duplicate_columns", ws, app.drop_logical_duplicate_columns, df,
+                measure_memory=measure_memory)
+    _stage(stages, "derive_progress_status", ws, app.derive_progress_status, df.copy(),
+           measure_memory=measure_memory)
+
+    def dashboard(frame):
+        index = DueDateIndex()
+        index.sync(frame)
+        return app.compute_dashboard_metrics(frame, "요청수량", index, TODAY)
+
+    _stage(stages, "dashboard_metrics", ws, dashboard, df, measure_memory=measure_memory)
+
+    # 일정 타임라인: 대장 버전마다 한 번 만들고(build), 화면은 기간 조회 / 드릴다운만 함(query)
+    timeline = _stage(stages, "timeline.build", ws, Timeline, df, measure_memory=measure_memory)
+
+    def timeline_query(tl):
+        end = date(TODAY.year, TODAY.month + 3, 1)
+        weeks = tl.buckets("납기", "주", TODAY, end)
+        tl.customers("납기", "주", TODAY, end)
+        tl.calendar("납기", TODAY, end)
+        return tl.bucket_rows("납기", "주", weeks.index[0].date()) if len(weeks) else None
+
+    _stage(stages, "timeline.query", ws, timeline_query, timeline, measure_memory=measure_memory)
+    # 저장은 별도 시트(ws)에 (feed_ws 는 아래 tail / sync 단계에서 계속 씀)
+    _stage(stages, "save_dataframe_to_sheet", ws, app.save_dataframe_to_sheet, df, ws,
+           measure_memory=measure_memory)
+
+    def save_delta(frame):
+        # 에디터에서 10행 수정 + 1행 추가한 경우 (변경분만 정리/기록)
+        state = {
+            "edited_rows": {pos: {"비고": f"bench {pos}"} for pos in range(0, len(frame), max(len(frame) // 10, 1))},
+            "added_rows": [{"업체명": "bench", "요청수량": 1}],
+        }
+        delta = collect_delta(frame, state)
+        delta.updates = app.normalize_rows(delta.updates, "요청수량")
+        delta.inserts = app.normalize_rows(delta.inserts, "요청수량")
+        return app.save_delta_to_sheet(delta, ws, frame)
+
+    _stage(stages, "save_delta_to_sheet", ws, save_delta, df, measure_memory=measure_memory)
+
+    # 폼 응답 수집: 새 응답 10행만 tail-read (저장 단계가 쓰는 ws 와 섞이지 않게 로드한 feed_ws 에서)
+    feed_ws.append_rows([[f"{TODAY} 09:00:{i:02d}"] + list(values[1 + i][1:-1]) + [""] for i in range(10)])
+    _stage(stages, "ledger_feed.tail", feed_ws, feed.refresh, feed_ws, measure_memory=measure_memory)
+    # 시트에서 직접 고친 10행 + 삭제 1행 동기화 (해시 비교 후 바뀐 행만 정규화)
+    _stage(stages, "ledger_feed.sync_noop", feed_ws, feed.refresh, feed_ws, True, measure_memory=measure_memory)
+    note = values[0].index("비고")
+    feed_ws.batch_update([{"range": app.form_ingest.rowcol_to_a1(r, note + 1), "values": [["bench sync"]]}
+                          for r in range(2, n_rows + 2, max(n_rows // 10, 1))][:10])
+    feed_ws._delete_rows(n_rows // 2, n_rows // 2 + 1)  # (Spreadsheet.batch_update 의 deleteDimension 과 같은 처리)
+    _stage(stages, "ledger_feed.sync", feed_ws, feed.refresh, feed_ws, True, measure_memory=measure_memory)
+
+    return {
+        "rows": n_rows,
+        "total_seconds": round(sum(s["seconds"] for s in stages.values()), 6),
+        "api_calls": {"load": dict(feed_ws.api_calls), "save": dict(ws.api_calls)},
+        "stages": stages,
+    }
+
+
+def compare(current, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    base_runs = {r["rows"]: r for r in baseline["runs"]}
+    print(f"\n비교 기준: {baseline_path} ({baseline.get('label')})")
+    for run in current["runs"]:
+        base = base_runs.get(run["rows"])
+        if not base:
+            continue
+        for name, stage in run["stages"].items():
+            prev = base["stages"].get(name)
+            if not prev or not prev["seconds"]:
+                continue
+            ratio = stage["seconds"] / prev["seconds"]
+            flag = "  ⚠️ 느려짐" if ratio > 1.2 else ""
+            print(f"{run['rows']:>8,} {name:<32} {prev['seconds']:>9.4f}s → {stage['seconds']:>9.4f}s (x{ratio:.2f}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="app.py 파이프라인 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--label", default=None, help="결과 파일 이름 (기본: git 커밋 해시)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략 (시간 측정 오버헤드 제거)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="가짜 시트 API 호출당 지연 (ms)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args()
+
+    label = args.label or _git_label()
+    report = {
+        "label": label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "latency_ms": args.latency_ms,
+        "runs": [],
+    }
+    ids_before = id_files()
+    with tempfile.TemporaryDirectory(prefix="ssep_bench_") as tmp:
+        for n in args.sizes:
+            run = run_size(n, os.path.join(tmp, str(n)), measure_memory=not args.no_memory,
+                           latency_ms=args.latency_ms)
+            report["runs"].append(run)
+            print(f"\n=== {n:,} 행 (합계 {run['total_seconds']:.3f}s, API 호출 {run['api_calls']}) ===")
+            for name, s in run["stages"].items():
+                print(f"  {name:<32} {s['seconds']:>9.4f}s  peak {s['peak_mb']:>8.2f} MB  api {s['api_calls']}")
+    if id_files() != ids_before:
+        sys.exit("오류: 벤치마크가 프로젝트의 NO 번호 파일(ssep_ids*.json)을 바꿨습니다.")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+시트 읽기 응답 크기 / 파싱 시간 벤치마크: 전체 읽기(get_all_values) vs 컬럼 골라 읽기(ColumnProjection).
+
+  - all_values:   기존 방식. 모든 열을 표시 형식 문자열로 읽음
+  - projected:    앱이 쓰는 열만 batch_get (샘플금액/진행상태 등 앱이 계산하는 열 제외)
+  - projected+unformatted: 위 + 요청수량/샘플단가를 UNFORMATTED_VALUE 로 따로 읽음 (app.py 기본값)
+
+모드마다 전체 읽기 1회와 새 응답 N행 tail-read 1회를 하고
+  - 응답 본문 크기 (API 가 돌려줄 JSON 과 같은 모양으로 직렬화한 바이트 / gzip 압축 후 바이트)
+  - 클라이언트 쪽 시간: 본문 JSON 디코드, 행 조립(LedgerFeed 의 읽기), 정규화 구간(load.reorder / load.numeric)
+    (가짜 시트 안의 시간 = 실제로는 서버가 하는 일은 빼고 잼. --repeat 번 중 가장 짧은 값)
+  - 시트 API 호출 수
+를 재고 JSON 으로 저장합니다. 진행상태 계산/번호 발급은 모드와 관계없이 같으므로 따로 보고합니다.
+NO 번호는 임시 폴더의 대장에서 발급하며, 실행 뒤 프로젝트의 ssep_ids*.json 이 그대로인지 확인합니다.
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_reads.py
+    python benchmarks/bench_reads.py --sizes 1000 20000 --tail 50
+"""
+import argparse
+import functools
+import glob
+import gzip
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402  (bare 모드로 import, main() 은 실행되지 않음)
+import form_ingest  # noqa: E402
+import ledger_registry  # noqa: E402
+import perf_trace  # noqa: E402
+from fake_sheet import FakeWorksheet, synthetic_ledger_values  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [1_000, 20_000]
+NORMALIZE_STAGES = ("load.reorder", "load.numeric")
+
+
+def _git_label():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "local"
+
+
+class MeasuredWorksheet(FakeWorksheet):
+    """읽기 응답을 API 응답 본문(JSON) 모양으로 직렬화해 크기와 디코드 시간을 기록하는 가짜 워크시트."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reset()
+
+    def reset(self):
+        self.bytes = self.gzip_bytes = 0
+        self.decode_seconds = 0.0
+        self.server_seconds = 0.0  # 가짜 시트 안에서 쓴 시간 (범위 자르기/서식 제거/크기 측정)
+
+    def _account(self, start, body):
+        raw = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.bytes += len(raw)
+        self.gzip_bytes += len(gzip.compress(raw, 6))
+        t0 = time.perf_counter()
+        json.loads(raw)
+        self.decode_seconds += time.perf_counter() - t0
+        self.server_seconds += time.perf_counter() - start
+
+    def get_all_values(self, **kwargs):
+        start = time.perf_counter()
+        values = super().get_all_values(**kwargs)
+        self._account(start, {"range": self.title, "majorDimension": "ROWS", "values": values})
+        return values
+
+    def row_values(self, row, **kwargs):
+        start = time.perf_counter()
+        values = super().row_values(row, **kwargs)
+        self._account(start, {"range": f"{self.title}!{row}:{row}", "majorDimension": "ROWS", "values": [values]})
+        return values
+
+    def get(self, range_name, **kwargs):
+        start = time.perf_counter()
+        values = super().get(range_name, **kwargs)
+        self._account(start, {"range": range_name, "majorDimension": "ROWS", "values": values})
+        return values
+
+    def batch_get(self, ranges, value_render_option=None, **kwargs):
+        start = time.perf_counter()
+        out = super().batch_get(ranges, value_render_option=value_render_option, **kwargs)
+        self._account(start, {"spreadsheetId": "bench", "valueRanges": [
+            {"range": r, "majorDimension": "ROWS", "values": v} for r, v in zip(ranges, out)]})
+        return out
+
+
+def isolated_feed(base_dir, projection):
+    """NO 발급 상태를 base_dir 에 두는 벤치마크용 대장의 LedgerFeed. (기본 대장이면 프로젝트의 ssep_ids.json 에서 번호를 가져감)"""
+    def make_feed(ledger):
+        return form_ingest.LedgerFeed(functools.partial(app.sheet_rows_to_dataframe, ledger=ledger),
+                                      poll_interval=0, projection=projection)
+    return ledger_registry.LedgerState(ledger_registry.LedgerConfig("bench", "", "", base_dir=base_dir),
+                                       open_worksheet=None, make_feed=make_feed).feed
+
+
+def id_files():
+    """프로젝트 폴더의 NO 번호 파일 {경로: 내용}."""
+    files = {}
+    for path in glob.glob(os.path.join(ROOT, "ssep_ids*.json")):
+        with open(path, "rb") as f:
+            files[path] = f.read()
+    return files
+
+
+def _projections():
+    columns = [c for c in app.SHEET_COLUMNS if c not in app.DERIVED_COLUMNS]
+    return {
+        "all_values": None,
+        "projected": form_ingest.ColumnProjection(columns),
+        "projected+unformatted": form_ingest.ColumnProjection(columns, unformatted=app.UNFORMATTED_COLUMNS),
+    }
+
+
+def _measure(ws, fn):
+    """fn() 실행 동안의 응답 크기/디코드/조립/정규화 시간."""
+    ws.reset()
+    calls_before = sum(ws.api_calls.values())
+    perf_trace.begin_run()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    spans = perf_trace.end_run()
+    stage_ms = {}
+    for stage, ms in spans:
+        stage_ms[stage] = stage_ms.get(stage, 0.0) + ms
+    to_frame_ms = sum(ms for stage, ms in spans if stage.startswith("load."))
+    return {
+        "response_bytes": ws.bytes,
+        "response_gzip_bytes": ws.gzip_bytes,
+        "decode_ms": round(ws.decode_seconds * 1000, 2),
+        # 읽은 값으로 to_frame 에 넘길 행을 만드는 시간 (가짜 시트 안의 시간, to_frame 안의 구간 제외)
+        "assemble_ms": round((elapsed - ws.server_seconds) * 1000 - to_frame_ms, 2),
+        "normalize_ms": round(sum(stage_ms.get(s, 0.0) for s in NORMALIZE_STAGES), 2),
+        "status_and_ids_ms": round(stage_ms.get("load.status", 0.0) + stage_ms.get("load.ids", 0.0), 2),
+        "api_calls": sum(ws.api_calls.values()) - calls_before,
+    }
+
+
+def _best(samples):
+    """여러 번 잰 결과에서 항목별 최솟값 (크기/호출 수는 매번 같음)."""
+    return {key: min(s[key] for s in samples) for key in samples[0]}
+
+
+def run_size(n_rows, n_tail, base_dir, repeat=3):
+    values = synthetic_ledger_values(n_rows, seed=n_rows)
+    header = values[0]
+    # 새 폼 응답: 앱이 계산하는 열(샘플금액/진행상태)과 NO 는 빈 칸
+    new_rows = [[f"2026-01-01 09:{i // 60:02d}:{i % 60:02d}"] + list(values[1 + i][1:]) for i in range(n_tail)]
+    for row in new_rows:
+        for col in app.DERIVED_COLUMNS + [app.ID_COL]:
+            row[header.index(col)] = ""
+    result = {"rows": n_rows, "tail_rows": n_tail, "modes": {}}
+    for name, projection in _projections().items():
+        fulls, tails = [], []
+        for i in range(repeat):
+            # 폼 응답 탭처럼 빈 격자(1000행 x 30열)가 있는 시트
+            ws = MeasuredWorksheet([list(r) for r in values], rows=max(1000, n_rows + 1), cols=30)
+            feed = isolated_feed(os.path.join(base_dir, f"{n_rows}-{name}-{i}"), projection)
+            fulls.append(_measure(ws, lambda: feed.refresh(ws)))
+            ws.append_rows(new_rows)
+            tails.append(_measure(ws, lambda: feed.refresh(ws)))
+        result["modes"][name] = {"full": _best(fulls), "tail": _best(tails)}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시트 읽기 응답 크기 / 파싱 시간 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--tail", type=int, default=20, help="tail-read 로 읽을 새 응답 행 수")
+    parser.add_argument("--repeat", type=int, default=3, help="모드마다 반복 횟수 (시간은 최솟값)")
+    parser.add_argument("--label", default=None, help="결과 파일 이름 (기본: git 커밋 해시)")
+    args = parser.parse_args()
+
+    label = args.label or _git_label()
+    ids_before = id_files()
+    with tempfile.TemporaryDirectory(prefix="ssep_bench_") as tmp:
+        runs = [run_size(n, args.tail, tmp, args.repeat) for n in args.sizes]
+    if id_files() != ids_before:
+        sys.exit("오류: 벤치마크가 프로젝트의 NO 번호 파일(ssep_ids*.json)을 바꿨습니다.")
+    report = {
+        "label": label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": runs,
+    }
+    for run in report["runs"]:
+        print(f"\n=== {run['rows']:,}행 (tail {run['tail_rows']}행) ===")
+        print(f"  {'mode':<24}{'read':<6}{'bytes':>12}{'gzip':>11}{'decode':>10}{'assemble':>10}{'normalize':>11}{'calls':>7}")
+        for name, mode in run["modes"].items():
+            for kind, m in mode.items():
+                print(f"  {name:<24}{kind:<6}{m['response_bytes']:>12,}{m['response_gzip_bytes']:>11,}"
+                      f"{m['decode_ms']:>8.1f}ms{m['assemble_ms']:>8.1f}ms{m['normalize_ms']:>9.1f}ms{m['api_calls']:>7}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"reads-{label}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
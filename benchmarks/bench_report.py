@@ -0,0 +1,146 @@
+"""
+업체별 리포트 벤치마크: 업체마다 필터링하는 방식 vs groupby 한 번 (customer_report.build_report).
+
+합성 대장(기본 100k 행 / 500 업체)을 앱과 같은 LedgerFeed 경로로 정규화한 뒤
+  - per_customer: 업체마다 df[df["업체명"] == x] 로 걸러 같은 지표를 계산 (기존 방식)
+  - groupby:      build_report (전체 대장 1회 파싱 + groupby 1회)
+  - to_xlsx / to_json: 결과 내보내기
+를 재고, 두 방식의 업체별 결과가 같은지 확인한 뒤 JSON 으로 저장합니다.
+NO 번호는 임시 폴더의 대장에서 발급하며, 실행 뒤 프로젝트의 ssep_ids*.json 이 그대로인지 확인합니다.
+
+사용법 (프로젝트 루트에서):
+    python benchmarks/bench_report.py
+    python benchmarks/bench_report.py --rows 10000 100000 --customers 500
+    python benchmarks/bench_report.py --skip-baseline        # 업체별 필터 방식 생략
+"""
+import argparse
+import functools
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402  (bare 모드로 import, main() 은 실행되지 않음)
+import customer_report  # noqa: E402
+import ledger_registry  # noqa: E402
+from fake_sheet import FakeWorksheet, synthetic_ledger_values  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def _git_label():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "local"
+
+
+def isolated_ledger(base_dir):
+    """NO 발급 상태를 base_dir 에 두는 벤치마크용 대장. (기본 대장이면 프로젝트의 ssep_ids.json 에서 번호를 가져감)"""
+    def make_feed(ledger):
+        return app.form_ingest.LedgerFeed(functools.partial(app.sheet_rows_to_dataframe, ledger=ledger),
+                                          poll_interval=0, projection=app.ledger_projection())
+    return ledger_registry.LedgerState(ledger_registry.LedgerConfig("bench", "", "", base_dir=base_dir),
+                                       open_worksheet=None, make_feed=make_feed)
+
+
+def id_files():
+    """프로젝트 폴더의 NO 번호 파일 {경로: 내용}."""
+    files = {}
+    for path in glob.glob(os.path.join(ROOT, "ssep_ids*.json")):
+        with open(path, "rb") as f:
+            files[path] = f.read()
+    return files
+
+
+def per_customer_summary(df):
+    """기존 방식: 업체마다 대장을 걸러서 지표 계산 (업체 수 × 행 수)."""
+    rows = []
+    for name in sorted(df["업체명"].astype(str).str.strip().replace("", "(업체명 없음)").unique()):
+        sub = df[df["업체명"].astype(str).str.strip().replace("", "(업체명 없음)") == name]
+        prepared = customer_report.prepare(sub)
+        rows.append(customer_report.summarize(prepared, [customer_report.CUSTOMER_COL]))
+    return pd.concat(rows, ignore_index=True)
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, round(time.perf_counter() - t0, 6)
+
+
+def run(n_rows, n_customers, skip_baseline, base_dir):
+    ws = FakeWorksheet(synthetic_ledger_values(n_rows, n_customers=n_customers, seed=n_rows))
+    feed = isolated_ledger(base_dir).feed
+    feed.refresh(ws)
+    df, _ = feed.snapshot()
+
+    stages = {}
+    report, stages["groupby"] = _timed(customer_report.build_report, df)
+    _, stages["to_xlsx"] = _timed(report.to_xlsx)
+    _, stages["to_json"] = _timed(report.to_json)
+    result = {"rows": n_rows, "customers": len(report.summary), "stages": stages}
+
+    if not skip_baseline:
+        baseline, stages["per_customer"] = _timed(per_customer_summary, df)
+        cols = list(customer_report.METRIC_COLUMNS)
+        result["same_result"] = bool(
+            baseline[customer_report.CUSTOMER_COL].tolist() == report.summary[customer_report.CUSTOMER_COL].tolist()
+            and np.allclose(baseline[cols].to_numpy(float), report.summary[cols].to_numpy(float), equal_nan=True)
+        )
+        result["speedup"] = round(stages["per_customer"] / stages["groupby"], 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업체별 리포트 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--skip-baseline", action="store_true", help="업체별 필터 방식 측정 생략")
+    parser.add_argument("--label", default=None, help="결과 파일 이름 (기본: git 커밋 해시)")
+    args = parser.parse_args()
+
+    label = args.label or _git_label()
+    report = {
+        "label": label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "runs": [],
+    }
+    ids_before = id_files()
+    with tempfile.TemporaryDirectory(prefix="ssep_bench_") as tmp:
+        for n in args.rows:
+            run_result = run(n, args.customers, args.skip_baseline, os.path.join(tmp, str(n)))
+            report["runs"].append(run_result)
+            print(f"\n=== {n:,} 행 / {run_result['customers']} 업체 ===")
+            for name, seconds in run_result["stages"].items():
+                print(f"  {name:<14} {seconds:>9.4f}s")
+            if "speedup" in run_result:
+                print(f"  groupby 가 x{run_result['speedup']} 빠름, 결과 동일: {run_result['same_result']}")
+    if id_files() != ids_before:
+        sys.exit("오류: 벤치마크가 프로젝트의 NO 번호 파일(ssep_ids*.json)을 바꿨습니다.")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"report-{label}.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+대장 변경 이력 저널 (append-only, JSON lines).
+
+- 저장할 때마다 행 단위 변경(행 ID, 컬럼, 이전 값, 새 값, 사용자, 시각)을 한 줄씩 추가
+- 행 ID -> 파일 오프셋 인덱스로 "이 샘플에 무엇이 바뀌었나" 를 파일 전체를 읽지 않고 조회
+- 저널이 COMPACT_EVERY 건을 넘으면 그 시점 상태를 스냅샷으로 접고 저널은 압축 보관
+- reconstruct(ts) 는 ts 이전의 가장 가까운 스냅샷 + 이후 저널만 재생
+
+파일 구성 (base_dir 기준):
+    ssep_history.jsonl                  현재 저널
+    ssep_history/snapshot-<seq>.json.gz 컴팩션 시점 전체 상태 {"seq", "ts", "rows": {행ID: {컬럼: 값}}}
+    ssep_history/journal-<seq>.jsonl.gz 컴팩션된 이전 저널 (이력 조회용 보관)
+"""
+import glob
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+JOURNAL_NAME = "ssep_history.jsonl"
+ARCHIVE_DIR = "ssep_history"
+COMPACT_EVERY = 5000
+
+
+def diff_frames(before: pd.DataFrame, after: pd.DataFrame, columns, key="NO"):
+    """
+    before/after 를 key 로 맞춰 변경 목록을 만든다.
+    - key 가 비어있는(NaN) after 행(임시 ID 부여) 또는 before 에 없는 key 는 insert
+    - after 에 없는 before key 는 delete
+    - 양쪽에 있는 행은 columns 를 문자열로 비교하여 다른 칸마다 update
+    """
+    columns = [c for c in columns if c in before.columns and c in after.columns]
+    b = before.copy()
+    a = after.copy()
+    b_keys = pd.to_numeric(b[key], errors="coerce")
+    a_keys = pd.to_numeric(a[key], errors="coerce")
+
+    b = b[b_keys.notna()].set_index(b_keys[b_keys.notna()].astype(int))
+    inserted = a[a_keys.isna() | ~a_keys.isin(b.index)]
+    a = a[a_keys.notna() & a_keys.isin(b.index)]
+    a = a.set_index(a_keys[a.index].astype(int))
+    deleted = b.index.difference(a.index)
+
+    # 새 행(key 없음)은 기존 최대 key 다음 번호를 임시 행 ID 로 사용
+    max_key = pd.concat([b_keys, a_keys]).max()
+    next_id = 1 if pd.isna(max_key) else int(max_key) + 1
+
+    changes = []
+    for rid in deleted:
+        changes.append({"op": "delete", "row": int(rid), "old": _row_dict(b.loc[rid], columns)})
+    for _, row in inserted.iterrows():
+        rid = pd.to_numeric(row.get(key), errors="coerce")
+        if pd.isna(rid):
+            rid, next_id = next_id, next_id + 1
+        changes.append({"op": "insert", "row": int(rid), "new": _row_dict(row, columns)})
+
+    common = a.index
+    if len(common) and columns:
+        old = b.loc[common, columns].fillna("").astype(str).to_numpy()
+        new = a.loc[common, columns].fillna("").astype(str).to_numpy()
+        rows, cols = np.nonzero(old != new)
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            changes.append({
+                "op": "update",
+                "row": int(common[r]),
+                "col": columns[c],
+                "old": old[r, c],
+                "new": new[r, c],
+            })
+    return changes
+
+
+def _row_dict(row, columns):
+    return {c: ("" if pd.isna(row[c]) else str(row[c])) for c in columns}
+
+
+class ChangeJournal:
+    """프로세스 공용 저널. append/조회는 스레드 안전."""
+
+    def __init__(self, base_dir="."):
+        self.base_dir = base_dir
+        self.path = os.path.join(base_dir, JOURNAL_NAME)
+        self.archive_dir = os.path.join(base_dir, ARCHIVE_DIR)
+        self._lock = threading.Lock()
+        self._offsets = None   # 행 ID -> [현재 저널 내 바이트 오프셋]
+        self._count = 0        # 현재 저널의 항목 수
+        self._seq = 0          # 전체 누적 순번 (스냅샷 포함)
+
+    # ----- 인덱스 -----
+    def _ensure_index(self):
+        """처음 한 번만 현재 저널을 훑어 오프셋 인덱스를 만든다."""
+        if self._offsets is not None:
+            return
+        self._offsets = {}
+        self._count = 0
+        self._seq = self._latest_snapshot_seq()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = f.tell()
+            for line in iter(f.readline, b""):
+                if line.strip():
+                    entry = json.loads(line)
+                    self._offsets.setdefault(entry.get("row"), []).append(offset)
+                    self._count += 1
+                    self._seq = max(self._seq, entry.get("seq", 0))
+                offset = f.tell()
+
+    def _latest_snapshot_seq(self):
+        return max(map(_seq_of, glob.glob(os.path.join(self.archive_dir, "snapshot-*.json.gz"))), default=0)
+
+    # ----- 기록 -----
+    def has_baseline(self):
+        return os.path.isdir(self.archive_dir) and bool(glob.glob(os.path.join(self.archive_dir, "snapshot-*.json.gz")))
+
+    def write_baseline(self, df: pd.DataFrame, columns, key="NO"):
+        """저널을 처음 쓰기 전에 현재 대장 전체를 seq 0 스냅샷으로 남긴다. (시점 복원의 출발점)"""
+        with self._lock:
+            if self.has_baseline():
+                return
+            rows = {str(int(k)): _row_dict(r, [c for c in columns if c in df.columns])
+                    for k, r in df.set_index(key, drop=False).iterrows() if pd.notna(k)}
+            self._write_snapshot(0, rows)
+
+    def append(self, changes, user=""):
+        """변경 목록을 저널 끝에 추가. 추가한 건수를 돌려준다."""
+        if not changes:
+            return 0
+        ts = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self._ensure_index()
+            lines = []
+            for change in changes:
+                self._seq += 1
+                entry = {"seq": self._seq, "ts": ts, "user": user}
+                entry.update(change)
+                lines.append(entry)
+            os.makedirs(self.base_dir or ".", exist_ok=True)
+            with open(self.path, "ab") as f:
+                for entry in lines:
+                    offset = f.tell()
+                    f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+                    self._offsets.setdefault(entry.get("row"), []).append(offset)
+            self._count += len(lines)
+            if self._count >= COMPACT_EVERY:
+                self._compact_locked()
+        return len(changes)
+
+    # ----- 조회 -----
+    def history(self, row_id, include_archived=False):
+        """행 ID 의 변경 이력 (오래된 순). 기본은 현재 저널만, include_archived 면 보관 저널까지."""
+        with self._lock:
+            self._ensure_index()
+            entries = []
+            if include_archived:
+                for path in sorted(glob.glob(os.path.join(self.archive_dir, "journal-*.jsonl.gz")), key=_seq_of):
+                    with gzip.open(path, "rt", encoding="utf-8") as f:
+                        entries.extend(e for e in map(json.loads, f) if e.get("row") == row_id)
+            offsets = self._offsets.get(row_id, [])
+            if offsets:
+                with open(self.path, "rb") as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        entries.append(json.loads(f.readline()))
+        return entries
+
+    def reconstruct(self, at_ts=None):
+        """at_ts(ISO 문자열, None 이면 현재) 시점의 {행ID: {컬럼: 값}} 상태."""
+        with self._lock:
+            self._ensure_index()
+            snap_seq, snap = self._snapshot_before(at_ts)
+            rows = {int(k): dict(v) for k, v in snap["rows"].items()} if snap else {}
+            for entry in self._entries_after(snap_seq):
+                if at_ts and entry["ts"] > at_ts:
+                    break
+                _apply(rows, entry)
+        return rows
+
+    def _snapshot_before(self, at_ts):
+        """at_ts 이전에 만들어진 가장 최근 스냅샷 (seq, 내용). 없으면 (0, None)."""
+        for path in sorted(glob.glob(os.path.join(self.archive_dir, "snapshot-*.json.gz")),
+                           key=_seq_of, reverse=True):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snap = json.load(f)
+            if at_ts and snap["ts"] > at_ts:
+                continue
+            return _seq_of(path), snap
+        return 0, None
+
+    def _entries_after(self, seq):
+        """seq 이후 항목을 순서대로 (보관 저널 → 현재 저널)."""
+        for path in sorted(glob.glob(os.path.join(self.archive_dir, "journal-*.jsonl.gz")), key=_seq_of):
+            if _seq_of(path) <= seq:
+                continue
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for entry in map(json.loads, f):
+                    if entry["seq"] > seq:
+                        yield entry
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if entry["seq"] > seq:
+                            yield entry
+
+    # ----- 컴팩션 -----
+    def compact(self):
+        with self._lock:
+            self._ensure_index()
+            self._compact_locked()
+
+    def _compact_locked(self):
+        """현재까지 상태를 snapshot-<seq> 로 접고 저널을 journal-<seq>.jsonl.gz 로 옮긴 뒤 새 저널 시작."""
+        if not self._count:
+            return
+        prev_seq, prev = self._snapshot_before(None)
+        rows = {int(k): dict(v) for k, v in prev["rows"].items()} if prev else {}
+        for entry in self._entries_after(prev_seq):
+            _apply(rows, entry)
+        self._write_snapshot(self._seq, {str(k): v for k, v in rows.items()})
+
+        with open(self.path, "rb") as src, gzip.open(
+            os.path.join(self.archive_dir, f"journal-{self._seq}.jsonl.gz"), "wb"
+        ) as dst:
+            dst.write(src.read())
+        os.remove(self.path)
+        self._offsets = {}
+        self._count = 0
+
+    def _write_snapshot(self, seq, rows):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"snapshot-{seq}.json.gz")
+        tmp = path + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump({"seq": seq, "ts": datetime.now().isoformat(timespec="seconds"), "rows": rows},
+                      f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def _seq_of(path):
+    """snapshot-<seq>.json.gz / journal-<seq>.jsonl.gz 에서 seq 추출."""
+    name = os.path.basename(path)
+    return int(name.split("-", 1)[1].split(".", 1)[0])
+
+
+def _apply(rows, entry):
+    op = entry.get("op")
+    rid = entry.get("row")
+    if op == "update" and rid is not None:
+        rows.setdefault(rid, {})[entry["col"]] = entry["new"]
+    elif op == "insert" and rid is not None:
+        rows[rid] = dict(entry["new"])
+    elif op == "delete":
+        rows.pop(rid, None)
@@ -0,0 +1,152 @@
+"""
+샘플 목록 편집기(st.data_editor)의 컬럼 스키마.
+
+컬럼마다 종류/표시 형식/선택지/수정 가능한 역할/볼 수 있는 역할을 ColumnSpec 으로 선언하고,
+st.column_config 설정은 (에디터 컬럼 목록, 역할) 마다 한 번만 만들어 스키마 객체에 보관합니다. (editor_config)
+스키마는 프로세스에서 하나를 공유하므로(app.get_column_schema) rerun 마다 드는 비용은 dict 조회 한 번입니다.
+정수 컬럼(int/money)의 형 변환도 스키마를 보고 한 번에 합니다. (coerce_frame)
+
+스키마에 없는 컬럼은 streamlit 기본 설정(수정 가능, 값 형에 맞는 입력)으로 둡니다.
+코드를 고치지 않고 컬럼 설정을 바꾸거나 추가하려면 base_dir/ssep_columns.json 에 적습니다. (같은 이름은 덮어씀)
+    {"columns": [{"name": "출하 장소", "kind": "select", "options": ["본사", "2공장"], "editable_by": ["관리자"]}]}
+
+visible_to 에 없는 역할에게는 컬럼 자체를 화면/내보내기에서 뺍니다. (visible_columns)
+캐시된 대장은 모든 역할이 공유하므로 읽기는 그대로 하고, 화면에 넘기기 직전에 컬럼을 고릅니다.
+"""
+import json
+import os
+import threading
+
+import pandas as pd
+
+import validation
+
+OVERRIDE_NAME = "ssep_columns.json"
+ROLES = ("관리자", "고객사")
+KINDS = ("text", "int", "money", "select", "checkbox")
+INT_KINDS = ("int", "money")
+
+
+class ColumnSpec:
+    """
+    kind: text / int / money(천단위 콤마) / select / checkbox
+    editable_by: 수정 가능한 역할 (빈 값이면 모두 읽기 전용)
+    visible_to: 볼 수 있는 역할 (그 밖의 역할에게는 컬럼을 보여 주지 않음)
+    label: 에디터 머리글 (기본: name)
+    """
+
+    def __init__(self, name, kind="text", label=None, fmt=None, options=None, help=None,
+                 editable_by=ROLES, required=None, visible_to=ROLES):
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 컬럼 종류: {name}={kind}")
+        self.name = name
+        self.kind = kind
+        self.label = label or name
+        self.fmt = fmt
+        self.options = list(options) if options is not None else None
+        self.help = help
+        self.editable_by = tuple(r for r in (editable_by or ()) if r in visible_to)
+        self.visible_to = tuple(visible_to)
+        self.required = required
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["name"], d.get("kind", "text"), d.get("label"), d.get("format"), d.get("options"),
+                   d.get("help"), d.get("editable_by", ROLES), d.get("required"), d.get("visible_to", ROLES))
+
+    def column_config(self, role, st_column_config):
+        """이 컬럼의 st.column_config 설정. st_column_config 는 streamlit.column_config 모듈."""
+        kwargs = {"help": self.help, "disabled": role not in self.editable_by}
+        if self.required is not None:
+            kwargs["required"] = self.required
+        if self.kind in INT_KINDS:
+            return st_column_config.NumberColumn(self.label, format=self.fmt or ("#,###" if self.kind == "money" else "%d"), **kwargs)
+        if self.kind == "select":
+            return st_column_config.SelectboxColumn(self.label, options=self.options or [], **kwargs)
+        if self.kind == "checkbox":
+            return st_column_config.CheckboxColumn(self.label, **kwargs)
+        return st_column_config.TextColumn(self.label, **kwargs)
+
+
+DATE_HELP = "날짜 형식: YYYY-MM-DD 또는 YYYY.MM.DD"
+
+DEFAULT_SCHEMA = [
+    ColumnSpec("NO", "int", editable_by=()),
+    ColumnSpec("타임스탬프", editable_by=()),
+    # format="%,d"는 Streamlit에서 지원하지 않으므로 "%d" (천단위 콤마 없이 정수)
+    ColumnSpec("요청수량", "int", fmt="%d"),
+    # 연락처/이메일(신청자 개인정보)과 단가/금액은 관리자만
+    ColumnSpec("연락처", visible_to=("관리자",)),
+    ColumnSpec("이메일", visible_to=("관리자",)),
+    ColumnSpec("샘플단가", "money", visible_to=("관리자",)),
+    ColumnSpec("샘플금액", "money", editable_by=(), visible_to=("관리자",)),  # 요청수량 × 샘플단가 자동 계산
+    ColumnSpec("운송편", "select", options=validation.ALLOWED_VALUES["운송편"], required=False),
+    ColumnSpec("자재준비", "select", options=validation.ALLOWED_VALUES["자재준비"], required=False),
+    # 진행상태는 날짜/자재준비로 자동 계산되므로 수정 불가
+    ColumnSpec("진행상태", "select", options=["접수", "자재준비", "생산중", "생산완료", "출하완료"], editable_by=()),
+    ColumnSpec("납기일", help=DATE_HELP),
+    ColumnSpec("납기일(예정)", help=f"예상 납기일 입력 ({DATE_HELP})"),
+    ColumnSpec("_삭제", "checkbox", label="삭제", help="체크한 행은 저장 시 삭제됩니다."),
+]
+
+
+class ColumnSchema:
+    def __init__(self, specs=DEFAULT_SCHEMA):
+        self.specs = {spec.name: spec for spec in specs}
+        self._configs = {}  # (컬럼 목록, 역할) -> st.column_config 설정
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, base_dir=".", specs=DEFAULT_SCHEMA):
+        """DEFAULT_SCHEMA 에 base_dir/ssep_columns.json 의 설정을 덮어쓴 스키마."""
+        merged = {spec.name: spec for spec in specs}
+        try:
+            with open(os.path.join(base_dir, OVERRIDE_NAME), encoding="utf-8") as f:
+                for d in json.load(f).get("columns", []):
+                    merged[d["name"]] = ColumnSpec.from_dict(d)
+        except FileNotFoundError:
+            pass
+        return cls(merged.values())
+
+    def add(self, spec: ColumnSpec):
+        """화면 전용 컬럼 등 코드에서 덧붙이는 설정."""
+        with self._lock:
+            self.specs[spec.name] = spec
+            self._configs.clear()
+
+    def visible_columns(self, columns, role):
+        """columns 중 role 이 볼 수 있는 컬럼 (스키마에 없는 컬럼은 모두 볼 수 있음)."""
+        return [c for c in columns if c not in self.specs or role in self.specs[c].visible_to]
+
+    def int_columns(self, columns):
+        return [c for c in columns if c in self.specs and self.specs[c].kind in INT_KINDS]
+
+    def column_config(self, columns, role, st_column_config) -> dict:
+        """columns 중 스키마에 있는 컬럼의 st.column_config 설정 {컬럼: 설정}."""
+        return {c: self.specs[c].column_config(role, st_column_config) for c in columns if c in self.specs}
+
+    def editor_config(self, columns, role, st_column_config) -> dict:
+        """
+        column_config 를 (columns, role) 별로 한 번만 만들어 돌려준다. 돌려준 dict 는 여러 세션이 공유하므로 고치지 말 것.
+        (st.data_editor 는 넘겨받은 설정을 복사해서 쓴다)
+        """
+        key = (tuple(columns), role)
+        config = self._configs.get(key)
+        if config is None:
+            config = self.column_config(key[0], role, st_column_config)
+            with self._lock:
+                self._configs[key] = config
+        return config
+
+
+def coerce_frame(df: pd.DataFrame, schema: ColumnSchema) -> pd.DataFrame:
+    """
+    스키마의 정수 컬럼 중 정수형이 아닌 것만 숫자로 변환 (제자리). 로드 단계에서 이미 정수면 dtype 확인만 한다.
+    "1,000" 같은 문자열은 숫자만 남기고, 빈 값/변환 실패는 0.
+    """
+    for col in schema.int_columns(df.columns):
+        if pd.api.types.is_integer_dtype(df[col]):
+            continue
+        digits = df[col].astype(str).str.replace(r"[^0-9\-]", "", regex=True).replace({"": "0", "-": "0"})
+        df[col] = pd.to_numeric(digits, errors="coerce").fillna(0).astype(int)
+    return df
@@ -0,0 +1,159 @@
+"""
+업체명 별칭 인덱스.
+
+로그인 계정의 업체명(예: "infac")과 대장의 업체명(예: "INFAC 일렉스", "(주)인팩")이 글자 그대로 같지 않아
+df["업체명"] == client_name 으로 거르면 행이 빠집니다. 그래서
+  - normalize_name: NFKC, 대소문자, 공백/기호, 법인 표기((주), 주식회사, Co., Ltd. 등)를 정리한 키
+  - 별칭 파일(ssep_aliases.json): 정규화로도 못 맞추는 이름 {로그인 업체명: [대장 업체명...]}
+로 키 → 행(index) 배열 인덱스를 대장 버전마다 한 번 만들고, 고객사의 행은 dict 조회로 가져옵니다.
+정규화는 행마다가 아니라 서로 다른 업체명 값마다 한 번만 합니다.
+
+첫 단어가 로그인 업체명과 같은 대장 업체명(예: infac → "INFAC 일렉스")은 자동으로 매칭하지 않습니다.
+다른 회사일 수 있으므로 suggestions() 로 관리자 화면에 추천만 하고, 관리자가 별칭으로 연결해야 고객사에게 보입니다.
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ALIAS_NAME = "ssep_aliases.json"
+CUSTOMER_COL = "업체명"
+
+# 법인 표기 (정규화 전에 제거). 영문은 단어 단위로만.
+_CORP_MARKS = re.compile(
+    r"\(주\)|\(유\)|\(사\)|㈜|주식회사|유한회사"
+    r"|\b(?:co|corp|corporation|inc|ltd|llc|limited|company)\b\.?",
+    re.IGNORECASE,
+)
+_NOT_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name) -> str:
+    """비교용 키. 법인 표기와 공백/기호를 빼고 소문자로. (빈 이름은 "")"""
+    text = unicodedata.normalize("NFKC", str(name or "")).casefold()
+    text = _CORP_MARKS.sub(" ", text)
+    return _NOT_WORD.sub("", text)
+
+
+def _first_word(name) -> str:
+    text = _CORP_MARKS.sub(" ", unicodedata.normalize("NFKC", str(name or "")).casefold())
+    words = [w for w in _NOT_WORD.split(text) if w]
+    return words[0] if len(words) > 1 and len(words[0]) >= 2 else ""
+
+
+class CustomerAliasIndex:
+    """
+    ledger_df 의 업체명 → 행(index 라벨) 인덱스.
+    aliases: {로그인 업체명: [대장 업체명 또는 별칭, ...]}
+    """
+
+    def __init__(self, ledger_df: pd.DataFrame, aliases=None, col=CUSTOMER_COL):
+        self.aliases = {normalize_name(k): [normalize_name(v) for v in vs] for k, vs in (aliases or {}).items()}
+        self.names = {}   # 정규화 키 -> [대장 원본 업체명]
+        self.rows = {}    # 정규화 키 -> index 라벨 배열
+        self.counts = {}  # 대장 원본 업체명 -> 건수
+        self.first_words = {}  # 첫 단어 -> {정규화 키}
+        if col not in ledger_df.columns or ledger_df.empty:
+            return
+
+        raw = ledger_df[col].astype(str).str.strip()
+        codes, uniques = pd.factorize(raw)
+        keys = [normalize_name(u) for u in uniques]
+        # 서로 다른 업체명 값 → 키 번호, 행마다 키 번호를 붙여 한 번에 정렬/분할
+        key_ids = pd.factorize(pd.Index(keys))[0]
+        row_keys = key_ids[codes]
+        order = np.argsort(row_keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(row_keys[order])) + 1
+        labels = ledger_df.index.to_numpy()
+        groups = {int(row_keys[g[0]]): labels[g] for g in np.split(order, bounds) if len(g)}
+
+        counts = np.bincount(codes, minlength=len(uniques))
+        for name, key, key_id, count in zip(uniques, keys, key_ids, counts):
+            self.counts[name] = int(count)
+            if not key:
+                continue
+            self.names.setdefault(key, []).append(name)
+            self.rows[key] = groups[int(key_id)]
+            word = _first_word(name)
+            if word and word != key:
+                self.first_words.setdefault(word, set()).add(key)
+
+    def resolve(self, customer):
+        """customer(로그인 업체명)에 해당하는 대장 정규화 키 목록. (정규화 키가 같거나 별칭으로 연결된 것만)"""
+        key = normalize_name(customer)
+        return list(dict.fromkeys(k for k in [key] + self.aliases.get(key, []) if k in self.rows))
+
+    def suggestions(self, customer):
+        """첫 단어가 customer 와 같지만 아직 연결되지 않은 대장 업체명 (관리자 확인용 추천)."""
+        matched = set(self.resolve(customer))
+        keys = sorted(self.first_words.get(normalize_name(customer), set()) - matched)
+        return [name for key in keys for name in self.names[key]]
+
+    def rows_for(self, customer) -> np.ndarray:
+        """customer 의 대장 행 index 라벨 (대장 순서)."""
+        keys = self.resolve(customer)
+        if not keys:
+            return np.empty(0, dtype=np.int64)
+        if len(keys) == 1:
+            return self.rows[keys[0]]
+        return np.sort(np.concatenate([self.rows[k] for k in keys]))
+
+    def matched_names(self, customer):
+        return [name for key in self.resolve(customer) for name in self.names[key]]
+
+    def unmatched(self, customers) -> pd.DataFrame:
+        """어느 고객사 계정에도 연결되지 않은 대장 업체명 (건수 많은 순). 비고에 첫 단어로 추천하는 계정."""
+        matched = {k for c in customers for k in self.resolve(c)}
+        suggested = {}
+        for c in customers:
+            for name in self.suggestions(c):
+                suggested.setdefault(name, []).append(c)
+        rows = []
+        for key, names in self.names.items():
+            if key in matched:
+                continue
+            for name in names:
+                rows.append({
+                    CUSTOMER_COL: name,
+                    "건수": self.counts[name],
+                    "정규화 키": key,
+                    "비고": f"추천: {', '.join(suggested[name])}" if name in suggested else "",
+                })
+        out = pd.DataFrame(rows, columns=[CUSTOMER_COL, "건수", "정규화 키", "비고"])
+        return out.sort_values("건수", ascending=False, kind="stable").reset_index(drop=True)
+
+
+class AliasStore:
+    """별칭 파일. revision 은 저장할 때마다 올라가며 인덱스 캐시 키로 씁니다."""
+
+    def __init__(self, base_dir="."):
+        self.path = os.path.join(base_dir, ALIAS_NAME)
+        self._lock = threading.Lock()
+        self.revision = 0
+        self.aliases = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("aliases", {})
+        except FileNotFoundError:
+            return {}
+
+    def add(self, customer, names):
+        """customer 의 별칭에 names 를 추가해 저장."""
+        with self._lock:
+            aliases = {k: list(v) for k, v in self._read().items()}
+            current = aliases.setdefault(customer, [])
+            current.extend(n for n in names if n not in current)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"aliases": aliases, "updated_at": datetime.now().isoformat(timespec="seconds")},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+            self.aliases = aliases
+            self.revision += 1
@@ -0,0 +1,166 @@
+"""
+업체별 요약 리포트 (월간).
+
+정규화된 대장(LedgerFeed 가 읽어 정규화한 DataFrame)에서 업체마다
+  - 진행상태별 건수, 요청수량/샘플금액 합계
+  - 납기 준수율 (출하일 <= 납기일, 출하일·납기일이 모두 있는 건 기준)
+  - 평균 리드타임 (신청일자 → 출하일, 도면접수일 → 출하일, 일)
+을 계산합니다.
+
+업체마다 df[df["업체명"] == x] 로 걸러 계산하면 업체 수 × 행 수만큼 걸리므로,
+날짜 파싱/지표 컬럼 계산을 전체 대장에 한 번만 하고 groupby 한 번으로 모든 업체(와 월)를 집계합니다.
+결과는 XLSX (요약 / 월별 시트) 또는 JSON 으로 내보냅니다.
+"""
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import ledger_export
+from due_index import parse_dates_vectorized
+
+CUSTOMER_COL = "업체명"
+MONTH_COL = "월"  # 신청일자 기준 YYYY-MM (신청일자가 없으면 "미상")
+UNKNOWN_MONTH = "미상"
+STATUS_ORDER = ("접수", "자재준비", "생산중", "생산완료", "출하완료")
+
+# 리포트 컬럼 (순서 = 출력 순서)
+METRIC_COLUMNS = (
+    ["건수"] + list(STATUS_ORDER)
+    + ["요청수량 합계", "샘플금액 합계", "납기 평가건수", "납기 준수건수", "납기 준수율",
+       "평균 리드타임(신청→출하)", "평균 리드타임(도면→출하)"]
+)
+FORMATS = {
+    **{c: "int" for c in ["건수", *STATUS_ORDER, "요청수량 합계", "샘플금액 합계", "납기 평가건수", "납기 준수건수"]},
+    "납기 준수율": "percent",
+    "평균 리드타임(신청→출하)": "decimal",
+    "평균 리드타임(도면→출하)": "decimal",
+}
+
+
+def _day_numbers(df, col) -> np.ndarray:
+    """날짜 컬럼 → 1970-01-01 기준 일수 (float, 없거나 파싱 실패는 NaN)."""
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    days = parse_dates_vectorized(df[col])
+    return np.where(np.isnat(days), np.nan, days.astype(np.int64).astype(float))
+
+
+def _numbers(df, col) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+def prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    집계용 지표 프레임 (행 = 대장 행). 날짜 파싱과 조건 계산은 여기서 전체 대장에 한 번만 한다.
+    합계/평균만 남도록 건수류는 0/1, 리드타임은 일수(해당 없음은 NaN)로 둔다.
+    """
+    requested = _day_numbers(df, "신청일자")
+    drawing = _day_numbers(df, "도면접수일")
+    due = _day_numbers(df, "납기일")
+    shipped = _day_numbers(df, "출하일")
+
+    month = pd.Series(UNKNOWN_MONTH, index=df.index, dtype=object)
+    has_month = ~np.isnan(requested)
+    month[has_month] = (
+        requested[has_month].astype("int64").astype("datetime64[D]").astype("datetime64[M]").astype(str)
+    )
+
+    status = df["진행상태"].astype(str).str.strip() if "진행상태" in df.columns else pd.Series("", index=df.index)
+    customer = df[CUSTOMER_COL].astype(str).str.strip() if CUSTOMER_COL in df.columns else pd.Series("", index=df.index)
+
+    evaluable = ~np.isnan(shipped) & ~np.isnan(due)
+    out = pd.DataFrame({
+        CUSTOMER_COL: customer.replace("", "(업체명 없음)"),
+        MONTH_COL: month,
+        "건수": 1,
+        **{s: (status == s).to_numpy(dtype=np.int64) for s in STATUS_ORDER},
+        "요청수량 합계": _numbers(df, "요청수량"),
+        "샘플금액 합계": _numbers(df, "샘플금액"),
+        "납기 평가건수": evaluable.astype(np.int64),
+        "납기 준수건수": (evaluable & (shipped <= due)).astype(np.int64),
+        "평균 리드타임(신청→출하)": shipped - requested,
+        "평균 리드타임(도면→출하)": shipped - drawing,
+    }, index=df.index)
+    return out
+
+
+def summarize(prepared: pd.DataFrame, by) -> pd.DataFrame:
+    """prepared 를 by 컬럼(들)로 한 번에 집계. 합계 컬럼은 sum, 리드타임은 mean (NaN 제외)."""
+    sums = [c for c in METRIC_COLUMNS if c in prepared.columns and not c.startswith("평균")]
+    means = [c for c in METRIC_COLUMNS if c.startswith("평균")]
+    grouped = prepared.groupby(list(by), sort=True)
+    out = grouped[sums].sum().join(grouped[means].mean())
+    evaluated = out["납기 평가건수"].replace(0, np.nan)
+    out["납기 준수율"] = out["납기 준수건수"] / evaluated
+    return out[list(METRIC_COLUMNS)].reset_index()
+
+
+class CustomerReport:
+    """
+    summary: 업체별 1행 (기간 전체)
+    monthly: (월, 업체) 별 1행
+    month:   build_report 에 지정한 월 (None 이면 전체 기간)
+    """
+
+    def __init__(self, summary: pd.DataFrame, monthly: pd.DataFrame, month=None):
+        self.summary = summary
+        self.monthly = monthly
+        self.month = month
+        self.generated_at = datetime.now().isoformat(timespec="seconds")
+
+    def customers(self):
+        return self.summary[CUSTOMER_COL].tolist()
+
+    def to_dict(self) -> dict:
+        """{"customers": {업체명: {지표..., "monthly": {월: {지표...}}}}} (NaN 은 None)."""
+        def records(frame):
+            return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+        customers = {}
+        for row in records(self.summary):
+            name = row.pop(CUSTOMER_COL)
+            customers[name] = {**row, "monthly": {}}
+        for row in records(self.monthly):
+            name, month = row.pop(CUSTOMER_COL), row.pop(MONTH_COL)
+            customers[name]["monthly"][month] = row
+        return {"generated_at": self.generated_at, "month": self.month, "customers": customers}
+
+    def to_json(self, indent=None) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent, default=_json_default)
+
+    def to_xlsx(self) -> bytes:
+        return ledger_export.to_xlsx_sheets([
+            ("요약", self.summary, [CUSTOMER_COL, *METRIC_COLUMNS], FORMATS),
+            ("월별", self.monthly, [MONTH_COL, CUSTOMER_COL, *METRIC_COLUMNS], FORMATS),
+        ])
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON 으로 변환할 수 없는 값: {value!r}")
+
+
+def build_report(df: pd.DataFrame, month=None) -> CustomerReport:
+    """
+    모든 업체의 리포트를 한 번에 만든다. month="2025-03" 처럼 지정하면 신청일자가 그 달인 건만 집계.
+    """
+    prepared = prepare(df)
+    if month:
+        prepared = prepared[prepared[MONTH_COL] == month]
+    summary = summarize(prepared, [CUSTOMER_COL])
+    monthly = summarize(prepared, [MONTH_COL, CUSTOMER_COL])
+    return CustomerReport(summary, monthly, month)
+
+
+def available_months(df: pd.DataFrame):
+    """신청일자 기준 월 목록 (최근 월부터)."""
+    if "신청일자" not in df.columns:
+        return []
+    days = parse_dates_vectorized(df["신청일자"])
+    months = np.unique(days[~np.isnat(days)].astype("datetime64[M]"))
+    return [str(m) for m in months[::-1]]
@@ -0,0 +1,168 @@
+"""
+납기일 기준 미출하건 인덱스.
+
+- 출하완료가 아닌 행만 대상으로 (납기일 서수, 행 ID) 를 NumPy 배열로 정렬해 보관
+- 납기 지연 건수 / N일 이내 납기 목록 / 업체별 지연 건수를 이진 탐색으로 계산
+- sync() 로 행별 해시를 비교하여 바뀐 행만 다시 파싱/반영 (매 렌더 전체 파싱 방지)
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+DUE_COL = "납기일"
+STATUS_COL = "진행상태"
+CUSTOMER_COL = "업체명"
+ID_COL = "NO"
+DONE_STATUS = "출하완료"
+
+# parse_date_safe 와 동일한 형식 (순서대로 시도)
+DATE_FORMATS = ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%Y-%m-%d %H:%M:%S")
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def parse_dates_vectorized(values: pd.Series) -> np.ndarray:
+    """문자열 날짜 Series 를 datetime64[D] 배열로 변환 (파싱 실패는 NaT)."""
+    s = values.astype(str).str.strip()
+    parsed = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        todo = parsed.isna() & (s != "")
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(s[todo], format=fmt, errors="coerce")
+    return parsed.values.astype("datetime64[D]")
+
+
+def to_day_ordinal(d) -> int:
+    """date → 1970-01-01 기준 일 서수."""
+    return int(np.datetime64(d, "D").astype(np.int64))
+
+
+class DueDateIndex:
+    """미출하건의 납기일 정렬 인덱스."""
+
+    def __init__(self):
+        self._ordinals = _EMPTY.copy()   # 정렬된 납기일 서수
+        self._row_ids = _EMPTY.copy()    # _ordinals 와 같은 순서의 행 ID
+        self._by_customer = {}           # 업체명 -> 정렬된 납기일 서수 배열
+        self._row_customer = {}          # 행 ID -> 업체명 (인덱스에 들어있는 행만)
+        self._row_hash = {}              # 행 ID -> 마지막으로 반영한 행 해시
+
+    def __len__(self):
+        return len(self._row_ids)
+
+    # ----- 갱신 -----
+    def sync(self, df: pd.DataFrame) -> int:
+        """df 와 인덱스를 맞춘다. 바뀐/추가/삭제된 행만 반영하고 반영한 행 수를 돌려준다."""
+        if ID_COL not in df.columns or DUE_COL not in df.columns:
+            changed = len(self._row_hash)
+            self.__init__()
+            return changed
+
+        cols = [c for c in (ID_COL, DUE_COL, STATUS_COL, CUSTOMER_COL) if c in df.columns]
+        ids = df[ID_COL].to_numpy(dtype=np.int64)
+        hashes = pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy()
+
+        current = set(ids.tolist())
+        removed = [rid for rid in self._row_hash if rid not in current]
+        prev = self._row_hash
+        changed_mask = np.array(
+            [prev.get(rid) != h for rid, h in zip(ids.tolist(), hashes.tolist())],
+            dtype=bool,
+        )
+        if not removed and not changed_mask.any():
+            return 0
+
+        changed_rows = df[changed_mask]
+        self.remove_rows(removed + changed_rows[ID_COL].astype(int).tolist())
+        self.upsert_rows(changed_rows)
+        for rid in removed:
+            self._row_hash.pop(rid, None)
+        self._row_hash.update(zip(ids[changed_mask].tolist(), hashes[changed_mask].tolist()))
+        return len(removed) + int(changed_mask.sum())
+
+    def remove_rows(self, row_ids):
+        """행 ID 목록을 인덱스에서 제거."""
+        row_ids = [rid for rid in row_ids if rid in self._row_customer]
+        if not row_ids:
+            return
+        keep = ~np.isin(self._row_ids, np.asarray(row_ids, dtype=np.int64))
+        removed_ords = self._ordinals[~keep]
+        removed_ids = self._row_ids[~keep]
+        self._ordinals = self._ordinals[keep]
+        self._row_ids = self._row_ids[keep]
+
+        customers = np.array([self._row_customer.pop(rid) for rid in removed_ids.tolist()], dtype=object)
+        for customer in set(customers.tolist()):
+            arr = self._by_customer[customer]
+            # 같은 납기일이 여러 건이면 searchsorted 가 같은 위치를 주므로 순서대로 밀어서 지운다
+            ords = np.sort(removed_ords[customers == customer])
+            pos = np.searchsorted(arr, ords) + np.arange(len(ords)) - np.searchsorted(ords, ords)
+            arr = np.delete(arr, pos)
+            if len(arr):
+                self._by_customer[customer] = arr
+            else:
+                del self._by_customer[customer]
+
+    def upsert_rows(self, rows: pd.DataFrame):
+        """rows 중 미출하 + 납기일 파싱 가능한 행을 정렬 위치에 삽입 (기존 항목은 먼저 remove_rows 로 제거)."""
+        if rows.empty:
+            return
+        open_mask = np.ones(len(rows), dtype=bool)
+        if STATUS_COL in rows.columns:
+            open_mask = (rows[STATUS_COL].astype(str) != DONE_STATUS).to_numpy()
+        days = parse_dates_vectorized(rows[DUE_COL])
+        mask = open_mask & ~np.isnat(days)
+        if not mask.any():
+            return
+
+        new_ords = days[mask].astype(np.int64)
+        new_ids = rows[ID_COL].to_numpy(dtype=np.int64)[mask]
+        customers = (
+            rows[CUSTOMER_COL].astype(str).str.strip().to_numpy()[mask]
+            if CUSTOMER_COL in rows.columns
+            else np.full(len(new_ids), "", dtype=object)
+        )
+
+        order = np.argsort(new_ords, kind="stable")
+        new_ords, new_ids, customers = new_ords[order], new_ids[order], customers[order]
+        pos = np.searchsorted(self._ordinals, new_ords, side="right")
+        self._ordinals = np.insert(self._ordinals, pos, new_ords)
+        self._row_ids = np.insert(self._row_ids, pos, new_ids)
+
+        self._row_customer.update(zip(new_ids.tolist(), customers.tolist()))
+        for customer in set(customers.tolist()):
+            ords = new_ords[customers == customer]  # 이미 정렬된 상태
+            arr = self._by_customer.get(customer, _EMPTY)
+            self._by_customer[customer] = np.insert(arr, np.searchsorted(arr, ords, side="right"), ords)
+
+    # ----- 조회 -----
+    def overdue_count(self, today: date) -> int:
+        """납기일 < today 인 미출하 건수."""
+        return int(np.searchsorted(self._ordinals, to_day_ordinal(today), side="left"))
+
+    def overdue_row_ids(self, today: date) -> np.ndarray:
+        return self._row_ids[: self.overdue_count(today)]
+
+    def due_within(self, today: date, days: int) -> np.ndarray:
+        """today <= 납기일 <= today + days 인 미출하 행 ID (납기일 오름차순)."""
+        t = to_day_ordinal(today)
+        lo = np.searchsorted(self._ordinals, t, side="left")
+        hi = np.searchsorted(self._ordinals, t + int(days), side="right")
+        return self._row_ids[lo:hi]
+
+    def due_until(self, today: date, days: int):
+        """납기일 <= today + days 인 미출하 (행 ID 배열, 납기일 서수 배열). 지연 건 포함, 납기일 오름차순."""
+        hi = np.searchsorted(self._ordinals, to_day_ordinal(today) + int(days), side="right")
+        return self._row_ids[:hi], self._ordinals[:hi]
+
+    def delayed_by_customer(self, today: date) -> dict:
+        """업체명 -> 납기 지연 건수 (0건 업체 제외)."""
+        t = to_day_ordinal(today)
+        counts = {}
+        for customer, arr in self._by_customer.items():
+            n = int(np.searchsorted(arr, t, side="left"))
+            if n:
+                counts[customer] = n
+        return counts
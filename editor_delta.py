@@ -0,0 +1,191 @@
+"""
+st.data_editor 변경분 기반 저장.
+
+st.session_state[<에디터 key>] 에는 편집 전 데이터 대비 바뀐 부분만 들어 있습니다.
+    {"edited_rows": {위치: {컬럼: 값}}, "added_rows": [{컬럼: 값}], "deleted_rows": [위치]}
+(위치 = 에디터에 넘긴 DataFrame 의 0-based 행 위치, 화면 정렬과 무관)
+
+이를 시트 행 번호 기준 변경분(EditorDelta)으로 바꿔, 건드린 행만 정리/재계산하고
+시트에는 수정 행 batch_update 1회 + 새 행 append_rows 1회 + 삭제 행 deleteDimension 1회만 보냅니다.
+에디터에 넘기는 DataFrame 의 index 는 시트 행 번호(헤더=1행, 데이터=2행부터)여야 합니다.
+
+행 번호는 읽은 시점 기준이므로, 그 사이 다른 곳에서 행을 지우거나 끼워 넣었으면 다른 행을 덮어쓰게 됩니다.
+write_delta 에 row_ids 를 주면 쓰기 전에 대상 행의 ID 칸을 읽어 확인하고, 다르면 RowMismatchError 로 멈춥니다.
+"""
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+
+class RowMismatchError(Exception):
+    """시트의 대상 행 ID 가 변경분과 다름 (행 번호가 밀림). rows: 어긋난 시트 행 번호."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        super().__init__(f"시트 행 {', '.join(map(str, rows[:5]))} 의 ID 가 바뀌었습니다")
+
+
+class EditorDelta:
+    """
+    updates: 수정된 기존 행 (index = 시트 행 번호, 편집이 반영된 전체 행)
+    edited_columns: updates 각 행에서 실제로 편집된 컬럼
+    inserts: 새 행 (index 는 의미 없음)
+    deletes: 삭제할 시트 행 번호 (오름차순)
+    """
+
+    def __init__(self, updates: pd.DataFrame, inserts: pd.DataFrame, deletes, edited_columns=None):
+        self.updates = updates
+        self.inserts = inserts
+        self.deletes = sorted(int(r) for r in deletes)
+        self.edited_columns = edited_columns or {}  # 시트 행 번호 -> 사용자가 직접 바꾼 컬럼 집합
+
+    def is_empty(self):
+        return self.updates.empty and self.inserts.empty and not self.deletes
+
+    def summary(self):
+        return f"수정 {len(self.updates)}행 · 추가 {len(self.inserts)}행 · 삭제 {len(self.deletes)}행"
+
+
+def has_edits(state) -> bool:
+    """에디터 상태에 아직 저장하지 않은 수정/추가/삭제가 있는지."""
+    state = state or {}
+    return any(state.get(k) for k in ("edited_rows", "added_rows", "deleted_rows"))
+
+
+def collect_delta(base: pd.DataFrame, state, delete_col="_삭제", display_cols=()) -> EditorDelta:
+    """
+    에디터에 넘긴 base 와 에디터 상태(state)로 변경분을 만든다. base 전체를 복사하지 않고 건드린 행만 다룬다.
+    delete_col 과 display_cols(화면 표시 전용 컬럼)는 결과에서 제외한다.
+    - deleted_rows 또는 delete_col 체크된 행 → deletes
+    - 그 외 edited_rows 행 → updates (base 행에 바뀐 칸만 덮어씀)
+    - added_rows 중 delete_col 이 체크되지 않은 행 → inserts (없는 칸은 base 의 dtype 기본값)
+    """
+    state = state or {}
+    edited = {int(pos): changes for pos, changes in (state.get("edited_rows") or {}).items()}
+    deleted_pos = {int(pos) for pos in (state.get("deleted_rows") or [])}
+    deleted_pos |= {pos for pos, changes in edited.items() if changes.get(delete_col)}
+
+    update_pos = sorted(pos for pos in edited if pos not in deleted_pos)
+    # 에디터 값은 JSON 형태(None, 문자열 등)이므로 object 로 받아 두고 dtype 은 저장 전 정리 단계에서 맞춘다
+    updates = base.iloc[update_pos].astype(object)
+    for pos, label in zip(update_pos, updates.index):
+        for col, value in edited[pos].items():
+            if col in updates.columns:
+                updates.at[label, col] = value
+    updates = updates.infer_objects()
+
+    added = [row for row in (state.get("added_rows") or []) if not row.get(delete_col)]
+    inserts = pd.DataFrame(
+        [{col: row.get(col, _blank(base[col])) for col in base.columns} for row in added],
+        columns=base.columns,
+    )
+
+    deletes = base.index[sorted(p for p in deleted_pos if p < len(base))]
+    drop = [c for c in (delete_col, *display_cols) if c in base.columns]
+    edited_columns = {label: set(edited[pos]) - set(drop) for pos, label in zip(update_pos, updates.index)}
+    return EditorDelta(updates.drop(columns=drop), inserts.drop(columns=drop), deletes, edited_columns)
+
+
+def _blank(series: pd.Series):
+    return 0 if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series) else ""
+
+
+def row_ranges(rows):
+    """정렬된 행 번호를 연속 구간 [(start, end)] 로 묶는다. (end 포함)"""
+    ranges = []
+    for r in rows:
+        if ranges and r == ranges[-1][1] + 1:
+            ranges[-1][1] = r
+        else:
+            ranges.append([r, r])
+    return [tuple(r) for r in ranges]
+
+
+def _id_text(value) -> str:
+    """ID 칸 비교용 문자열. (시트의 "12" 와 DataFrame 의 12 / 12.0 을 같게, 빈 값은 "")"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    text = str(value).strip().replace(",", "")
+    try:
+        return str(int(float(text)))
+    except ValueError:
+        return text
+
+
+def mismatched_rows(ws, row_ids: pd.Series, id_column) -> list:
+    """
+    row_ids(index = 시트 행 번호, 값 = ID)대로 시트의 ID 칸(id_column, 1-based)이 그대로인지
+    batch_get 한 번으로 확인한다. ID 가 다른 시트 행 번호 목록을 돌려준다.
+    """
+    rows = sorted(int(r) for r in row_ids.index)
+    if not rows:
+        return []
+    ranges = row_ranges(rows)
+    blocks = ws.batch_get([f"{rowcol_to_a1(start, id_column)}:{rowcol_to_a1(end, id_column)}"
+                           for start, end in ranges])
+    actual = {}
+    for (start, end), block in zip(ranges, blocks):
+        for offset in range(end - start + 1):
+            cells = block[offset] if offset < len(block) else []
+            actual[start + offset] = _id_text(cells[0] if cells else "")
+    return [r for r, expected in zip(row_ids.index, row_ids) if actual.get(int(r), "") != _id_text(expected)]
+
+
+def write_delta(ws, delta: EditorDelta, columns, row_ids: pd.Series = None, id_col="NO"):
+    """
+    delta 를 시트에 기록한다. columns 는 시트 A열부터의 컬럼 순서.
+    수정 → 추가 → 삭제 순서로 보내서 앞 단계의 행 번호가 뒤 단계 때문에 밀리지 않게 한다.
+    row_ids(index = 수정/삭제할 시트 행 번호, 값 = 그 행의 ID)를 주면 쓰기 전에 시트의 id_col 칸과 맞춰 보고,
+    하나라도 다르면 아무것도 쓰지 않고 RowMismatchError 를 낸다.
+    """
+    if row_ids is not None:
+        mismatched = mismatched_rows(ws, row_ids, columns.index(id_col) + 1)
+        if mismatched:
+            raise RowMismatchError(mismatched)
+
+    if not delta.updates.empty:
+        values = delta.updates.reindex(columns=columns).fillna("")
+        rows = values.values.tolist()
+        data = []
+        labels = list(values.index)
+        pos = 0
+        for start, end in row_ranges(labels):
+            n = end - start + 1
+            data.append({
+                "range": f"{rowcol_to_a1(start, 1)}:{rowcol_to_a1(end, len(columns))}",
+                "values": rows[pos:pos + n],
+            })
+            pos += n
+        ws.batch_update(data)
+
+    if not delta.inserts.empty:
+        ws.append_rows(delta.inserts.reindex(columns=columns).fillna("").values.tolist(), table_range="A1")
+
+    if delta.deletes:
+        # 아래쪽 구간부터 지워야 위쪽 구간의 행 번호가 그대로 유지됨
+        requests = [
+            {"deleteDimension": {"range": {
+                "sheetId": ws.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end,
+            }}}
+            for start, end in reversed(row_ranges(delta.deletes))
+        ]
+        ws.spreadsheet.batch_update({"requests": requests})
+
+
+def apply_delta(frame: pd.DataFrame, delta: EditorDelta) -> pd.DataFrame:
+    """
+    frame(index = 시트 행 번호)에 delta 를 반영한 새 DataFrame. 저장 후 스냅샷 등 전체 상태가 필요할 때 사용.
+    삭제가 있으면 그 아래 행들의 index 는 실제 시트 행 번호와 어긋나므로 다시 로드해서 써야 한다.
+    """
+    out = frame.copy()
+    if not delta.updates.empty:
+        for col in delta.updates.columns:
+            if col in out.columns:
+                out.loc[delta.updates.index, col] = delta.updates[col]
+    if not delta.inserts.empty:
+        start = (int(out.index.max()) + 1) if len(out) else 2
+        inserts = delta.inserts.reindex(columns=out.columns)
+        inserts.index = range(start, start + len(inserts))
+        out = pd.concat([out, inserts])
+    if delta.deletes:
+        out = out.drop(index=[r for r in delta.deletes if r in out.index])
+    return out
@@ -0,0 +1,481 @@
+"""
+오프라인용 가짜 구글 시트 (gspread Client/Spreadsheet/Worksheet 대용) + 합성 대장 데이터 생성기.
+
+실제 구글 인증 없이 앱의 로드/저장 경로를 돌리기 위해 사용합니다.
+환경변수로 켜고 조절합니다. (모든 app*.py 의 시트 연결 함수가 확인)
+
+    SSEP_SHEET_BACKEND=fake          가짜 시트 사용 (기본: google)
+    SSEP_FAKE_ROWS=300               처음 여는 스프레드시트에 채울 합성 행 수
+    SSEP_FAKE_LATENCY_MS=150         API 호출당 지연 (ms)
+    SSEP_FAKE_JITTER_MS=50           지연 랜덤 편차 (ms)
+    SSEP_FAKE_QUOTA_PER_MIN=60       분당 허용 호출 수 (초과 시 429 APIError, 0=무제한)
+    SSEP_FAKE_FAILURE_RATE=0.05      호출이 500 APIError 로 실패할 확률
+    SSEP_FAKE_FAIL_ON=update,clear   항상 실패시킬 메서드 이름 (쉼표 구분)
+    SSEP_FAKE_SEED=0                 합성 데이터/실패 주입 난수 시드
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import date, timedelta
+
+# ssep_data.json(구 대장) 컬럼명 -> 현재 시트(COLUMN_ORDER) 컬럼명
+TEMPLATE_COLUMN_MAP = {
+    "접수일": "신청일자",
+    "부서": "부서명",
+    "담당자": "성함",
+    "차종": "차종(모델)",
+    "품번": "part no",
+}
+
+# app.py 의 SHEET_COLUMNS(COLUMN_ORDER + NO)와 동일 (app.py 는 streamlit 을 import 하므로 여기서 직접 정의)
+SHEET_COLUMNS = [
+    "타임스탬프", "신청일자", "업체명", "부서명", "성함",
+    "차종(모델)", "품명", "part no", "요청수량", "납기일", "납기일(예정)",
+    "요청사항", "연락처", "이메일", "운송편", "비고",
+    "샘플단가", "샘플금액", "도면접수일", "자재준비", "샘플 완료일",
+    "출하일", "진행상태", "출하 장소", "NO",
+]
+
+
+class FakeConfig:
+    """지연/쿼터/실패 주입 설정."""
+
+    def __init__(self, rows=300, latency_ms=0.0, jitter_ms=0.0, quota_per_min=0,
+                 failure_rate=0.0, fail_on=(), seed=0):
+        self.rows = int(rows)
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.quota_per_min = int(quota_per_min)
+        self.failure_rate = float(failure_rate)
+        self.fail_on = set(fail_on)
+        self.seed = int(seed)
+
+    @classmethod
+    def from_env(cls, environ=None):
+        env = os.environ if environ is None else environ
+        return cls(
+            rows=env.get("SSEP_FAKE_ROWS", 300),
+            latency_ms=env.get("SSEP_FAKE_LATENCY_MS", 0),
+            jitter_ms=env.get("SSEP_FAKE_JITTER_MS", 0),
+            quota_per_min=env.get("SSEP_FAKE_QUOTA_PER_MIN", 0),
+            failure_rate=env.get("SSEP_FAKE_FAILURE_RATE", 0),
+            fail_on=[m.strip() for m in env.get("SSEP_FAKE_FAIL_ON", "").split(",") if m.strip()],
+            seed=env.get("SSEP_FAKE_SEED", 0),
+        )
+
+
+class _FakeResponse:
+    """gspread.exceptions.APIError 가 요구하는 최소한의 응답 객체."""
+
+    def __init__(self, code, status, message):
+        self.status_code = code
+        self._payload = {"error": {"code": code, "status": status, "message": message}}
+        self.text = json.dumps(self._payload, ensure_ascii=False)
+
+    def json(self):
+        return self._payload
+
+
+def _api_error(code, status, message):
+    try:
+        from gspread.exceptions import APIError
+    except ImportError:  # gspread 가 없는 환경에서도 동작하도록
+        return RuntimeError(f"[{code}] {status}: {message}")
+    return APIError(_FakeResponse(code, status, message))
+
+
+def _not_found(title):
+    try:
+        from gspread.exceptions import WorksheetNotFound
+    except ImportError:
+        return KeyError(title)
+    return WorksheetNotFound(title)
+
+
+class _CallGate:
+    """모든 API 호출이 거쳐가는 관문: 지연, 분당 쿼터, 실패 주입, 호출 수 집계 (스레드 안전)."""
+
+    def __init__(self, config: FakeConfig):
+        self.config = config
+        self.api_calls = Counter()
+        self._recent = deque()
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, method):
+        cfg = self.config
+        with self._lock:
+            self.api_calls[method] += 1
+            now = time.monotonic()
+            if cfg.quota_per_min:
+                while self._recent and now - self._recent[0] > 60:
+                    self._recent.popleft()
+                if len(self._recent) >= cfg.quota_per_min:
+                    self.api_calls["quota_exceeded"] += 1
+                    raise _api_error(429, "RESOURCE_EXHAUSTED", f"Quota exceeded ({cfg.quota_per_min}/min) on {method}")
+                self._recent.append(now)
+            fail = method in cfg.fail_on or (cfg.failure_rate and self._rng.random() < cfg.failure_rate)
+            delay = max(cfg.latency_ms + self._rng.uniform(-cfg.jitter_ms, cfg.jitter_ms), 0) / 1000
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self.api_calls["failed"] += 1
+            raise _api_error(500, "INTERNAL", f"Injected failure on {method}")
+
+
+class FakeWorksheet:
+    """메모리 상의 2차원 리스트로 동작하는 Worksheet. API 호출 수를 api_calls 에 기록합니다."""
+
+    def __init__(self, values=None, title="Form_Responses 1", spreadsheet=None, sheet_id=0,
+                 rows=1000, cols=26, gate=None, config=None):
+        self.title = title
+        self.id = sheet_id
+        self.spreadsheet = spreadsheet
+        self._values = [list(map(str, row)) for row in (values or [])]
+        self.row_count = max(rows, len(self._values))
+        self.col_count = max([cols] + [len(r) for r in self._values])
+        self._gate = gate or _CallGate(config or FakeConfig())
+        self._lock = threading.RLock()
+
+    @property
+    def api_calls(self):
+        return self._gate.api_calls
+
+    # ----- 읽기 -----
+    def get_all_values(self, **kwargs):
+        self._gate("get_all_values")
+        with self._lock:
+            # 실제 API 와 같이 끝쪽의 빈 행은 돌려주지 않음
+            last = len(self._values)
+            while last and not any(self._values[last - 1]):
+                last -= 1
+            return [list(row) for row in self._values[:last]]
+
+    def row_values(self, row, **kwargs):
+        self._gate("row_values")
+        with self._lock:
+            if row - 1 >= len(self._values):
+                return []
+            values = list(self._values[row - 1])
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def get(self, range_name, **kwargs):
+        """
+        범위 읽기. 끝 행을 생략한 "A10:X" 는 마지막 행까지, 열을 생략한 "1:1" 은 마지막 열까지.
+        실제 API 와 같이 각 행 끝쪽의 빈 칸과 범위 끝쪽의 빈 행은 돌려주지 않는다.
+        """
+        self._gate("get")
+        return self._get_range(range_name)
+
+    def batch_get(self, ranges, major_dimension=None, value_render_option=None, **kwargs):
+        """
+        여러 범위를 한 번의 호출로 읽기. value_render_option="UNFORMATTED_VALUE" 면
+        숫자 모양의 칸("1,000", "12.5")을 int/float 로 돌려준다. (실제 시트의 숫자 서식 칸처럼)
+        major_dimension="COLUMNS" 면 열마다 한 리스트 (끝쪽 빈 칸 / 빈 열은 돌려주지 않음)
+        """
+        self._gate("batch_get")
+        out = [self._get_range(r) for r in ranges]
+        if value_render_option == "UNFORMATTED_VALUE":
+            out = [[[_unformatted(v) for v in row] for row in rows] for rows in out]
+        if major_dimension == "COLUMNS":
+            out = [_columns(rows) for rows in out]
+        return out
+
+    def _get_range(self, range_name):
+        start, _, end = range_name.split("!")[-1].partition(":")
+        end = end or start
+        row0, col0 = _a1_to_index(start)
+        row1, col1 = _a1_to_index(end)
+        if not any(ch.isalpha() for ch in end):
+            col1 = self.col_count
+        with self._lock:
+            stop = row1 + 1 if any(ch.isdigit() for ch in end) else len(self._values)
+            rows = [list(row[col0:col1 + 1]) for row in self._values[row0:stop]]
+        for row in rows:
+            while row and row[-1] == "":
+                row.pop()
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def col_values(self, col, **kwargs):
+        self._gate("col_values")
+        with self._lock:
+            values = [row[col - 1] if col - 1 < len(row) else "" for row in self._values]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    # ----- 쓰기 -----
+    def add_cols(self, cols):
+        self._gate("add_cols")
+        with self._lock:
+            self.col_count += int(cols)
+        self._touch()
+
+    def update(self, range_name, values=None, **kwargs):
+        # gspread 5.x: update(range_name, values) / 6.x: update(values, range_name) 둘 다 허용
+        if not isinstance(range_name, str):
+            range_name, values = (values or "A1"), range_name
+        self._gate("update")
+        self._write(range_name, values)
+        return {"updatedRange": range_name, "updatedRows": len(values)}
+
+    def batch_update(self, data, **kwargs):
+        """여러 범위를 한 번의 호출로 기록 (data = [{"range": "A2:C2", "values": [[...]]}, ...])."""
+        self._gate("batch_update")
+        for item in data:
+            self._write(item["range"], item["values"])
+        return {"totalUpdatedRanges": len(data)}
+
+    def append_row(self, values, **kwargs):
+        return self.append_rows([values], _method="append_row")
+
+    def append_rows(self, values, _method="append_rows", **kwargs):
+        self._gate(_method)
+        with self._lock:
+            # 실제 API 와 같이 마지막으로 값이 있는 행 다음에 추가
+            last = len(self._values)
+            while last and not any(self._values[last - 1]):
+                last -= 1
+            del self._values[last:]
+            for row in values:
+                self._values.append(["" if v is None else str(v) for v in row])
+            self.row_count = max(self.row_count, len(self._values))
+        self._touch()
+        return {"updates": {"updatedRows": len(values)}}
+
+    def clear(self):
+        self._gate("clear")
+        with self._lock:
+            self._values = []
+        self._touch()
+
+    # ----- 내부 -----
+    def _write(self, range_name, values):
+        row0, col0 = _a1_to_index(range_name.split("!")[-1].split(":")[0])
+        with self._lock:
+            width = max((len(row) for row in values), default=0)
+            self._ensure_size(row0 + len(values), col0 + width)
+            for r, row in enumerate(values):
+                self._values[row0 + r][col0:col0 + len(row)] = ["" if v is None else str(v) for v in row]
+        self._touch()
+
+    def _delete_rows(self, start, end):
+        """0-based [start, end) 행 삭제 (Spreadsheet.batch_update 의 deleteDimension 처리용)."""
+        with self._lock:
+            del self._values[start:end]
+        self._touch()
+
+    def _touch(self):
+        if self.spreadsheet is not None:
+            self.spreadsheet._touch()
+
+    def _ensure_size(self, n_rows, n_cols):
+        width = max([n_cols] + [len(r) for r in self._values[:1]])
+        while len(self._values) < n_rows:
+            self._values.append([""] * width)
+        if any(len(row) < n_cols for row in self._values[:n_rows]):
+            for row in self._values:
+                if len(row) < n_cols:
+                    row.extend([""] * (n_cols - len(row)))
+        self.row_count = max(self.row_count, n_rows)
+        self.col_count = max(self.col_count, n_cols)
+
+
+class FakeSpreadsheet:
+    """워크시트 목록을 가진 Spreadsheet."""
+
+    def __init__(self, key, title="신성EP 샘플 관리 대장 (fake)", gate=None):
+        self.id = key
+        self.title = title
+        self._gate = gate or _CallGate(FakeConfig())
+        self._worksheets = []
+        self._lock = threading.Lock()
+        self._revision = 0
+
+    def get_lastUpdateTime(self):
+        """Drive 메타데이터의 modifiedTime 대신 쓰기마다 1씩 올라가는 값 (비교용)."""
+        self._gate("get_lastUpdateTime")
+        return str(self._revision)
+
+    def _touch(self):
+        with self._lock:
+            self._revision += 1
+
+    @property
+    def sheet1(self):
+        return self._worksheets[0]
+
+    def worksheets(self, **kwargs):
+        self._gate("worksheets")
+        return list(self._worksheets)
+
+    def worksheet(self, title):
+        self._gate("worksheet")
+        for ws in self._worksheets:
+            if ws.title == title:
+                return ws
+        raise _not_found(title)
+
+    def add_worksheet(self, title, rows=1000, cols=26, values=None, **kwargs):
+        self._gate("add_worksheet")
+        with self._lock:
+            ws = FakeWorksheet(values, title=title, spreadsheet=self, sheet_id=len(self._worksheets),
+                               rows=rows, cols=cols, gate=self._gate)
+            self._worksheets.append(ws)
+        return ws
+
+    def batch_update(self, body):
+        """spreadsheets.batchUpdate 요청 중 deleteDimension(행 삭제)만 반영하고 나머지는 무시."""
+        self._gate("spreadsheet_batch_update")
+        replies = []
+        for req in body.get("requests", []):
+            rng = req.get("deleteDimension", {}).get("range")
+            if rng and rng.get("dimension") == "ROWS":
+                ws = next(w for w in self._worksheets if w.id == rng.get("sheetId", 0))
+                ws._delete_rows(rng["startIndex"], rng["endIndex"])
+            replies.append({})
+        return {"spreadsheetId": self.id, "replies": replies}
+
+
+class FakeClient:
+    """open_by_key 로 FakeSpreadsheet 를 돌려주는 gspread.Client 대용. 처음 여는 키는 합성 대장으로 채운다."""
+
+    def __init__(self, config: FakeConfig = None):
+        self.config = config or FakeConfig()
+        self.gate = _CallGate(self.config)
+        self._spreadsheets = {}
+        self._lock = threading.Lock()
+
+    @property
+    def api_calls(self):
+        return self.gate.api_calls
+
+    def open_by_key(self, key, worksheet_title="Form_Responses 1"):
+        self.gate("open_by_key")
+        with self._lock:
+            if key not in self._spreadsheets:
+                sh = FakeSpreadsheet(key, gate=self.gate)
+                values = synthetic_ledger_values(self.config.rows, seed=self.config.seed)
+                sh._worksheets.append(FakeWorksheet(values, title=worksheet_title, spreadsheet=sh, gate=self.gate))
+                self._spreadsheets[key] = sh
+            return self._spreadsheets[key]
+
+
+_SHARED_CLIENT = None
+_SHARED_LOCK = threading.Lock()
+
+
+def is_enabled(environ=None) -> bool:
+    """SSEP_SHEET_BACKEND=fake 이면 True."""
+    env = os.environ if environ is None else environ
+    return env.get("SSEP_SHEET_BACKEND", "google").strip().lower() == "fake"
+
+
+def get_fake_client() -> FakeClient:
+    """프로세스 공용 FakeClient (모든 세션이 같은 가짜 시트를 공유)."""
+    global _SHARED_CLIENT
+    with _SHARED_LOCK:
+        if _SHARED_CLIENT is None:
+            _SHARED_CLIENT = FakeClient(FakeConfig.from_env())
+        return _SHARED_CLIENT
+
+
+_NUMBER = re.compile(r"-?\d{1,3}(,\d{3})+(\.\d+)?|-?\d+(\.\d+)?")
+
+
+def _unformatted(value):
+    """숫자 모양의 문자열을 숫자로 (UNFORMATTED_VALUE 흉내). 그 외는 그대로."""
+    if not _NUMBER.fullmatch(value):
+        return value
+    number = float(value.replace(",", ""))
+    return int(number) if number.is_integer() and "." not in value else number
+
+
+def _columns(rows):
+    """행 목록 -> 열 목록 (API 의 majorDimension=COLUMNS 응답처럼 끝쪽 빈 칸/빈 열 제거)"""
+    width = max((len(row) for row in rows), default=0)
+    cols = [[row[c] if c < len(row) else "" for row in rows] for c in range(width)]
+    for col in cols:
+        while col and col[-1] == "":
+            col.pop()
+    while cols and not cols[-1]:
+        cols.pop()
+    return cols
+
+
+def _a1_to_index(a1: str):
+    """'B3' -> (2, 1) (0-based 행, 열)."""
+    letters = "".join(ch for ch in a1 if ch.isalpha()).upper()
+    digits = "".join(ch for ch in a1 if ch.isdigit())
+    col = 0
+    for ch in letters:
+        col = col * 26 + (ord(ch) - ord("A") + 1)
+    return (int(digits) - 1 if digits else 0), max(col - 1, 0)
+
+
+def synthetic_ledger_values(n_rows, n_customers=20, seed=0, template_path="ssep_data.json"):
+    """
+    ssep_data.json 의 컬럼별 값 분포를 바탕으로 n_rows 행짜리 시트 값(헤더 포함)을 만든다.
+    날짜는 접수일 기준으로 납기/완료/출하가 이어지도록 생성하고, 일부 행은 미완료로 남긴다.
+    """
+    rng = random.Random(seed)
+    pools = {}
+    path = template_path if os.path.isabs(template_path) else os.path.join(os.path.dirname(__file__), template_path)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for rec in json.load(f):
+                for key, val in rec.items():
+                    col = TEMPLATE_COLUMN_MAP.get(key, key)
+                    if col in SHEET_COLUMNS:
+                        pools.setdefault(col, []).append(str(val))
+
+    # 실제 대장에 있는 업체명을 먼저 쓰고 나머지는 가상 업체명으로 채움
+    customers = sorted(set(pools.get("업체명", [])))[:n_customers]
+    customers += [f"고객사{i:03d}" for i in range(n_customers - len(customers))]
+    base = date(2024, 1, 1)
+    rows = [list(SHEET_COLUMNS)]
+    for i in range(n_rows):
+        ordered = base + timedelta(days=rng.randrange(0, 730))
+        due = ordered + timedelta(days=rng.randrange(14, 60))
+        stage = rng.random()
+        done = ordered + timedelta(days=rng.randrange(7, 50)) if stage < 0.7 else None
+        shipped = done + timedelta(days=rng.randrange(1, 10)) if done and stage < 0.5 else None
+        qty = rng.choice([1, 5, 10, 20, 30, 50, 100, 200, 360])
+        price = rng.choice([0, 1000, 2500, 5000, 12000])
+        rec = {
+            "타임스탬프": f"{ordered.isoformat()} {rng.randrange(8, 19):02d}:{rng.randrange(60):02d}:00",
+            "신청일자": ordered.isoformat(),
+            "업체명": rng.choice(customers),
+            "요청수량": str(qty),
+            "납기일": due.isoformat() if rng.random() > 0.1 else "",
+            "납기일(예정)": (due + timedelta(days=rng.randrange(-3, 7))).strftime("%Y.%m.%d") if rng.random() > 0.5 else "",
+            "연락처": f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}",
+            "이메일": f"user{rng.randrange(1000)}@example.com",
+            "운송편": rng.choice(["", "항공", "선박", "핸드캐리"]),
+            "샘플단가": str(price),
+            "샘플금액": str(qty * price),
+            "도면접수일": (ordered + timedelta(days=rng.randrange(0, 5))).isoformat() if rng.random() > 0.5 else "",
+            "자재준비": rng.choice(["", "준비중", "완료"]),
+            "샘플 완료일": done.isoformat() if done else "",
+            "출하일": shipped.isoformat() if shipped else "",
+            "진행상태": "",
+            "NO": str(i + 1),
+        }
+        row = []
+        for col in SHEET_COLUMNS:
+            if col in rec:
+                row.append(rec[col])
+            elif col in pools:
+                row.append(rng.choice(pools[col]))
+            else:
+                row.append("")
+        rows.append(row)
+    return rows
@@ -0,0 +1,409 @@
+"""
+구글 폼 응답 탭 증분 수집 (tail-read).
+
+프로세스 하나에서 공유하는 정규화된 대장 캐시(LedgerFeed)를 두고
+  - 처음 (캐시가 없을 때): get_all_values() 로 전체 읽기 + 전체 정규화
+  - 그 외: 마지막으로 수집한 행부터 끝까지만 범위로 읽기 (ws.get("A<n>:<마지막 열>"))
+    첫 행(이미 가진 마지막 행)의 타임스탬프가 캐시와 같으면 그 뒤 행만 새 응답으로 정규화해 캐시 끝에 붙이고,
+    다르면(중간 행 삭제/정렬/시트에서 직접 편집) 동기화(sync)로 되돌아감
+  - POLL_INTERVAL_SEC 안에 다시 불리면 API 호출 없이 캐시를 그대로 사용 (세션이 많아도 시트 호출은 한 번)
+  - revision(ws) 를 주면 (스프레드시트 수정 시각) 값이 그대로일 때 범위 읽기도 하지 않고,
+    바뀌었는데 새 행이 없으면 시트 중간이 고쳐진 것이므로 동기화
+  - 동기화 (강제 새로고침 / request_sync() / FULL_REFRESH_SEC 경과 / 위의 경우):
+    시트 전체 값을 읽되, 마지막으로 정규화한 시트 원본 행마다 내용 해시를 두고
+    SYNC_CHUNK_ROWS 행 단위 해시부터 비교해 바뀐 청크 안에서만 행 해시를 비교합니다.
+    내용이 같은 행은 캐시의 정규화된 행을 그대로 쓰고(행이 삭제/삽입되어 위치가 밀렸으면 해시로 짝을 찾아 행 번호만 바꿈),
+    바뀐/새 행만 to_frame 으로 정규화합니다. (시트 API 에는 서버 쪽 해시가 없어 값 자체는 내려받음)
+평상시 새로고침 비용(API 응답 크기, 정규화)은 대장 크기가 아니라 새 응답 수에 비례하고,
+동기화 비용은 대부분 해시 계산이며 정규화/진행상태 계산은 바뀐 행 수에 비례합니다.
+앱에서 저장한 행은 apply_updates() 로 캐시에 바로 반영합니다. (시트를 다시 읽지 않음)
+시트 읽기와 정규화는 잠금 밖에서 하고 결과를 바꿔 끼울 때만 잠그므로, 큰 대장을 읽는 동안에도
+다른 세션의 snapshot() / changes_since() 는 기다리지 않습니다.
+
+projection(ColumnProjection) 을 주면 전체 읽기/범위 읽기 모두 앱이 쓰는 컬럼 범위만 batch_get 으로 읽습니다.
+(앱이 계산하는 컬럼이나 폼의 다른 질문 열은 내려받지 않음. 읽지 않은 열은 "" 로 채운 시트 폭의 행을 to_frame 에 넘김)
+
+캐시가 바뀔 때마다 version 이 올라가고 (version, kind, rows) 이벤트가 남습니다.
+  kind: "append"(새 행) / "update"(앱에서 저장했거나 동기화에서 바뀐 행)
+        / "reload"(전체 읽기, 또는 동기화에서 행 위치가 밀림. rows=None)
+  rows: 바뀐 시트 행 번호 목록 (= frame.index)
+세션은 changes_since(마지막으로 본 version) 으로 바뀐 행만 가져갑니다.
+"""
+import re
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+POLL_INTERVAL_SEC = 10      # 이 간격 안의 새로고침 요청은 캐시로 응답
+FULL_REFRESH_SEC = 600      # 이 간격마다 한 번은 전체 읽기 (시트에서 직접 고친 값 반영)
+MARKER_COL = "타임스탬프"    # 마지막 수집 행 확인용 컬럼 (없으면 행 전체 비교)
+ID_COL = "NO"               # to_frame 이 빈 칸에 번호를 발급해 시트에 기록하는 컬럼
+SYNC_CHUNK_ROWS = 1000      # 동기화 때 해시를 먼저 비교하는 행 묶음 크기
+SYNC_MAX_CHANGED = 0.5      # 바뀐 행이 이 비율을 넘으면 동기화 대신 전체 정규화
+KEEP_EVENTS = 100
+
+
+def _pad(row, width):
+    row = list(row[:width])
+    return row + [""] * (width - len(row))
+
+
+def _row_hashes(rows) -> np.ndarray:
+    """시트 원본 행마다 내용 해시 (같은 프로세스 안에서만 비교)"""
+    return np.fromiter((hash(tuple(row)) for row in rows), dtype=np.int64, count=len(rows))
+
+
+def _chunk_hashes(hashes, size=SYNC_CHUNK_ROWS):
+    return [hash(hashes[i:i + size].tobytes()) for i in range(0, len(hashes), size)]
+
+
+def _runs(positions):
+    """정렬된 위치 목록 -> 연속 구간 [(첫, 끝), ...] (끝 포함)"""
+    runs = []
+    for p in positions:
+        if runs and runs[-1][1] == p - 1:
+            runs[-1][1] = p
+        else:
+            runs.append([p, p])
+    return runs
+
+
+def _trim(row):
+    """끝쪽 빈 칸 제거 (API 는 행 끝의 빈 칸을 돌려주지 않음)"""
+    row = list(row)
+    while row and row[-1] == "":
+        row.pop()
+    return row
+
+
+def _ids(frames):
+    """frames 의 NO 값 (to_frame 의 known_ids)"""
+    ids = [f[ID_COL].to_numpy() for f in frames if ID_COL in f.columns]
+    return np.concatenate(ids) if ids else None
+
+
+def _column_letter(col):
+    """0부터 센 열 번호 -> A1 열 문자"""
+    return re.sub(r"\d+$", "", rowcol_to_a1(1, col + 1))
+
+
+class ColumnProjection:
+    """
+    시트에서 읽을 컬럼만 골라 읽는 방법. (LedgerFeed(projection=...))
+    columns: 읽을 컬럼 이름 (MARKER_COL 은 항상 포함). 시트 헤더에서 연속된 열끼리 묶어 범위 하나로 읽는다.
+    unformatted: 전체 읽기에서 표시 형식 없이(UNFORMATTED_VALUE) 읽을 컬럼. 숫자 칸이 "1,000" 이 아니라 1000 으로 온다.
+        value_render_option 은 호출 단위라 이 컬럼들은 batch_get 을 한 번 더 한다.
+        (새 행 몇 개만 읽는 범위 읽기에서는 호출을 늘리지 않도록 다른 컬럼과 같이 형식 있는 값으로 읽음)
+    """
+
+    def __init__(self, columns, unformatted=()):
+        self.unformatted = set(unformatted)
+        self.columns = set(columns) | {MARKER_COL} | self.unformatted
+
+    def plan(self, header, unformatted=True):
+        """[(value_render_option, [(첫 열, 끝 열), ...])] (열 번호는 0부터, 끝 열 포함)"""
+        out = []
+        separate = self.unformatted if unformatted else set()
+        for option, names in (("FORMATTED_VALUE", self.columns - separate), ("UNFORMATTED_VALUE", separate)):
+            cols = [i for i, name in enumerate(header) if name in names]
+            runs = []
+            for i in cols:
+                if runs and runs[-1][1] == i - 1:
+                    runs[-1][1] = i
+                else:
+                    runs.append([i, i])
+            if runs:
+                out.append((option, [tuple(r) for r in runs]))
+        return out
+
+    def read(self, ws, header, first_row):
+        """
+        first_row 행부터 끝까지, 시트 폭(len(header))의 행 목록. 읽지 않은 열은 "".
+        first_row == 1 (전체 읽기) 이면 같은 호출에서 헤더 행 전체("1:1")도 읽어 header 와 비교하고,
+        열이 추가/이동되었으면 None.
+        열 단위(majorDimension=COLUMNS)로 받아 응답의 리스트 수를 행 수가 아니라 열 수로 줄이고, 행은 zip 으로 만든다.
+        """
+        width = len(header)
+        start = max(first_row, 2)
+        columns = [None] * width
+        sheet_header = None
+        for option, runs in self.plan(header, unformatted=first_row == 1):
+            ranges = [f"{_column_letter(c0)}{start}:{_column_letter(c1)}" for c0, c1 in runs]
+            if first_row == 1 and option == "FORMATTED_VALUE":
+                ranges.insert(0, "1:1")
+            results = ws.batch_get(ranges, major_dimension="COLUMNS", value_render_option=option)
+            if len(ranges) > len(runs):
+                sheet_header = [col[0] if col else "" for col in results[0]]
+                results = results[1:]
+            for (c0, c1), cols in zip(runs, results):
+                columns[c0:c0 + len(cols)] = cols[:c1 - c0 + 1]
+        if first_row == 1 and _trim([str(h).strip() for h in sheet_header or []]) != _trim(header):
+            return None
+        n = max((len(col) for col in columns if col), default=0)
+        blank = [""] * n
+        columns = [blank if not col else col if len(col) == n else col + blank[len(col):] for col in columns]
+        rows = [list(row) for row in zip(*columns)] if width else []
+        return [list(header)] + rows if first_row == 1 else rows
+
+
+class LedgerFeed:
+    """
+    to_frame(ws, header, rows, first_row, known_ids=None) -> 정규화된 대장 DataFrame (index = 시트 행 번호)
+        (일부 행만 정규화할 때는 캐시의 나머지 행 NO 를 known_ids 로 넘겨 그 번호와 겹치는 행에 새 번호를 매기게 함)
+    frame 은 여러 세션이 공유하므로 읽기 전용으로 다루고, 고칠 때는 copy() 해서 쓴다.
+    """
+
+    def __init__(self, to_frame, poll_interval=POLL_INTERVAL_SEC, full_refresh=FULL_REFRESH_SEC,
+                 clock=time.monotonic, revision=None, projection: ColumnProjection = None):
+        self.to_frame = to_frame
+        self.revision = revision    # revision(ws) -> 시트 수정 시각 (None 을 돌려주면 확인 안 함)
+        self.projection = projection
+        self.poll_interval = poll_interval
+        self.full_refresh = full_refresh
+        self._clock = clock
+        self._lock = threading.Lock()           # 캐시 상태(frame, version, ...) 읽기/바꿔 끼우기
+        self._refresh_lock = threading.Lock()   # 새로고침(시트 읽기 + 정규화)은 한 번에 하나만
+        self._generation = 0        # apply_updates() / invalidate() 때마다 증가 (진행 중 새로고침 결과를 버릴지 판단)
+        self._events = deque(maxlen=KEEP_EVENTS)  # (version, kind, rows)
+        self.version = 0
+        self.frame = None
+        self.header = []
+        self.rows = 0               # 수집한 데이터 행 수 (헤더 제외)
+        self.last_marker = None     # 마지막 수집 행의 타임스탬프 (또는 행 전체)
+        self._last_poll = None
+        self._last_full = None
+        self._revision = None       # 마지막으로 읽은 시점의 revision(ws)
+        self._hashes = None         # 마지막으로 정규화한 시트 원본 행의 내용 해시 (frame 과 같은 순서)
+        self._sync_requests = 0     # request_sync() 호출 수 (동기화가 끝나면 0)
+
+    # ----- 알림 -----
+    def changes_since(self, version):
+        """version 이후의 [(version, kind, rows)]. 보관 범위보다 오래됐으면 None (전체를 다시 가져갈 것)."""
+        with self._lock:
+            events = [e for e in self._events if e[0] > version]
+            if events and events[0][0] != version + 1:
+                return None
+            return events
+
+    def _bump(self, kind, rows):
+        self.version += 1
+        self._events.append((self.version, kind, rows))
+
+    def snapshot(self):
+        """(frame, version) 을 한 번에. frame 은 공유 객체이므로 고치지 말 것."""
+        with self._lock:
+            return self.frame, self.version
+
+    # ----- 새로고침 -----
+    def invalidate(self):
+        """캐시를 비운다. 다음 refresh() 에서 전체를 다시 읽고 모두 정규화한다."""
+        with self._lock:
+            self.frame = None
+            self._hashes = None
+            self._generation += 1
+
+    def request_sync(self):
+        """다음 refresh() 에서 시트 전체와 동기화한다. (앱에서 행 삭제/복원한 뒤, 다시 불러오기)"""
+        with self._lock:
+            self._sync_requests += 1
+            self._last_poll = None
+
+    def apply_updates(self, updates: pd.DataFrame):
+        """
+        앱에서 시트에 저장한 기존 행(updates, index = 시트 행 번호)을 캐시에 반영한다.
+        시트 수정 시각은 우리가 바꾼 것이므로 다음 새로고침에서 범위 읽기로 확인만 한다. (새 행이 없어도 전체 읽기 안 함)
+        """
+        with self._lock:
+            if self.frame is None or updates.empty:
+                return
+            rows = [r for r in updates.index if r in self.frame.index]
+            # 세션들이 지금 frame 을 들고 있을 수 있으므로 제자리에서 고치지 않고 바꿔 끼운다
+            frame = self.frame.copy()
+            self._generation += 1  # 진행 중인 새로고침은 이 변경 전 캐시를 기준으로 했으므로 버림
+            try:
+                for col in [c for c in updates.columns if c in frame.columns]:
+                    frame.loc[rows, col] = updates.loc[rows, col].astype(frame[col].dtype)
+            except (TypeError, ValueError):
+                self.frame = None  # 형이 안 맞으면 다음 새로고침에서 전체 읽기
+                return
+            self.frame = frame
+            self._revision = None
+            self._last_poll = None
+            self._bump("update", rows)
+
+    def refresh(self, ws, force=False) -> int:
+        """
+        캐시를 최신으로 맞추고 새로 붙은 행 수를 돌려준다. (전체 읽기면 전체 행 수)
+        시트 읽기와 정규화는 _lock 밖에서 하고 결과를 바꿔 끼울 때만 잡으므로, 그동안에도
+        snapshot() / changes_since() 는 기다리지 않는다. 새로고침끼리는 _refresh_lock 으로 하나씩 하며,
+        이미 다른 세션이 새로고침 중이면 (첫 로드나 force 가 아닌 한) 기다리지 않고 지금 캐시를 쓴다.
+        """
+        with self._lock:
+            loaded = self.frame is not None
+        if not self._refresh_lock.acquire(blocking=force or not loaded):
+            return 0
+        try:
+            with self._lock:
+                now = self._clock()
+                if (self.frame is not None and not force and self._last_poll is not None
+                        and now - self._last_poll < self.poll_interval):
+                    return 0
+                self._last_poll = now
+                base = (self.frame, self._hashes, self._generation, self._sync_requests)
+                sync = force or self._sync_requests or (self._last_full is not None
+                                                        and now - self._last_full >= self.full_refresh)
+                last_revision = self._revision
+            # 데이터보다 수정 시각을 먼저 읽어 둔다 (읽는 사이의 변경은 다음 새로고침에서 다시 잡힘)
+            revision = self.revision(ws) if self.revision else None
+            if base[0] is None:
+                return self._load_all(ws, now, revision, base)
+            if sync:
+                return self._sync(ws, now, revision, base)
+            if revision is not None and revision == last_revision:
+                return 0
+            return self._load_tail(ws, now, revision, base, last_revision)
+        finally:
+            self._refresh_lock.release()
+
+    def _swap(self, base, events=(), full=False, **state):
+        """
+        잠금 안에서 새로고침 결과(state: 바꿀 속성)를 바꿔 끼우고 이벤트를 남긴다.
+        그사이 apply_updates() / invalidate() 가 캐시를 바꿨으면 버리고 다음 refresh() 에서 다시 읽는다.
+        full: 시트 전체를 읽은 결과 (그사이 들어온 request_sync() 가 없으면 요청을 지움)
+        """
+        _, _, generation, sync_requests = base
+        with self._lock:
+            if generation != self._generation:
+                self._last_poll = None
+                return False
+            for name, value in state.items():
+                setattr(self, name, value)
+            if full and self._sync_requests == sync_requests:
+                self._sync_requests = 0
+            for kind, rows in events:
+                self._bump(kind, rows)
+            return True
+
+    def _marker(self, row, header=None):
+        header = self.header if header is None else header
+        if MARKER_COL in header:
+            return row[header.index(MARKER_COL)]
+        return tuple(row)
+
+    def _read_all(self, ws):
+        if self.projection is None:
+            return ws.get_all_values()
+        header = self.header or [str(h).strip() for h in ws.row_values(1)]
+        values = self.projection.read(ws, header, 1) if header else None
+        # 열이 추가/이동되어 헤더가 다르면 이번만 전체를 읽고 새 헤더로 다음부터 다시 골라 읽음
+        return values if values is not None else ws.get_all_values()
+
+    def _remember(self, header, rows, added):
+        """정규화한 원본 행의 해시. to_frame 이 시트에 기록한 NO 는 원본 행에도 반영해 다음 동기화에서 바뀐 행으로 보지 않는다."""
+        if ID_COL in header and ID_COL in added.columns:
+            col = header.index(ID_COL)
+            for row, number in zip(rows, added[ID_COL].tolist()):
+                row[col] = str(number)
+        return _row_hashes(rows)
+
+    def _load_all(self, ws, now, revision, base, values=None):
+        values = self._read_all(ws) if values is None else values
+        header = [str(h).strip() for h in values[0]] if values else []
+        rows = [_pad(r, len(header)) for r in values[1:]]
+        frame = self.to_frame(ws, header, rows, 2)
+        hashes = self._remember(header, rows, frame)
+        self._swap(base, [("reload", None)], full=True, frame=frame, header=header, _hashes=hashes,
+                   **self._finish(header, rows, now, revision))
+        return len(rows)
+
+    def _finish(self, header, rows, now, revision):
+        """전체를 읽은 뒤 바꿀 속성"""
+        return {"rows": len(rows), "last_marker": self._marker(rows[-1] if rows else header, header),
+                "_last_full": now, "_revision": revision}
+
+    def _sync(self, ws, now, revision, base):
+        """시트 전체 값을 읽어 내용이 바뀐 행만 정규화해 캐시에 반영. 바뀐(새로 정규화한) 행 수를 돌려준다."""
+        frame, old = base[0], base[1]
+        values = self._read_all(ws)
+        header = [str(h).strip() for h in values[0]] if values else []
+        if old is None or header != self.header or len(old) != len(frame):
+            return self._load_all(ws, now, revision, base, values)
+        rows = [_pad(r, len(header)) for r in values[1:]]
+        new = _row_hashes(rows)
+
+        # 1) 같은 위치끼리: 청크 해시가 다른 청크에서만 행 해시 비교
+        common = min(len(old), len(new))
+        take = np.full(len(new), -1, dtype=np.int64)  # 새 위치 -> 내용이 같은 캐시 행 위치 (-1 = 정규화 필요)
+        take[:common] = np.arange(common)
+        for i, (a, b) in enumerate(zip(_chunk_hashes(old[:common]), _chunk_hashes(new[:common]))):
+            if a != b:
+                lo, hi = i * SYNC_CHUNK_ROWS, min((i + 1) * SYNC_CHUNK_ROWS, common)
+                take[lo:hi][old[lo:hi] != new[lo:hi]] = -1
+        shifted = len(new) < len(old)
+        if shifted or (take[:common] < 0).sum() > SYNC_MAX_CHANGED * max(len(new), 1):
+            # 2) 행이 삭제/삽입되어 위치가 밀림: 내용 해시로 캐시 행과 짝을 찾음
+            shifted = True
+            positions = {}
+            for pos, h in enumerate(old.tolist()):
+                positions.setdefault(h, deque()).append(pos)
+            for i, h in enumerate(new.tolist()):
+                queue = positions.get(h)
+                take[i] = queue.popleft() if queue else -1
+
+        missing = np.flatnonzero(take < 0)
+        if len(missing) > SYNC_MAX_CHANGED * max(len(new), 1):
+            return self._load_all(ws, now, revision, base, values)
+        keep = np.flatnonzero(take >= 0)
+        kept = frame.iloc[take[keep]]
+        kept.index = keep + 2
+        parts, hashes = [kept], new.copy()
+        for first, last in _runs(missing.tolist()):
+            chunk = rows[first:last + 1]
+            added = self.to_frame(ws, header, chunk, first + 2, known_ids=_ids(parts))
+            hashes[first:last + 1] = self._remember(header, chunk, added)
+            parts.append(added)
+        if len(missing) or shifted:
+            frame = pd.concat(parts).sort_index() if len(parts) > 1 else kept
+
+        events = []
+        if shifted or (keep != take[keep]).any():
+            events.append(("reload", None))
+        else:
+            labels = (missing + 2).tolist()
+            updated = [r for r in labels if r < len(old) + 2]
+            if updated:
+                events.append(("update", updated))
+            if len(updated) < len(labels):
+                events.append(("append", labels[len(updated):]))
+        self._swap(base, events, full=True, frame=frame, _hashes=hashes, **self._finish(header, rows, now, revision))
+        return len(missing)
+
+    def _load_tail(self, ws, now, revision, base, last_revision):
+        frame, hashes = base[0], base[1]
+        width = len(self.header)
+        # 이미 가진 마지막 행(헤더=1행, 데이터=2행부터)부터 끝까지
+        if self.projection is not None:
+            got = self.projection.read(ws, self.header, self.rows + 1)
+        else:
+            got = ws.get(f"A{self.rows + 1}:{_column_letter(max(width, 1) - 1)}")
+        if not got or self._marker(_pad(got[0], width)) != self.last_marker:
+            return self._sync(ws, now, revision, base)
+        new_rows = [_pad(r, width) for r in got[1:]]
+        if not new_rows:
+            if revision is not None and last_revision is not None:
+                # 수정 시각은 바뀌었는데 새 행이 없음 = 시트 중간이 고쳐짐
+                return self._sync(ws, now, revision, base)
+            self._swap(base, _revision=revision)
+            return 0
+        first_row = self.rows + 2
+        added = self.to_frame(ws, self.header, new_rows, first_row, known_ids=_ids([frame]))
+        # 새 행에 NO 를 기록하며(to_frame) 수정 시각이 또 바뀌므로, 다음 새로고침은 범위 읽기로 확인만 한다
+        self._swap(base, [("append", list(added.index))],
+                   frame=pd.concat([frame, added]) if len(frame) else added,
+                   _hashes=np.concatenate([hashes, self._remember(self.header, new_rows, added)]),
+                   rows=self.rows + len(new_rows), last_marker=self._marker(new_rows[-1]), _revision=None)
+        return len(new_rows)
@@ -0,0 +1,162 @@
+"""
+샘플 번호(NO) 발급기.
+
+NO 는 시트의 번호 열에 저장하고, 번호가 비어 있거나 중복된 행(구글 폼으로 새로 들어온 응답, 앱에서 추가한 행 등)에만
+새 번호를 매깁니다. 한 번 매긴 번호는 바뀌지 않으므로 변경 이력/스냅샷의 행 ID 로 그대로 쓸 수 있습니다.
+
+- 번호는 단조 증가. 삭제된 행의 번호도 다시 쓰지 않음
+- BLOCK_SIZE 개씩 상한(high-water mark)을 파일에 먼저 기록해 예약하고, 예약 안에서는 메모리에서만 발급
+  (발급마다 디스크를 쓰지 않음. 여러 행도 np.arange 한 번으로 발급)
+- 프로세스가 재시작되면 예약만 하고 쓰지 않은 번호는 건너뜀 (빈 번호는 생겨도 중복은 생기지 않음)
+- observe(): 시트에 이미 있는 최대 번호 이하로는 발급하지 않음 (다른 앱/수동 입력 대비)
+- 중복 검사는 넘겨받은 행끼리 + known(캐시에 이미 있는 다른 행들의 번호)과 비교 (tail-read 로 새 행만 읽을 때)
+- 발급기는 프로세스(streamlit 서버) 하나에서 대장마다 공유합니다. (st.cache_resource)
+
+파일: base_dir/ssep_ids.json  {"high_water": <예약한 마지막 번호>, "updated_at": "..."}
+      (같은 폴더에서 여러 대장을 쓰는 앱은 state_name(ws) 로 대장마다 파일을 나눔)
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+from editor_delta import row_ranges
+
+STATE_NAME = "ssep_ids.json"
+BLOCK_SIZE = 100
+ID_COL = "NO"
+
+
+def state_name(ws) -> str:
+    """워크시트(대장)별 상한 파일 이름."""
+    return f"ssep_ids_{ws.spreadsheet.id}_{ws.id}.json"
+
+
+def missing_ids(ids: pd.Series, known=None):
+    """
+    (번호 float 배열, 새 번호가 필요한 위치 mask). 빈 값/숫자 아님/0 이하/소수/중복(두 번째부터)이 대상.
+    known: ids 밖의 행들이 이미 쓰고 있는 번호. 이 번호와 같은 것도 중복으로 본다.
+    """
+    series = pd.Series(ids)
+    try:
+        # 모두 정수 문자열인 평소 경우는 to_numeric 보다 빠른 정수 변환 한 번으로 끝냄
+        numbers = series.astype(np.int64).to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        numbers = pd.to_numeric(series.replace("", np.nan), errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(numbers) & (numbers > 0) & (numbers == np.round(numbers))
+    duplicated = valid & pd.Series(numbers).duplicated().to_numpy()
+    if known is not None and len(known):
+        duplicated |= valid & np.isin(numbers, np.asarray(known, dtype=float))
+    return numbers, ~valid | duplicated
+
+
+class IdAllocator:
+    def __init__(self, base_dir=".", block_size=BLOCK_SIZE, name=STATE_NAME):
+        self.path = os.path.join(base_dir, name)
+        self.block_size = int(block_size)
+        self._lock = threading.Lock()
+        self._next = None  # 다음에 줄 번호 (None = 예약한 블록 없음)
+        self._limit = 0    # 예약한 마지막 번호 (포함)
+        self._floor = 0    # 시트에서 본 최대 번호
+
+    # ----- 상한 파일 -----
+    def _read_high_water(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return int(json.load(f).get("high_water", 0))
+        except FileNotFoundError:
+            return 0
+
+    def _write_high_water(self, value):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"high_water": int(value), "updated_at": datetime.now().isoformat(timespec="seconds")}, f)
+        os.replace(tmp, self.path)
+
+    def _reserve_locked(self, n):
+        """n 개 이상 남도록 블록 단위로 상한을 올려 파일에 먼저 기록한다."""
+        high_water = self._read_high_water()
+        if self._next is not None and high_water == self._limit and self._next > self._floor:
+            start = self._next  # 마지막 예약이 이 블록이면 이어서 발급
+        else:
+            start = max(high_water, self._limit, self._floor) + 1
+        blocks = -(-n // self.block_size)
+        limit = start + blocks * self.block_size - 1
+        self._write_high_water(limit)
+        self._next, self._limit = start, limit
+
+    # ----- 발급 -----
+    def observe(self, max_existing):
+        """시트에 이미 있는 최대 번호를 알려준다. 이후 발급은 이보다 큰 번호부터."""
+        with self._lock:
+            self._floor = max(self._floor, int(max_existing))
+
+    def allocate(self, n) -> np.ndarray:
+        """단조 증가하는 새 번호 n 개 (int64 배열)."""
+        n = int(n)
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+        with self._lock:
+            if self._next is None or self._next <= self._floor or self._limit - self._next + 1 < n:
+                self._reserve_locked(n)
+            ids = np.arange(self._next, self._next + n, dtype=np.int64)
+            self._next += n
+            return ids
+
+    def assign_missing(self, ids: pd.Series, known=None):
+        """(채워진 int64 배열, 새로 매긴 위치 mask). 기존 번호는 그대로 두고 빈/중복 번호만 새로 발급."""
+        numbers, missing = missing_ids(ids, known)
+        if (~missing).any():
+            self.observe(numbers[~missing].max())
+        out = np.where(missing, 0, np.nan_to_num(numbers)).astype(np.int64)
+        out[missing] = self.allocate(int(missing.sum()))
+        return out, missing
+
+
+_sheet_lock = threading.Lock()
+
+
+def ensure_sheet_ids(allocator: IdAllocator, ws, header, ids: pd.Series, column=ID_COL, first_row=2, known=None):
+    """
+    시트에서 읽은 번호 열 값(ids, first_row 행부터 데이터 행 순서)에서 빈/중복 번호를 채우고 새로 매긴 칸만 시트에 기록한다.
+    시트에 번호 열이 없으면 헤더 끝에 만든다. (채워진 int64 배열, 새로 매긴 행 수) 를 돌려준다.
+    같은 프로세스의 다른 세션이 먼저 채웠을 수 있으므로 잠금 안에서 해당 행 구간의 번호 칸만 다시 읽고 발급한다.
+    일부 행만 넘길 때(tail-read / 동기화)는 나머지 행의 번호를 known 으로 넘겨야 그 번호와의 중복도 잡는다.
+    """
+    ids = pd.Series(ids).reset_index(drop=True)
+    numbers, missing = missing_ids(ids, known)
+    if not missing.any():
+        if len(numbers):
+            allocator.observe(numbers.max())
+        return numbers.astype(np.int64), 0
+
+    with _sheet_lock:
+        header = list(header)
+        if column in header:
+            col = header.index(column) + 1
+            cells = ws.get(f"{rowcol_to_a1(first_row, col)}:{rowcol_to_a1(first_row + len(ids) - 1, col)}")
+            fresh = [row[0] if row else "" for row in cells]
+            ids = pd.Series((fresh + [""] * len(ids))[:len(ids)])
+        else:
+            col = len(header) + 1
+        out, missing = allocator.assign_missing(ids, known)
+        rows = np.flatnonzero(missing) + first_row  # 시트 행 번호
+        if not len(rows):
+            return out, 0
+
+        if col > ws.col_count:
+            ws.add_cols(col - ws.col_count)
+        data = [] if column in header else [{"range": rowcol_to_a1(1, col), "values": [[column]]}]
+        new_ids = dict(zip(rows.tolist(), out[missing].tolist()))
+        # 연속된 행은 한 범위로 묶어 batch_update 1회
+        for first, last in row_ranges(rows.tolist()):
+            data.append({
+                "range": f"{rowcol_to_a1(first, col)}:{rowcol_to_a1(last, col)}",
+                "values": [[new_ids[r]] for r in range(first, last + 1)],
+            })
+        ws.batch_update(data)
+        return out, len(rows)
@@ -0,0 +1,63 @@
+"""
+처음 속성에 접근할 때 실제로 import 하는 모듈 프록시 (표준 라이브러리만 사용).
+
+    pd = lazy_import.module("pandas")
+    service_account = lazy_import.module("google.oauth2.service_account")
+    ...
+    pd.DataFrame(...)   # 이 시점에 pandas 를 import
+
+로그인 화면처럼 데이터가 필요 없는 화면에서는 pandas / gspread / google-auth import 비용을 치르지 않고,
+로그인 직후 preload() 로 백그라운드 스레드에서 미리 불러 둘 수 있습니다.
+함수 시그니처의 타입 힌트가 import 를 일으키지 않도록 사용하는 쪽은 `from __future__ import annotations` 를 둡니다.
+"""
+import importlib
+import sys
+import threading
+
+_lock = threading.Lock()
+
+
+class LazyModule:
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            # 두 스레드가 동시에 접근해도 import 는 한 번만 (import 자체도 락을 잡지만 프록시 상태를 보호)
+            with _lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__dict__['_name']!r} ({state})>"
+
+
+def module(name) -> LazyModule:
+    return LazyModule(name)
+
+
+def is_loaded(name) -> bool:
+    return name in sys.modules
+
+
+def preload(names):
+    """names 를 순서대로 import (백그라운드 워밍업용). 실패한 모듈은 건너뛰고 {이름: 예외} 를 돌려준다."""
+    errors = {}
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            errors[name] = e
+    return errors
@@ -0,0 +1,129 @@
+"""
+리드타임 / 처리량 분석.
+
+대장의 단계별 날짜(접수 → 도면접수 → 자재요청 → 샘플완료 → 출하)를 datetime64[D] 배열로 한 번 파싱하고
+  - 단계별 소요일 (직전에 기록된 단계부터, 접수→출하 전체)
+  - 업체 / 차종 / 운송편별 리드타임 백분위 (p50, p90 등)
+  - 주간 처리량 (주별 접수 건수 / 출하 건수)
+을 행 단위 파이썬 루프 없이 계산합니다.
+
+단계 날짜 컬럼은 대장마다 이름이 조금씩 달라(구 대장 ssep_data.json 은 '접수일', 현재 시트는 '신청일자')
+MILESTONES 의 후보 중 먼저 있는 컬럼을 씁니다. 없는 단계는 건너뜁니다. (현재 시트에는 '자재 요청일'이 없음)
+"""
+import numpy as np
+import pandas as pd
+
+from due_index import parse_dates_vectorized
+
+# (단계 이름, 날짜 컬럼 후보)
+MILESTONES = (
+    ("접수", ("신청일자", "접수일")),
+    ("도면접수", ("도면접수일",)),
+    ("자재요청", ("자재 요청일",)),
+    ("샘플완료", ("샘플 완료일",)),
+    ("출하", ("출하일",)),
+)
+TOTAL_STAGE = "접수→출하"
+GROUP_COLUMNS = {"업체": "업체명", "차종": "차종(모델)", "운송편": "운송편"}
+QUANTILES = (0.5, 0.9)
+
+# 캐시 키(대장 버전)를 만들 때 보는 컬럼
+INPUT_COLUMNS = tuple(c for _, cols in MILESTONES for c in cols) + tuple(GROUP_COLUMNS.values())
+
+
+def milestone_dates(df: pd.DataFrame) -> dict:
+    """{단계 이름: datetime64[D] 배열} (대장에 있는 단계만, 순서 유지)."""
+    out = {}
+    for name, candidates in MILESTONES:
+        col = next((c for c in candidates if c in df.columns), None)
+        if col is not None:
+            out[name] = parse_dates_vectorized(df[col])
+    return out
+
+
+def _days_between(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """end - start (일, float). 한쪽이 없거나 순서가 뒤집힌(음수) 경우는 NaN."""
+    days = (end - start).astype("timedelta64[D]").astype(np.float64)
+    days[np.isnat(start) | np.isnat(end)] = np.nan
+    days[days < 0] = np.nan
+    return days
+
+
+def stage_durations(df: pd.DataFrame, dates=None) -> pd.DataFrame:
+    """
+    행별 단계 소요일 (index = df.index).
+    "→도면접수", "→샘플완료" 처럼 각 단계 날짜까지 직전에 기록된 단계부터 걸린 일수와 전체 "접수→출하".
+    (예: 자재 요청일이 비어 있으면 "→샘플완료" 는 도면접수일부터 잰다)
+    """
+    dates = milestone_dates(df) if dates is None else dates
+    names = list(dates)
+    out = {}
+    if names:
+        prev = dates[names[0]]
+        for name in names[1:]:
+            current = dates[name]
+            out[f"→{name}"] = _days_between(prev, current)
+            prev = np.where(np.isnat(current), prev, current)
+    if "접수" in dates and "출하" in dates:
+        out[TOTAL_STAGE] = _days_between(dates["접수"], dates["출하"])
+    # 대장에 값이 하나도 없는 단계는 제외
+    return pd.DataFrame(out, index=df.index).dropna(axis=1, how="all")
+
+
+def stage_summary(durations: pd.DataFrame, quantiles=QUANTILES) -> pd.DataFrame:
+    """단계별 건수 / 평균 / 백분위 (행 = 단계)."""
+    if durations.empty:
+        return pd.DataFrame(columns=["건수", "평균"] + [_q_label(q) for q in quantiles])
+    out = pd.DataFrame({"건수": durations.count(), "평균": durations.mean()})
+    for q in quantiles:
+        out[_q_label(q)] = durations.quantile(q)
+    return out
+
+
+def lead_time_percentiles(df: pd.DataFrame, durations: pd.DataFrame, group_col,
+                          stage=TOTAL_STAGE, quantiles=QUANTILES) -> pd.DataFrame:
+    """group_col 별 stage 리드타임 건수 / 평균 / 백분위. (리드타임이 있는 행만, 건수 많은 순)"""
+    if group_col not in df.columns or stage not in durations.columns:
+        return pd.DataFrame()
+    values = durations[stage]
+    keys = df[group_col].astype(str).str.strip().replace("", "(미입력)")
+    valid = values.notna()
+    grouped = values[valid].groupby(keys[valid], sort=False)
+    out = pd.DataFrame({"건수": grouped.size(), "평균": grouped.mean()})
+    # grouped.quantile 은 그룹 전체를 한 번에 계산 (그룹마다 루프 없음)
+    pct = grouped.quantile(list(quantiles)).unstack()
+    for q in quantiles:
+        out[_q_label(q)] = pct[q]
+    out.index.name = group_col
+    return out.sort_values("건수", ascending=False).reset_index()
+
+
+def weekly_throughput(dates: dict) -> pd.DataFrame:
+    """주(월요일 시작)별 접수 / 출하 건수. index = 주 시작일."""
+    series = {}
+    for name, label in (("접수", "접수 건수"), ("출하", "출하 건수")):
+        if name not in dates:
+            continue
+        days = dates[name][~np.isnat(dates[name])].astype(np.int64)
+        # 1970-01-01 은 목요일 → (days + 3) % 7 이 월요일부터의 경과일
+        monday = (days - (days + 3) % 7).astype("datetime64[D]")
+        series[label] = pd.Series(monday).value_counts()
+    if not series:
+        return pd.DataFrame()
+    out = pd.DataFrame(series).fillna(0).astype(int).sort_index()
+    out.index.name = "주 시작일"
+    return out
+
+
+def analyze(df: pd.DataFrame, quantiles=QUANTILES) -> dict:
+    """관리자 탭에 표시하는 분석 결과 전체. {"stages", "by_업체", "by_차종", "by_운송편", "weekly"}"""
+    dates = milestone_dates(df)
+    durations = stage_durations(df, dates)
+    out = {"stages": stage_summary(durations, quantiles), "weekly": weekly_throughput(dates)}
+    for label, col in GROUP_COLUMNS.items():
+        out[f"by_{label}"] = lead_time_percentiles(df, durations, col, quantiles=quantiles)
+    return out
+
+
+def _q_label(q):
+    return f"p{int(round(q * 100))}"
@@ -0,0 +1,277 @@
+"""
+대장 내보내기 (XLSX / CSV).
+
+- XLSX: 시트 XML 을 CHUNK_ROWS 행씩 zip 에 바로 스트리밍 (워크북 전체를 메모리에 올리지 않음)
+  수량/단가/금액은 천단위 콤마, 날짜 컬럼은 실제 날짜 셀(yyyy-mm-dd)로 기록. 날짜로 읽히지 않는 값은 문자열 그대로
+- CSV: CHUNK_ROWS 행씩 to_csv, Excel 에서 한글이 깨지지 않도록 UTF-8 BOM
+- ExportCache: (대장 버전, 필터, 형식) -> 파일 bytes LRU. 같은 데이터를 다시 받으면 즉시 반환
+- to_xlsx_sheets: 여러 시트 + 컬럼별 서식(int/date/decimal/percent) 지정 (업체별 리포트 등에서 사용)
+"""
+import csv
+import hashlib
+import io
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from due_index import parse_dates_vectorized
+
+CHUNK_ROWS = 5000
+CACHE_ENTRIES = 8
+
+NUMBER_COLUMNS = ("NO", "요청수량", "샘플단가", "샘플금액")
+DATE_COLUMNS = ("신청일자", "납기일", "납기일(예정)", "도면접수일", "샘플 완료일", "출하일")
+DATE_FORMAT = "yyyy-mm-dd"
+
+# styles.xml 의 cellXfs 순서
+_XF_NUMBER, _XF_DATE, _XF_HEADER, _XF_DECIMAL, _XF_PERCENT = 1, 2, 3, 4, 5
+_EXCEL_EPOCH_OFFSET = 25569  # 1970-01-01 의 Excel 날짜 일련번호
+_ILLEGAL_XML = r"[\x00-\x08\x0b\x0c\x0e-\x1f]"
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIME = "text/csv"
+
+
+def frame_version(df: pd.DataFrame, columns) -> str:
+    """df[columns] 내용 지문 (행 순서 포함). 캐시 키의 '대장 버전'으로 사용."""
+    cols = [c for c in columns if c in df.columns]
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\x1f".join(cols).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df[cols], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _chunks(df: pd.DataFrame):
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS]
+
+
+def _xml_text(s: pd.Series) -> pd.Series:
+    """XML 본문용 이스케이프 + XML 에 쓸 수 없는 제어문자 제거."""
+    return (
+        s.str.replace(_ILLEGAL_XML, "", regex=True)
+        .str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+    )
+
+
+def _string_cells(s: pd.Series) -> pd.Series:
+    text = s.fillna("").astype(str)
+    cells = '<c t="inlineStr"><is><t xml:space="preserve">' + _xml_text(text) + "</t></is></c>"
+    return cells.where(text != "", "<c/>")
+
+
+def ledger_formats(columns) -> dict:
+    """대장 컬럼의 기본 서식: 수량/단가/금액은 int, 날짜 컬럼은 date, 나머지는 문자열."""
+    formats = {c: "int" for c in columns if c in NUMBER_COLUMNS}
+    formats.update({c: "date" for c in columns if c in DATE_COLUMNS})
+    return formats
+
+
+def _number_cells(s: pd.Series, xf, decimals=None) -> pd.Series:
+    numbers = pd.to_numeric(s, errors="coerce")
+    if decimals is None:
+        text = numbers.round().astype("Int64").astype(str)
+    else:
+        text = numbers.round(decimals).astype(str)
+    return (f'<c s="{xf}"><v>' + text + "</v></c>").where(numbers.notna(), "<c/>")
+
+
+def _column_cells(s: pd.Series, kind=None) -> pd.Series:
+    """한 컬럼 청크를 <c> 조각 문자열 Series 로. (셀 위치는 순서로 정해지므로 빈 칸도 <c/> 로 채움)"""
+    if kind == "int":
+        return _number_cells(s, _XF_NUMBER)
+    if kind == "decimal":
+        return _number_cells(s, _XF_DECIMAL, decimals=6)
+    if kind == "percent":
+        return _number_cells(s, _XF_PERCENT, decimals=6)
+    if kind == "date":
+        parsed = parse_dates_vectorized(s)
+        ok = ~np.isnat(parsed)
+        serial = pd.Series(np.where(ok, parsed.astype(np.int64) + _EXCEL_EPOCH_OFFSET, 0), index=s.index)
+        dates = f'<c s="{_XF_DATE}"><v>' + serial.astype(str) + "</v></c>"
+        # 날짜로 읽히지 않는 값은 문자열 그대로
+        return dates.where(ok, _string_cells(s))
+    return _string_cells(s)
+
+
+def to_xlsx(df: pd.DataFrame, columns, sheet_title="샘플 대장") -> bytes:
+    """대장 1개 시트짜리 xlsx. 수량/단가/금액은 #,##0, 날짜는 yyyy-mm-dd 서식의 날짜 값."""
+    return to_xlsx_sheets([(sheet_title, df, columns, ledger_formats(columns))])
+
+
+def to_xlsx_sheets(sheets) -> bytes:
+    """
+    sheets: [(시트 이름, df, columns, {컬럼: "int"|"date"|"decimal"|"percent"})] - 서식이 없는 컬럼은 문자열.
+    시트 XML 을 CHUNK_ROWS 행씩 zip 스트림에 바로 기록한다. (메모리 = 청크 1개 + 압축된 결과)
+    openpyxl write-only 는 셀마다 객체를 만들어 직렬화하여 10k 행에 수 초가 걸리므로 사용하지 않는다.
+    """
+    titles = [title for title, *_ in sheets]
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in _package_parts(titles).items():
+            zf.writestr(name, content)
+        for n, (_, df, columns, formats) in enumerate(sheets, start=1):
+            with zf.open(f"xl/worksheets/sheet{n}.xml", "w") as f:
+                _write_sheet(f, df, columns, formats or {})
+    return buf.getvalue()
+
+
+def _write_sheet(f, df: pd.DataFrame, columns, formats):
+    cols = [c for c in columns if c in df.columns]
+    widths = "".join(
+        f'<col min="{i}" max="{i}" width="{12 if c in formats else 18}" customWidth="1"/>'
+        for i, c in enumerate(cols, start=1)
+    )
+    header = "".join(
+        f'<c s="{_XF_HEADER}" t="inlineStr"><is><t>{escape(str(c))}</t></is></c>' for c in cols
+    )
+    f.write((
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{_NS_MAIN}">'
+        '<sheetViews><sheetView workbookViewId="0">'
+        '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+        f"<cols>{widths}</cols><sheetData>"
+        f'<row r="1">{header}</row>'
+    ).encode("utf-8"))
+    row_no = 2
+    for chunk in _chunks(df[cols]):
+        column_cells = [_column_cells(chunk[col], formats.get(col)).tolist() for col in cols]
+        lines = []
+        for cells in zip(*column_cells):
+            lines.append(f'<row r="{row_no}">' + "".join(cells) + "</row>")
+            row_no += 1
+        f.write("".join(lines).encode("utf-8"))
+    f.write(b"</sheetData></worksheet>")
+
+
+def _sheet_name(title):
+    """Excel 시트 이름 규칙: 31자 이하, []:*?/\\ 사용 불가."""
+    name = re.sub(r"[\[\]:*?/\\]", "_", str(title))[:31] or "Sheet"
+    return escape(name, {'"': "&quot;"})
+
+
+def _package_parts(sheet_titles):
+    """시트 len(sheet_titles) 개짜리 xlsx 패키지의 고정 파트들. (시트 XML 은 제외)"""
+    n = len(sheet_titles)
+    sheet_types = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, n + 1)
+    )
+    sheet_entries = "".join(
+        f'<sheet name="{_sheet_name(title)}" sheetId="{i}" r:id="rId{i}"/>'
+        for i, title in enumerate(sheet_titles, start=1)
+    )
+    sheet_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{_NS_DOC_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, n + 1)
+    )
+    return {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f"{sheet_types}"
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{_NS_PKG_REL}">'
+            f'<Relationship Id="rId1" Type="{_NS_DOC_REL}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ),
+        "xl/workbook.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_DOC_REL}">'
+            f"<sheets>{sheet_entries}</sheets></workbook>"
+        ),
+        "xl/_rels/workbook.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{_NS_PKG_REL}">'
+            f"{sheet_rels}"
+            f'<Relationship Id="rId{n + 1}" Type="{_NS_DOC_REL}/styles" Target="styles.xml"/>'
+            "</Relationships>"
+        ),
+        # cellXfs: 0 기본, 1 #,##0 (내장 서식 3), 2 yyyy-mm-dd, 3 굵은 헤더, 4 0.0, 5 0.0%
+        "xl/styles.xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<styleSheet xmlns="{_NS_MAIN}">'
+            f'<numFmts count="3"><numFmt numFmtId="164" formatCode="{DATE_FORMAT}"/>'
+            '<numFmt numFmtId="165" formatCode="0.0"/><numFmt numFmtId="166" formatCode="0.0%"/></numFmts>'
+            '<fonts count="2"><font><sz val="11"/><name val="맑은 고딕"/></font>'
+            '<font><b/><sz val="11"/><name val="맑은 고딕"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="6">'
+            '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+            '<xf numFmtId="3" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+            '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            '<xf numFmtId="166" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+            "</cellXfs>"
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            "</styleSheet>"
+        ),
+    }
+
+
+def to_csv(df: pd.DataFrame, columns) -> bytes:
+    cols = [c for c in columns if c in df.columns]
+    buf = io.BytesIO()
+    text = io.TextIOWrapper(buf, encoding="utf-8-sig", newline="")
+    header = True
+    for chunk in _chunks(df[cols]):
+        chunk.to_csv(text, index=False, header=header, quoting=csv.QUOTE_MINIMAL)
+        header = False
+    if header:  # 빈 대장이어도 헤더는 기록
+        df[cols].to_csv(text, index=False)
+    text.flush()
+    data = buf.getvalue()
+    text.detach()
+    return data
+
+
+class ExportCache:
+    """(version, filter_key, fmt) -> bytes LRU. 프로세스 공용, 스레드 안전."""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def get_or_build(self, df: pd.DataFrame, columns, filter_key, fmt, version=None):
+        """(키, bytes, 캐시 적중 여부). 없으면 만들어 저장한다."""
+        key = (version or frame_version(df, columns), filter_key, fmt)
+        data = self.get(key)
+        if data is not None:
+            return key, data, True
+        data = to_xlsx(df, columns) if fmt == "xlsx" else to_csv(df, columns)
+        with self._lock:
+            self._items[key] = data
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return key, data, False
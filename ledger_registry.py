@@ -0,0 +1,162 @@
+"""
+여러 대장(스프레드시트/탭)을 프로세스 하나에서 서비스하기 위한 대장 목록과 대장별 캐시.
+
+- 대장 목록: ssep_ledgers.json (또는 SSEP_LEDGERS_FILE). 파일이 없으면 app.py 의 SHEET_ID / WORKSHEET_NAME 하나
+    {"ledgers": [{"key": "main", "sheet_id": "...", "worksheet": "Form_Responses 1", "title": "샘플 대장"},
+                 {"key": "infac", "sheet_id": "...", "worksheet": "설문지 응답 시트1", "title": "INFAC 대장"}],
+     "memory_budget_mb": 1024}
+- 구글 클라이언트(인증)는 모든 대장이 하나를 공유하고, 워크시트 연결/대장 캐시(LedgerFeed)/번호 발급기/스냅샷 등은 대장마다 따로 둡니다.
+- 대장별 파일(ssep_ids.json, ssep_snapshots/ ...)은 첫 번째 대장은 지금처럼 프로젝트 폴더에,
+  나머지는 ssep_ledgers/<key>/ 에 둡니다.
+- 대장 캐시(공유 DataFrame) 메모리 합계가 예산을 넘으면 가장 오래 안 쓴 대장의 캐시부터 비웁니다. (LRU)
+  비운 대장은 다음에 열 때 시트 전체를 다시 읽습니다. 세션은 대장을 복사해 두지 않고 공유 frame 을 읽기만 하므로
+  (app.load_ledger) 예산이 대장 데이터 전체의 상한입니다. (세션별 납기 인덱스 같은 행당 몇 바이트의 보조 배열은 제외)
+"""
+import json
+import os
+import threading
+import time
+
+CONFIG_NAME = "ssep_ledgers.json"
+LEDGER_DIR = "ssep_ledgers"
+DEFAULT_BUDGET_MB = 1024
+
+
+class LedgerConfig:
+    def __init__(self, key, sheet_id, worksheet, title=None, base_dir="."):
+        self.key = key
+        self.sheet_id = sheet_id
+        self.worksheet = worksheet
+        self.title = title or key
+        self.base_dir = base_dir
+
+    def __repr__(self):
+        return f"LedgerConfig({self.key!r}, {self.sheet_id!r}, {self.worksheet!r})"
+
+
+def load_configs(base_dir, default: LedgerConfig, environ=None):
+    """(대장 설정 목록, 메모리 예산 MB). 설정 파일이 없으면 ([default], 기본 예산)."""
+    environ = os.environ if environ is None else environ
+    path = environ.get("SSEP_LEDGERS_FILE") or os.path.join(base_dir, CONFIG_NAME)
+    budget = int(environ.get("SSEP_MEMORY_BUDGET_MB", DEFAULT_BUDGET_MB))
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return [default], budget
+
+    configs = []
+    for i, entry in enumerate(data.get("ledgers", [])):
+        key = str(entry["key"])
+        configs.append(LedgerConfig(
+            key, entry["sheet_id"], entry.get("worksheet", default.worksheet), entry.get("title"),
+            base_dir if i == 0 else os.path.join(base_dir, LEDGER_DIR, key),
+        ))
+    if len({c.key for c in configs}) != len(configs):
+        raise ValueError(f"{path}: 대장 key 가 중복되었습니다.")
+    return configs or [default], int(data.get("memory_budget_mb", budget))
+
+
+class LedgerState:
+    """대장 하나의 연결과 캐시. 워크시트와 resource() 는 처음 쓸 때 만든다."""
+
+    def __init__(self, config: LedgerConfig, open_worksheet, make_feed):
+        self.config = config
+        self.last_used = 0.0
+        self.memory_bytes = 0
+        self._open_worksheet = open_worksheet
+        self._worksheet = None
+        self._resources = {}
+        self._measured_version = None
+        self._lock = threading.Lock()
+        self.feed = make_feed(self)
+
+    @property
+    def key(self):
+        return self.config.key
+
+    def worksheet(self):
+        with self._lock:
+            if self._worksheet is None:
+                self._worksheet = self._open_worksheet(self.config)
+            return self._worksheet
+
+    def resource(self, name, factory):
+        """대장별 객체 (번호 발급기, 스냅샷 저장소 등). factory(base_dir) 로 한 번만 만든다."""
+        with self._lock:
+            if name not in self._resources:
+                os.makedirs(self.config.base_dir, exist_ok=True)
+                self._resources[name] = factory(self.config.base_dir)
+            return self._resources[name]
+
+    def measure(self):
+        """대장 캐시의 메모리 사용량 (version 이 바뀌었거나 캐시를 비웠을 때만 다시 잰다)."""
+        frame, version = self.feed.snapshot()
+        measured = (version, frame is None)
+        if measured != self._measured_version:
+            self.memory_bytes = 0 if frame is None else int(frame.memory_usage(deep=True).sum())
+            self._measured_version = measured
+        return self.memory_bytes
+
+
+class LedgerRegistry:
+    """
+    open_worksheet(config) -> 워크시트, make_feed(state) -> 그 대장의 LedgerFeed
+    budget_mb: 모든 대장 캐시 메모리 합계 상한
+    """
+
+    def __init__(self, configs, open_worksheet, make_feed, budget_mb=DEFAULT_BUDGET_MB, clock=time.monotonic):
+        self.configs = {c.key: c for c in configs}
+        self.budget_bytes = int(budget_mb) * 1024 * 1024
+        self._open_worksheet = open_worksheet
+        self._make_feed = make_feed
+        self._clock = clock
+        self._states = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def keys(self):
+        return list(self.configs)
+
+    @property
+    def default_key(self):
+        return next(iter(self.configs))
+
+    def get(self, key=None) -> LedgerState:
+        key = key if key in self.configs else self.default_key
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = LedgerState(self.configs[key], self._open_worksheet, self._make_feed)
+            state.last_used = self._clock()
+            return state
+
+    def enforce_budget(self, keep=None):
+        """캐시 메모리 합계가 예산 이하가 될 때까지 오래 안 쓴 대장의 캐시를 비운다. (keep 은 비우지 않음) 비운 대장 key 목록."""
+        with self._lock:
+            states = sorted(self._states.values(), key=lambda s: s.last_used)
+        total = sum(s.measure() for s in states)
+        evicted = []
+        for state in states:
+            if total <= self.budget_bytes:
+                break
+            if state.key == keep or not state.memory_bytes:
+                continue
+            total -= state.memory_bytes
+            state.feed.invalidate()
+            state.measure()
+            evicted.append(state.key)
+        self.evictions += len(evicted)
+        return evicted
+
+    def stats(self):
+        """관리자 화면용 [{대장, 캐시 MB, 마지막 사용(초 전)}]."""
+        now = self._clock()
+        with self._lock:
+            states = list(self._states.values())
+        return [{
+            "대장": s.config.title,
+            "key": s.key,
+            "캐시 MB": round(s.measure() / 1024 / 1024, 1),
+            "마지막 사용(초 전)": round(now - s.last_used, 1),
+        } for s in sorted(states, key=lambda s: -s.last_used)]
@@ -0,0 +1,285 @@
+"""
+운영 지표 레지스트리 + Prometheus 텍스트 포맷 내보내기 (표준 라이브러리만 사용).
+
+    SSEP_METRICS_PORT=9109        http://<host>:9109/metrics 로 노출 (Streamlit 과 같은 프로세스의 데몬 스레드)
+    SSEP_METRICS_FILE=<경로>      node_exporter textfile collector 용 .prom 파일을 주기적으로 기록
+    SSEP_METRICS_INTERVAL=15      파일 기록 주기 (초)
+
+둘 다 지정하지 않으면 메모리에만 집계합니다.
+"""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + list(extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted((k, dict(v, counts=list(v["counts"]))) for k, v in self._values.items())
+        for key, state in items:
+            for bound, count in zip(self.buckets, state["counts"]):
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, [('le', bound)])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, [('le', '+Inf')])} {state['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {state['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {state['count']}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.t0, **self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []  # 렌더 직전에 호출되는 콜백 (게이지 갱신용)
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, fn):
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            fn()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+SHEETS_API_CALLS = REGISTRY.register(Counter(
+    "ssep_sheets_api_calls_total", "구글 시트 API 호출 수", ["method"]))
+SHEETS_API_ERRORS = REGISTRY.register(Counter(
+    "ssep_sheets_api_errors_total", "구글 시트 API 오류 수 (code=429 는 쿼터 초과)", ["method", "code"]))
+SHEETS_API_LATENCY = REGISTRY.register(Histogram(
+    "ssep_sheets_api_duration_seconds", "구글 시트 API 호출 시간", ["method"]))
+SHEETS_HTTP_REQUESTS = REGISTRY.register(Gauge(
+    "ssep_sheets_http_requests", "공유 HTTP 세션으로 보낸 요청 수 (누적)"))
+SHEETS_HTTP_CONNECTIONS = REGISTRY.register(Gauge(
+    "ssep_sheets_http_connections", "공유 HTTP 세션이 새로 연 연결 수 (누적, 재사용률 = 1 - connections/requests)"))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "ssep_cache_lookups_total", "캐시 조회 수", ["cache"]))
+CACHE_MISSES = REGISTRY.register(Counter(
+    "ssep_cache_misses_total", "캐시 미스 수 (적중률 = 1 - misses/lookups)", ["cache"]))
+SAVE_LATENCY = REGISTRY.register(Histogram(
+    "ssep_save_duration_seconds", "구글 시트 저장 소요 시간"))
+ROWS_LOADED = REGISTRY.register(Gauge(
+    "ssep_rows_loaded", "마지막으로 로드한 대장 행 수"))
+IDS_ASSIGNED = REGISTRY.register(Counter(
+    "ssep_ids_assigned_total", "새로 발급해 시트에 기록한 NO 수 (폼 응답 / 앱 추가 / 중복 번호)"))
+ACTIVE_SESSIONS = REGISTRY.register(Gauge(
+    "ssep_active_sessions", "최근 SESSION_TTL 초 안에 요청이 있었던 세션 수"))
+ERRORS = REGISTRY.register(Counter(
+    "ssep_errors_total", "화면에 표시된 오류 수 (save_failed=구글 시트 저장 실패, load_failed=데이터 로드 실패, id_assign_failed=NO 기록 실패, save_conflict=행 위치가 바뀌어 저장 중단)", ["kind"]))
+
+SESSION_TTL = 300
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def touch_session(session_id):
+    if not session_id:
+        return
+    with _sessions_lock:
+        _sessions[session_id] = time.time()
+
+
+def _collect_sessions():
+    cutoff = time.time() - SESSION_TTL
+    with _sessions_lock:
+        for sid in [s for s, ts in _sessions.items() if ts < cutoff]:
+            del _sessions[sid]
+        ACTIVE_SESSIONS.set(len(_sessions))
+
+
+REGISTRY.add_collector(_collect_sessions)
+
+
+class InstrumentedWorksheet:
+    """gspread Worksheet 를 감싸 메서드 호출마다 호출 수/시간/오류를 기록하는 프록시."""
+
+    def __init__(self, ws):
+        self._ws = ws
+
+    def __getattr__(self, name):
+        attr = getattr(self._ws, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        def call(*args, **kwargs):
+            SHEETS_API_CALLS.inc(method=name)
+            t0 = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            except Exception as e:
+                code = getattr(e, "code", None) or getattr(getattr(e, "response", None), "status_code", "error")
+                SHEETS_API_ERRORS.inc(method=name, code=code)
+                raise
+            finally:
+                SHEETS_API_LATENCY.observe(time.perf_counter() - t0, method=name)
+
+        return call
+
+
+# ----- 내보내기 -----
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass  # 스크레이프마다 콘솔 로그를 남기지 않음
+
+
+def start_http_server(port, addr="127.0.0.1"):
+    """기본은 이 서버에서만 스크레이프 가능. 다른 호스트의 Prometheus 가 읽어야 하면 addr 을 지정."""
+    server = ThreadingHTTPServer((addr, int(port)), _Handler)
+    threading.Thread(target=server.serve_forever, name="ssep-metrics-http", daemon=True).start()
+    return server
+
+
+def write_textfile(path):
+    """임시 파일에 쓰고 교체하여 스크레이프 도중 반쯤 쓰인 파일이 보이지 않게 한다."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp, path)
+
+
+def start_textfile_writer(path, interval=15):
+    def loop():
+        while True:
+            try:
+                write_textfile(path)
+            except OSError:
+                pass
+            time.sleep(interval)
+
+    threading.Thread(target=loop, name="ssep-metrics-file", daemon=True).start()
+
+
+def start_exporters_from_env(environ=None):
+    """
+    SSEP_METRICS_PORT(+ SSEP_METRICS_ADDR, 기본 127.0.0.1) / SSEP_METRICS_FILE 에 따라 내보내기 시작.
+    시작한 항목 설명 목록을 돌려준다.
+    """
+    env = os.environ if environ is None else environ
+    started = []
+    port = env.get("SSEP_METRICS_PORT")
+    if port:
+        addr = env.get("SSEP_METRICS_ADDR", "127.0.0.1")
+        start_http_server(port, addr)
+        started.append(f"http://{addr}:{port}/metrics")
+    path = env.get("SSEP_METRICS_FILE")
+    if path:
+        start_textfile_writer(path, float(env.get("SSEP_METRICS_INTERVAL", 15)))
+        started.append(path)
+    return started
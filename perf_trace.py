@@ -0,0 +1,122 @@
+"""
+핫패스 구간 타이밍 (표준 라이브러리만 사용).
+
+    with perf_trace.span("load.fetch"):
+        ...
+
+- 구간별 최근 N개 측정값을 프로세스 전체에서 모아 p50/p95/p99 를 계산
+- 한 번의 rerun 에서 측정된 구간 목록은 begin_run()/end_run() 으로 따로 수집
+- SSEP_PROFILE_LOG=<경로> 를 지정하면 rerun 단위로 JSON lines 로그를 추가 기록
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+WINDOW = 500  # 구간별로 보관하는 최근 측정 수
+
+_lock = threading.Lock()
+_samples = {}               # stage -> deque[ms]
+_local = threading.local()  # 현재 rerun 의 구간 목록 (스크립트 실행 스레드별)
+
+
+@contextmanager
+def span(stage: str):
+    """with 블록 실행 시간을 stage 이름으로 기록."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, (time.perf_counter() - t0) * 1000)
+
+
+def traced(stage: str):
+    """함수 전체를 span 으로 감싸는 데코레이터."""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def record(stage: str, ms: float):
+    with _lock:
+        if stage not in _samples:
+            _samples[stage] = deque(maxlen=WINDOW)
+        _samples[stage].append(ms)
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.append((stage, round(ms, 3)))
+
+
+def begin_run():
+    """현재 스레드에서 새 rerun 수집 시작."""
+    _local.run = []
+    _local.started = time.time()
+
+
+def end_run(session_id: str = ""):
+    """수집 종료. [(stage, ms), ...] 를 돌려주고 SSEP_PROFILE_LOG 가 있으면 한 줄 기록."""
+    run = getattr(_local, "run", None) or []
+    started = getattr(_local, "started", time.time())
+    _local.run = None
+    log_path = os.environ.get("SSEP_PROFILE_LOG")
+    if log_path and run:
+        line = json.dumps(
+            {"ts": started, "session": session_id, "spans": run},
+            ensure_ascii=False,
+        )
+        try:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass  # 프로파일 로그 실패가 화면을 막으면 안 됨
+    return run
+
+
+def _percentile(sorted_values, q):
+    """nearest-rank 백분위수."""
+    if not sorted_values:
+        return 0.0
+    k = max(int(round(q / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(k, len(sorted_values) - 1)]
+
+
+def summary():
+    """stage 별 {count, p50, p95, p99, last} (ms). stage 이름순."""
+    with _lock:
+        snapshot = {stage: list(values) for stage, values in _samples.items()}
+    rows = []
+    for stage in sorted(snapshot):
+        values = snapshot[stage]
+        ordered = sorted(values)
+        rows.append({
+            "stage": stage,
+            "count": len(values),
+            "p50": round(_percentile(ordered, 50), 2),
+            "p95": round(_percentile(ordered, 95), 2),
+            "p99": round(_percentile(ordered, 99), 2),
+            "last": round(values[-1], 2),
+        })
+    return rows
+
+
+def export_jsonl() -> str:
+    """보관 중인 측정값 전체를 JSON lines 문자열로 (다운로드용)."""
+    with _lock:
+        snapshot = {stage: list(values) for stage, values in _samples.items()}
+    return "".join(
+        json.dumps({"stage": stage, "ms": round(ms, 3)}, ensure_ascii=False) + "\n"
+        for stage, values in snapshot.items()
+        for ms in values
+    )
+
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,64 @@
+"""
+구글 시트 API 용 공유 HTTP 세션.
+
+gspread.authorize(creds) 기본값은 연결 풀 10개(호스트당)에 풀이 차면 연결을 새로 열었다가 버리는 requests 세션이라,
+병렬 읽기/백그라운드 저장이 겹치면 TLS 연결을 매번 새로 맺습니다. 여기서는
+  - keep-alive 연결 풀 크기를 정하고(SSEP_HTTP_POOL, 기본 16), 풀이 차면 새로 열지 않고 빈 연결을 기다림 (pool_block)
+  - gzip 응답 요청 (구글 API 는 Accept-Encoding 과 함께 User-Agent 에 "gzip" 이 있어야 압축해서 보냄)
+  - 토큰 갱신은 만료 전에 백그라운드에서 (google-auth non-blocking refresh). 갱신 중에도 기존 토큰으로 호출이 계속됨
+인 세션을 프로세스에서 하나만 만들어 모든 대장이 공유합니다. (app.get_sheets_client)
+
+pool_stats() 로 지금까지의 요청 수 / 새로 연 연결 수(= TLS 핸드셰이크 수)를 보고,
+metrics 의 ssep_sheets_http_* 게이지로도 내보냅니다.
+"""
+import os
+
+import requests
+from google.auth.transport.requests import AuthorizedSession
+
+import metrics
+
+POOL_SIZE = int(os.environ.get("SSEP_HTTP_POOL", 16))
+USER_AGENT = "ssep-sample-ledger (gzip)"
+TIMEOUT_SEC = 60
+
+
+class SheetsSession(AuthorizedSession):
+    """timeout 기본값이 있는 AuthorizedSession. (gspread 는 timeout 을 넘기지 않음)"""
+
+    def request(self, method, url, *args, timeout=None, **kwargs):
+        return super().request(method, url, *args, timeout=timeout or TIMEOUT_SEC, **kwargs)
+
+
+def make_session(credentials, pool_size=POOL_SIZE) -> SheetsSession:
+    """credentials(google-auth) 로 인증하는 공유 세션. gspread.authorize(creds, session=...) 에 넘깁니다."""
+    if hasattr(credentials, "with_non_blocking_refresh"):  # google-auth 2.23 이상 (credentials 자체를 바꿈)
+        credentials.with_non_blocking_refresh()
+    session = SheetsSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip", "User-Agent": USER_AGENT})
+    return session
+
+
+def pool_stats(session) -> dict:
+    """{requests: 보낸 요청 수, connections: 새로 연 연결 수, reuse_ratio: 연결을 재사용한 요청 비율}."""
+    n_requests = n_connections = 0
+    for adapter in {id(a): a for a in session.adapters.values()}.values():  # 같은 어댑터를 여러 scheme 에 mount 한 경우
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                n_requests += pool.num_requests
+                n_connections += pool.num_connections
+    reuse = 1 - n_connections / n_requests if n_requests else 0.0
+    return {"requests": n_requests, "connections": n_connections, "reuse_ratio": round(reuse, 3)}
+
+
+def register_metrics(session):
+    """지표를 내보낼 때마다 session 의 pool_stats 를 게이지에 반영."""
+    def collect():
+        stats = pool_stats(session)
+        metrics.SHEETS_HTTP_REQUESTS.set(stats["requests"])
+        metrics.SHEETS_HTTP_CONNECTIONS.set(stats["connections"])
+    metrics.REGISTRY.add_collector(collect)
@@ -0,0 +1,236 @@
+"""
+대장 데이터 스냅샷 저장소 (내용 주소 기반, 압축, 청크 단위 중복 제거).
+
+- 스냅샷 = 컬럼별로 CHUNK_ROWS 행씩 자른 청크들의 해시 목록(manifest)
+- 청크 내용은 sha256 로 주소를 매겨 objects/ 에 zlib 압축으로 한 번만 저장
+- 청크의 빠른 지문(pandas 해시) -> 내용 해시 메모로, 바뀌지 않은 청크는 직렬화/압축/디스크 쓰기를 건너뜀
+- 복원 시 현재 대장과 청크 해시가 다른 행 구간만 골라 한 번의 batch_update 로 시트에 기록
+
+디렉터리 구성 (base_dir/ssep_snapshots):
+    objects/<hash[:2]>/<hash>     압축된 청크 (JSON 문자열 리스트)
+    manifests/<snapshot_id>.json  {"id", "ts", "reason", "rows", "columns", "chunks": {컬럼: [hash, ...]}}
+"""
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = "ssep_snapshots"
+CHUNK_ROWS = 1024
+KEEP_SNAPSHOTS = 200   # 이보다 오래된 스냅샷은 take() 때 prune() 으로 삭제
+DECODED_CACHE = 512    # 복원 시 메모리에 유지할 디코딩 청크 수
+FINGERPRINT_MEMO = 8192  # 유지할 빠른 지문 수 (100k 행 × 20 컬럼 대장 스냅샷 약 4개 분량)
+
+
+def _col_letter(n):
+    """1 -> A, 27 -> AA"""
+    s = ""
+    while n:
+        n, r = divmod(n - 1, 26)
+        s = chr(ord("A") + r) + s
+    return s
+
+
+class SnapshotStore:
+    def __init__(self, base_dir="."):
+        self.root = os.path.join(base_dir, SNAPSHOT_DIR)
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.manifests_dir = os.path.join(self.root, "manifests")
+        self._lock = threading.Lock()
+        self._fingerprint_memo = OrderedDict()  # 빠른 지문 -> 내용 해시 (LRU)
+        self._decoded = OrderedDict()   # 내용 해시 -> 값 리스트 (LRU)
+        self._last_taken = None         # 마지막 스냅샷 시각 (epoch 초, take_if_due 용)
+
+    # ----- 청크 -----
+    def _chunk_hashes(self, values: pd.DataFrame, write=True):
+        """컬럼별 청크 해시 목록. write=True 면 없는 청크를 objects/ 에 기록. (새로 쓴 청크 수 포함)"""
+        written = 0
+        chunks = {}
+        n = len(values)
+        for col in values.columns:
+            series = values[col]
+            fast = pd.util.hash_pandas_object(series, index=False).to_numpy()
+            hashes = []
+            for start in range(0, n, CHUNK_ROWS):
+                fp = hashlib.blake2b(fast[start:start + CHUNK_ROWS].tobytes(), digest_size=16).digest()
+                content_hash = self._fingerprint_memo.get(fp)
+                if content_hash is None or (write and not os.path.exists(self._object_path(content_hash))):
+                    payload = json.dumps(series.iloc[start:start + CHUNK_ROWS].tolist(), ensure_ascii=False).encode("utf-8")
+                    content_hash = hashlib.sha256(payload).hexdigest()
+                    self._fingerprint_memo[fp] = content_hash
+                    if len(self._fingerprint_memo) > FINGERPRINT_MEMO:
+                        self._fingerprint_memo.popitem(last=False)
+                    if write and self._write_object(content_hash, payload):
+                        written += 1
+                else:
+                    self._fingerprint_memo.move_to_end(fp)
+                hashes.append(content_hash)
+            chunks[col] = hashes
+        return chunks, written
+
+    def _object_path(self, content_hash):
+        return os.path.join(self.objects_dir, content_hash[:2], content_hash)
+
+    def _write_object(self, content_hash, payload):
+        path = self._object_path(content_hash)
+        if os.path.exists(path):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(zlib.compress(payload, 6))
+        os.replace(tmp, path)
+        return True
+
+    def _read_object(self, content_hash):
+        cached = self._decoded.get(content_hash)
+        if cached is not None:
+            self._decoded.move_to_end(content_hash)
+            return cached
+        with open(self._object_path(content_hash), "rb") as f:
+            values = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+        self._decoded[content_hash] = values
+        if len(self._decoded) > DECODED_CACHE:
+            self._decoded.popitem(last=False)
+        return values
+
+    # ----- 스냅샷 -----
+    def take(self, df: pd.DataFrame, columns, reason="manual"):
+        """
+        df[columns] 를 문자열로 스냅샷. 직전 스냅샷과 내용이 같으면 새로 만들지 않고 그 manifest 를 돌려준다.
+        새로 만들어 KEEP_SNAPSHOTS 개를 넘으면 오래된 스냅샷과 쓰이지 않는 청크를 정리한다.
+        """
+        values = df.reindex(columns=columns).fillna("").astype(str)
+        with self._lock:
+            chunks, written = self._chunk_hashes(values)
+            latest = self.latest()
+            if latest and latest["columns"] == list(columns) and latest["chunks"] == chunks \
+                    and latest["rows"] == len(values):
+                self._last_taken = time.time()
+                return dict(latest, new_chunks=0, unchanged=True)
+
+            now = datetime.now()
+            digest = hashlib.sha256(json.dumps(chunks, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+            manifest = {
+                "id": f"{now:%Y%m%d-%H%M%S}-{digest}",
+                "ts": now.isoformat(timespec="seconds"),
+                "reason": reason,
+                "rows": len(values),
+                "columns": list(columns),
+                "chunks": chunks,
+            }
+            os.makedirs(self.manifests_dir, exist_ok=True)
+            with open(os.path.join(self.manifests_dir, f"{manifest['id']}.json"), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            self._last_taken = time.time()
+            if len(glob.glob(os.path.join(self.manifests_dir, "*.json"))) > KEEP_SNAPSHOTS:
+                self._prune(KEEP_SNAPSHOTS)
+            return dict(manifest, new_chunks=written, unchanged=False)
+
+    def take_if_due(self, df: pd.DataFrame, columns, interval_sec, reason="scheduled"):
+        """마지막 스냅샷 이후 interval_sec 이 지났으면 스냅샷. 찍었으면 manifest, 아니면 None."""
+        if self._last_taken is None:
+            latest = self.latest()
+            self._last_taken = datetime.fromisoformat(latest["ts"]).timestamp() if latest else 0.0
+        if time.time() - self._last_taken < interval_sec:
+            return None
+        return self.take(df, columns, reason=reason)
+
+    def list_snapshots(self):
+        """최신순 manifest 요약 목록 (chunks 제외)."""
+        items = []
+        for path in sorted(glob.glob(os.path.join(self.manifests_dir, "*.json")), reverse=True):
+            with open(path, encoding="utf-8") as f:
+                m = json.load(f)
+            items.append({k: m[k] for k in ("id", "ts", "reason", "rows")})
+        return items
+
+    def latest(self):
+        paths = sorted(glob.glob(os.path.join(self.manifests_dir, "*.json")))
+        return self.load_manifest(os.path.basename(paths[-1])[:-5]) if paths else None
+
+    def load_manifest(self, snapshot_id):
+        with open(os.path.join(self.manifests_dir, f"{snapshot_id}.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self, snapshot_id) -> pd.DataFrame:
+        """스냅샷을 DataFrame(문자열)으로 복원."""
+        manifest = self.load_manifest(snapshot_id)
+        data = {}
+        for col in manifest["columns"]:
+            values = []
+            for h in manifest["chunks"][col]:
+                values.extend(self._read_object(h))
+            data[col] = values
+        return pd.DataFrame(data, columns=manifest["columns"])
+
+    # ----- 복원 -----
+    def restore_to_sheet(self, snapshot_id, current: pd.DataFrame, ws):
+        """
+        현재 대장(current) 대비 청크가 달라진 행 구간만 batch_update 한 번으로 기록한다.
+        스냅샷이 더 짧으면 남는 행은 빈 값으로 덮어쓴다. 기록한 행 수를 돌려준다.
+        """
+        manifest = self.load_manifest(snapshot_id)
+        columns = manifest["columns"]
+        cur_values = current.reindex(columns=columns).fillna("").astype(str)
+        with self._lock:
+            cur_chunks, _ = self._chunk_hashes(cur_values, write=False)
+
+        n_snap, n_cur = manifest["rows"], len(cur_values)
+        n_chunks = (max(n_snap, n_cur) + CHUNK_ROWS - 1) // CHUNK_ROWS
+        dirty = np.zeros(n_chunks, dtype=bool)
+        for col in columns:
+            snap_h, cur_h = manifest["chunks"].get(col, []), cur_chunks.get(col, [])
+            for i in range(n_chunks):
+                if i >= len(snap_h) or i >= len(cur_h) or snap_h[i] != cur_h[i]:
+                    dirty[i] = True
+
+        last_col = _col_letter(len(columns))
+        data = [{"range": f"A1:{last_col}1", "values": [columns]}]
+        written = 0
+        for i in np.flatnonzero(dirty):
+            start = int(i) * CHUNK_ROWS
+            end = min(start + CHUNK_ROWS, max(n_snap, n_cur))
+            rows = []
+            for col in columns:
+                hashes = manifest["chunks"][col]
+                rows.append(self._read_object(hashes[i]) if i < len(hashes) else [])
+            block = []
+            for r in range(end - start):
+                block.append([col_vals[r] if r < len(col_vals) else "" for col_vals in rows])
+            # 시트 행 번호 = 데이터 인덱스 + 2 (1행은 헤더)
+            data.append({"range": f"A{start + 2}:{last_col}{end + 1}", "values": block})
+            written += len(block)
+        ws.batch_update(data)
+        return written
+
+    # ----- 정리 -----
+    def prune(self, keep=KEEP_SNAPSHOTS):
+        """오래된 manifest 를 지우고 더 이상 참조되지 않는 청크를 삭제. 삭제한 청크 수를 돌려준다."""
+        with self._lock:
+            return self._prune(keep)
+
+    def _prune(self, keep):
+        paths = sorted(glob.glob(os.path.join(self.manifests_dir, "*.json")))
+        for path in paths[:-keep] if keep else []:
+            os.remove(path)
+        live = set()
+        for path in glob.glob(os.path.join(self.manifests_dir, "*.json")):
+            with open(path, encoding="utf-8") as f:
+                for hashes in json.load(f)["chunks"].values():
+                    live.update(hashes)
+        removed = 0
+        for path in glob.glob(os.path.join(self.objects_dir, "*", "*")):
+            if os.path.basename(path) not in live:
+                os.remove(path)
+                removed += 1
+        self._fingerprint_memo = OrderedDict((fp, h) for fp, h in self._fingerprint_memo.items() if h in live)
+        return removed
@@ -0,0 +1,167 @@
+"""
+진행상태별 샘플 보드(칸반)용 상태 인덱스.
+
+- 진행상태 → 행 ID 버킷. 버킷마다 (납기일 서수, 행 ID) 를 합친 정렬 키를 NumPy 배열로 보관
+  (납기일 빠른 순, 납기일 없는 건은 뒤. 출하완료는 최근 납기부터 보여 줌)
+- sync() 로 행별 해시를 비교하여 상태/납기일이 바뀐 행만 버킷에서 빼고 다시 넣음 (due_index.DueDateIndex 와 같은 방식)
+- page(status, n) 은 버킷 앞쪽 n 건만 잘라 주므로, 보드는 건수와 관계없이 화면에 그릴 카드만 다룸
+
+카드를 다른 상태로 옮기는 것은 진행상태를 직접 쓰는 것이 아니라 진행상태를 정하는 칸을 고치는 것입니다.
+(진행상태는 출하일 > 샘플 완료일 > 자재준비 순으로 자동 계산. app.derive_progress_status)
+transition() 이 옮길 상태에 맞게 고칠 칸을 돌려줍니다.
+"""
+import numpy as np
+import pandas as pd
+
+from due_index import parse_dates_vectorized
+
+ID_COL = "NO"
+STATUS_COL = "진행상태"
+DUE_COL = "납기일"
+STATUSES = ("접수", "생산중", "생산완료", "출하완료")
+LATEST_FIRST = ("출하완료",)
+
+_DAY_OFFSET = 1 << 29          # 음수 서수(1970년 이전)도 양수 키가 되도록 (서수 + offset 은 31비트 안)
+_NO_DATE = (1 << 29) - 1       # 납기일 없는 건은 맨 뒤
+_ID_MASK = (1 << 32) - 1
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def sort_keys(ordinals: np.ndarray, row_ids: np.ndarray) -> np.ndarray:
+    """(납기일 서수, 행 ID) → 정렬 키. 서수가 같으면 행 ID 순."""
+    return ((ordinals.astype(np.int64) + _DAY_OFFSET) << 32) | row_ids.astype(np.int64)
+
+
+def _filled(row: pd.Series, col) -> bool:
+    value = row[col]
+    return not pd.isna(value) and str(value).strip().lower() not in ("", "nan")
+
+
+def transition(row: pd.Series, target, today) -> dict:
+    """
+    row 를 target 상태로 옮길 때 고칠 칸 {컬럼: 새 값}. (시트에 없는 컬럼, 이미 맞는 칸은 건드리지 않음)
+    앞으로 옮기면 그 단계 날짜를 오늘로 채우고, 뒤로 되돌리면 뒤 단계 날짜를 지웁니다. (지운 값은 변경 이력에 남음)
+    """
+    if target not in STATUSES:
+        raise ValueError(f"알 수 없는 진행상태: {target}")
+    day = today.strftime("%Y-%m-%d")
+    level = STATUSES.index(target)
+    want = {
+        "출하일": day if level == 3 else "",
+        "샘플 완료일": day if level == 2 else ("" if level < 2 else None),   # None: 지금 값 유지
+    }
+    if level == 1:
+        want["자재준비"] = "완료"
+    elif level == 0 and "자재준비" in row.index and str(row["자재준비"]).strip() == "완료":
+        want["자재준비"] = "준비중"
+
+    changes = {}
+    for col, value in want.items():
+        if col not in row.index or value is None:
+            continue
+        if value == "":
+            if _filled(row, col):
+                changes[col] = ""
+        elif col == "자재준비":
+            if str(row[col]).strip() != value:
+                changes[col] = value
+        elif not _filled(row, col):
+            changes[col] = value
+    return changes
+
+
+class StatusIndex:
+    """진행상태 → 정렬된 행 ID 버킷."""
+
+    def __init__(self):
+        self._buckets = {}    # 진행상태 -> 정렬 키 배열
+        self._row_key = {}    # 행 ID -> (진행상태, 정렬 키)
+        self._row_hash = {}   # 행 ID -> 마지막으로 반영한 행 해시
+
+    def __len__(self):
+        return len(self._row_key)
+
+    # ----- 갱신 -----
+    def sync(self, df: pd.DataFrame) -> int:
+        """df 와 인덱스를 맞춘다. 바뀐/추가/삭제된 행만 반영하고 반영한 행 수를 돌려준다."""
+        if ID_COL not in df.columns or STATUS_COL not in df.columns:
+            changed = len(self._row_hash)
+            self.__init__()
+            return changed
+
+        cols = [c for c in (ID_COL, STATUS_COL, DUE_COL) if c in df.columns]
+        ids = df[ID_COL].to_numpy(dtype=np.int64)
+        hashes = pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy()
+
+        current = set(ids.tolist())
+        removed = [rid for rid in self._row_hash if rid not in current]
+        prev = self._row_hash
+        changed_mask = np.array(
+            [prev.get(rid) != h for rid, h in zip(ids.tolist(), hashes.tolist())],
+            dtype=bool,
+        )
+        if not removed and not changed_mask.any():
+            return 0
+
+        changed_rows = df[changed_mask]
+        self.remove_rows(removed + ids[changed_mask].tolist())
+        self.upsert_rows(changed_rows)
+        for rid in removed:
+            self._row_hash.pop(rid, None)
+        self._row_hash.update(zip(ids[changed_mask].tolist(), hashes[changed_mask].tolist()))
+        return len(removed) + int(changed_mask.sum())
+
+    def remove_rows(self, row_ids):
+        """행 ID 목록을 버킷에서 제거."""
+        by_status = {}
+        for rid in row_ids:
+            entry = self._row_key.pop(rid, None)
+            if entry is not None:
+                by_status.setdefault(entry[0], []).append(entry[1])
+        for status, keys in by_status.items():
+            arr = self._buckets[status]
+            arr = np.delete(arr, np.searchsorted(arr, np.asarray(keys, dtype=np.int64)))  # 키는 행마다 유일
+            if len(arr):
+                self._buckets[status] = arr
+            else:
+                del self._buckets[status]
+
+    def upsert_rows(self, rows: pd.DataFrame):
+        """rows 를 진행상태 버킷의 정렬 위치에 삽입 (기존 항목은 먼저 remove_rows 로 제거)."""
+        if rows.empty:
+            return
+        ids = rows[ID_COL].to_numpy(dtype=np.int64)
+        statuses = rows[STATUS_COL].fillna("").astype(str).str.strip().to_numpy()
+        if DUE_COL in rows.columns:
+            days = parse_dates_vectorized(rows[DUE_COL])
+            ordinals = np.where(np.isnat(days), _NO_DATE, days.astype(np.int64))
+        else:
+            ordinals = np.full(len(ids), _NO_DATE, dtype=np.int64)
+        keys = sort_keys(ordinals, ids)
+
+        self._row_key.update(zip(ids.tolist(), zip(statuses.tolist(), keys.tolist())))
+        for status in set(statuses.tolist()):
+            new = np.sort(keys[statuses == status])
+            arr = self._buckets.get(status, _EMPTY)
+            self._buckets[status] = np.insert(arr, np.searchsorted(arr, new), new)
+
+    # ----- 조회 -----
+    def statuses(self):
+        """STATUSES 순서 + 그 밖의 값(있으면)."""
+        return list(STATUSES) + sorted(s for s in self._buckets if s not in STATUSES)
+
+    def count(self, status) -> int:
+        return len(self._buckets.get(status, _EMPTY))
+
+    def counts(self) -> dict:
+        return {s: self.count(s) for s in self.statuses()}
+
+    def status_of(self, row_id):
+        entry = self._row_key.get(int(row_id))
+        return entry[0] if entry else None
+
+    def page(self, status, n) -> np.ndarray:
+        """status 버킷의 앞쪽 n 건 행 ID. (출하완료는 최근 납기부터)"""
+        arr = self._buckets.get(status, _EMPTY)
+        keys = arr[::-1][:n] if status in LATEST_FIRST else arr[:n]
+        return keys & _ID_MASK
@@ -0,0 +1,180 @@
+"""
+납기 / 출하 일정 타임라인.
+
+대장의 날짜 컬럼을 한 번만 datetime64[D] 로 파싱해 일(day) 서수로 정렬해 두고,
+  - 일 / 주(월요일 시작) / 월 단위 버킷별 건수와 요청수량 합계
+  - 같은 버킷의 업체별 건수 / 요청수량
+을 np.bincount 로 (행 단위 루프 없이) 계산합니다. 단위별 집계는 처음 요청할 때 한 번 만들고 보관합니다.
+기간 조회와 버킷 드릴다운(rows)은 정렬된 배열의 이진 탐색이라 대장 크기와 관계없이 그 구간만 다룹니다.
+
+Timeline 은 대장 버전마다 하나 만들어 세션 간에 공유합니다. (app.get_timeline)
+
+일정 종류별 날짜 컬럼은 EVENTS 의 후보를 앞에서부터 봐서 처음 채워진 값을 씁니다.
+(납기: 납기일(예정)이 있으면 그 날짜, 없으면 납기일)
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from due_index import parse_dates_vectorized, to_day_ordinal
+
+# (일정 이름, 날짜 컬럼 후보)
+EVENTS = (
+    ("납기", ("납기일(예정)", "납기일")),
+    ("출하", ("출하일",)),
+)
+UNITS = ("일", "주", "월")
+QTY_COL = "요청수량"
+CUSTOMER_COL = "업체명"
+
+# 캐시 키(대장 버전)를 만들 때 보는 컬럼
+INPUT_COLUMNS = tuple(dict.fromkeys(c for _, cols in EVENTS for c in cols)) + (QTY_COL, CUSTOMER_COL)
+
+
+def event_days(df: pd.DataFrame, candidates) -> np.ndarray:
+    """candidates 컬럼 중 처음 채워진 날짜 (datetime64[D], 없으면 NaT)."""
+    days = np.full(len(df), np.datetime64("NaT"), dtype="datetime64[D]")
+    for col in candidates:
+        if col in df.columns:
+            missing = np.isnat(days)
+            if not missing.any():
+                break
+            days[missing] = parse_dates_vectorized(df[col])[missing]
+    return days
+
+
+def bucket_start(ordinals: np.ndarray, unit) -> np.ndarray:
+    """일 서수 → 버킷 시작일 서수. 주는 월요일 시작, 월은 1일."""
+    if unit == "일":
+        return ordinals
+    if unit == "주":
+        # 1970-01-01 은 목요일 → (days + 3) % 7 이 월요일부터의 경과일
+        return ordinals - (ordinals + 3) % 7
+    if unit == "월":
+        return ordinals.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    raise ValueError(f"알 수 없는 단위: {unit}")
+
+
+def bucket_end(start, unit) -> int:
+    """버킷 시작일 서수 → 다음 버킷 시작일 서수."""
+    if unit == "일":
+        return start + 1
+    if unit == "주":
+        return start + 7
+    month = np.datetime64(start, "D").astype("datetime64[M]") + 1
+    return int(month.astype("datetime64[D]").astype(np.int64))
+
+
+def _ordinals(values) -> np.ndarray:
+    """날짜 index/Series → 일 서수. (pandas 는 datetime64[D] 를 초 단위로 바꿔 보관)"""
+    return np.asarray(values, dtype="datetime64[D]").astype(np.int64)
+
+
+class Timeline:
+    """대장 한 버전의 일정 인덱스. df 자체는 들고 있지 않고 행 label(시트 행 번호)만 보관."""
+
+    def __init__(self, df: pd.DataFrame):
+        qty = pd.to_numeric(df[QTY_COL], errors="coerce").fillna(0).to_numpy(np.float64) \
+            if QTY_COL in df.columns else np.zeros(len(df))
+        customers = df[CUSTOMER_COL].astype(str).str.strip().replace("", "(미입력)") \
+            if CUSTOMER_COL in df.columns else pd.Series("(미입력)", index=df.index)
+        codes, self.customer_names = pd.factorize(customers, sort=True)
+
+        self._events = {}   # 일정 -> (정렬된 일 서수, 같은 순서의 행 label / 요청수량 / 업체 코드)
+        for name, candidates in EVENTS:
+            if not any(c in df.columns for c in candidates):
+                continue
+            days = event_days(df, candidates)
+            valid = np.flatnonzero(~np.isnat(days))
+            ordinals = days[valid].astype(np.int64)
+            order = np.argsort(ordinals, kind="stable")
+            pos = valid[order]
+            self._events[name] = (ordinals[order], df.index.to_numpy()[pos], qty[pos], codes[pos])
+        self._aggregates = {}  # (일정, 단위) -> (버킷별 표, 버킷×업체 표)
+        self._lock = threading.Lock()
+
+    def events(self):
+        return list(self._events)
+
+    def span(self, event):
+        """(가장 이른 날짜 서수, 가장 늦은 날짜 서수). 날짜가 하나도 없으면 None."""
+        ordinals = self._events[event][0] if event in self._events else ()
+        return (int(ordinals[0]), int(ordinals[-1])) if len(ordinals) else None
+
+    # ----- 집계 -----
+    def aggregate(self, event, unit):
+        """
+        (버킷별 표, 버킷×업체 표). 둘 다 버킷 시작일 오름차순.
+          버킷별: index = 버킷 시작일, 컬럼 [건수, 요청수량]
+          업체별: 컬럼 [버킷 시작일, 업체명, 건수, 요청수량] (건이 있는 조합만)
+        """
+        key = (event, unit)
+        cached = self._aggregates.get(key)
+        if cached is None:
+            cached = self._build(event, unit)
+            with self._lock:
+                self._aggregates[key] = cached
+        return cached
+
+    def _build(self, event, unit):
+        ordinals, _, qty, codes = self._events[event]
+        starts, inverse = np.unique(bucket_start(ordinals, unit), return_inverse=True)
+        buckets = pd.DataFrame({
+            "건수": np.bincount(inverse, minlength=len(starts)),
+            "요청수량": np.bincount(inverse, weights=qty, minlength=len(starts)).astype(np.int64),
+        }, index=pd.Index(starts.astype("datetime64[D]"), name="버킷 시작일"))
+
+        n_customers = max(len(self.customer_names), 1)
+        combined = inverse.astype(np.int64) * n_customers + codes
+        pairs, pair_inverse = np.unique(combined, return_inverse=True)
+        by_customer = pd.DataFrame({
+            "버킷 시작일": starts[pairs // n_customers].astype("datetime64[D]"),
+            "업체명": np.asarray(self.customer_names, dtype=object)[pairs % n_customers],
+            "건수": np.bincount(pair_inverse, minlength=len(pairs)),
+            "요청수량": np.bincount(pair_inverse, weights=qty, minlength=len(pairs)).astype(np.int64),
+        })
+        return buckets, by_customer
+
+    def _range(self, starts, unit, start, end):
+        """start 가 든 버킷부터 end 가 든 버킷까지의 위치 (lo, hi)."""
+        first = int(bucket_start(np.array([to_day_ordinal(start)]), unit)[0])
+        return np.searchsorted(starts, first, side="left"), np.searchsorted(starts, to_day_ordinal(end), side="right")
+
+    def buckets(self, event, unit, start, end) -> pd.DataFrame:
+        """start ~ end(date) 기간의 버킷별 건수 / 요청수량. (기간 양 끝이 걸친 버킷 포함)"""
+        table, _ = self.aggregate(event, unit)
+        lo, hi = self._range(_ordinals(table.index), unit, start, end)
+        return table.iloc[lo:hi]
+
+    def customers(self, event, unit, start, end) -> pd.DataFrame:
+        """기간 안 버킷들의 업체별 건수 / 요청수량 합계 (건수 많은 순)."""
+        _, table = self.aggregate(event, unit)
+        lo, hi = self._range(_ordinals(table["버킷 시작일"]), unit, start, end)
+        out = table.iloc[lo:hi].groupby("업체명", sort=False)[["건수", "요청수량"]].sum()
+        return out.sort_values("건수", ascending=False).reset_index()
+
+    def calendar(self, event, start, end) -> pd.DataFrame:
+        """start ~ end 가 걸친 주(행, 월요일 시작) × 요일(열) 건수 달력. 건이 없는 날은 0."""
+        first = int(bucket_start(np.array([to_day_ordinal(start)]), "주")[0])
+        n_weeks = (to_day_ordinal(end) - first) // 7 + 1
+        days = self.buckets(event, "일", np.datetime64(first, "D"), np.datetime64(first + 7 * n_weeks - 1, "D"))
+        grid = np.zeros((n_weeks, 7), dtype=np.int64)
+        ords = _ordinals(days.index)
+        grid[(ords - first) // 7, (ords + 3) % 7] = days["건수"].to_numpy()
+        weeks = pd.Index((first + 7 * np.arange(n_weeks)).astype("datetime64[D]"), name="주 시작일")
+        return pd.DataFrame(grid, index=weeks, columns=list("월화수목금토일"))
+
+    # ----- 드릴다운 -----
+    def rows(self, event, start, end) -> np.ndarray:
+        """start <= 날짜 < end (일 서수) 인 행 label (날짜 순)."""
+        ordinals, labels, _, _ = self._events[event]
+        lo = np.searchsorted(ordinals, start, side="left")
+        hi = np.searchsorted(ordinals, end, side="left")
+        return labels[lo:hi]
+
+    def bucket_rows(self, event, unit, bucket) -> np.ndarray:
+        """bucket(버킷 시작일 date) 에 든 행 label."""
+        start = to_day_ordinal(bucket)
+        return self.rows(event, start, bucket_end(start, unit))
+
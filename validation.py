@@ -0,0 +1,133 @@
+"""
+대장 값 검증 (선언형 규칙, 벡터 연산).
+
+- 규칙은 아래 ALLOWED_VALUES / DATE_COLUMNS / NON_NEGATIVE / AMOUNT_RULE 표로 정의
+- 각 규칙은 컬럼 전체를 한 번에 검사 (문자열 규칙은 고유값만 검사한 뒤 행으로 펼침)
+- 결과는 오류가 있는 컬럼만 담은 {컬럼: bool 배열} 마스크 (행 순서 = 입력 frame 순서)
+
+전체 대장(로드/가져오기)과 에디터 변경분(저장 직전) 모두 같은 validate() 를 사용합니다.
+"""
+import numpy as np
+import pandas as pd
+
+from due_index import parse_dates_vectorized
+
+# 선택 컬럼 허용값 (에디터 SelectboxColumn 옵션과 동일)
+ALLOWED_VALUES = {
+    "운송편": ("", "항공", "선박", "핸드캐리"),
+    "자재준비": ("", "준비중", "완료"),
+}
+# 빈 값이거나 parse_date_safe 형식(YYYY-MM-DD, YYYY.MM.DD, YYYY/MM/DD)이어야 하는 날짜 컬럼
+DATE_COLUMNS = ("신청일자", "납기일", "납기일(예정)", "도면접수일", "샘플 완료일", "출하일")
+# 0 이상이어야 하는 숫자 컬럼
+NON_NEGATIVE = ("요청수량", "샘플단가", "샘플금액")
+# (금액, 수량, 단가): 금액 == 수량 × 단가
+AMOUNT_RULE = ("샘플금액", "요청수량", "샘플단가")
+
+
+class Rule:
+    """column 에 대해 check(frame) -> 오류 여부 bool 배열을 돌려주는 규칙. inputs 는 함께 참조하는 컬럼."""
+
+    def __init__(self, column, message, check, inputs=()):
+        self.column = column
+        self.message = message
+        self.check = check
+        self.inputs = tuple(inputs)
+
+
+def _per_unique(series: pd.Series, bad_values) -> np.ndarray:
+    """고유값 단위로 bad_values(고유값 배열 -> bool 배열)를 계산하고 행으로 펼친다."""
+    codes, uniques = pd.factorize(series.fillna("").astype(str).str.strip())
+    if not len(uniques):
+        return np.zeros(len(series), dtype=bool)
+    return np.asarray(bad_values(pd.Series(uniques)), dtype=bool)[codes]
+
+
+def _not_in(column, allowed):
+    allowed = set(allowed)
+    return lambda frame: _per_unique(frame[column], lambda u: ~u.isin(allowed))
+
+
+def _not_a_date(column):
+    return lambda frame: _per_unique(
+        frame[column], lambda u: (u != "").to_numpy() & np.isnat(parse_dates_vectorized(u)))
+
+
+def _numbers(frame, column):
+    return pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float)
+
+
+def _negative(column):
+    # 숫자로 읽히지 않는 값(NaN)도 오류
+    return lambda frame: ~(_numbers(frame, column) >= 0)
+
+
+def _amount_mismatch(amount, qty, price):
+    return lambda frame: ~np.isclose(_numbers(frame, amount), _numbers(frame, qty) * _numbers(frame, price))
+
+
+RULES = (
+    [Rule(col, f"허용값: {', '.join(v for v in values if v)}", _not_in(col, values))
+     for col, values in ALLOWED_VALUES.items()]
+    + [Rule(col, "날짜 형식 아님 (YYYY-MM-DD)", _not_a_date(col)) for col in DATE_COLUMNS]
+    + [Rule(col, "0 이상의 숫자여야 함", _negative(col)) for col in NON_NEGATIVE]
+    + [Rule(AMOUNT_RULE[0], f"{AMOUNT_RULE[1]}×{AMOUNT_RULE[2]} 와 다름", _amount_mismatch(*AMOUNT_RULE),
+            inputs=AMOUNT_RULE[1:])]
+)
+
+
+class ValidationResult:
+    """
+    mask:     {컬럼: bool 배열} - 오류가 하나라도 있는 컬럼만
+    messages: {컬럼: [메시지, ...]} - mask 의 각 컬럼에서 실패한 규칙 메시지
+    """
+
+    def __init__(self, index, mask, messages):
+        self.index = index
+        self.mask = mask
+        self.messages = messages
+
+    @property
+    def ok(self):
+        return not self.mask
+
+    def error_count(self):
+        return int(sum(m.sum() for m in self.mask.values()))
+
+    def row_mask(self) -> np.ndarray:
+        out = np.zeros(len(self.index), dtype=bool)
+        for m in self.mask.values():
+            out |= m
+        return out
+
+    def row_labels(self) -> pd.Series:
+        """행별 오류 컬럼 요약 ("운송편, 납기일"). 오류 없는 행은 빈 문자열."""
+        labels = np.full(len(self.index), "", dtype=object)
+        for col, m in self.mask.items():
+            labels[m] = np.where(labels[m] == "", col, labels[m] + ", " + col)
+        return pd.Series(labels, index=self.index)
+
+    def cells(self, limit=None):
+        """[(행 label, 컬럼, 메시지)] 목록 (컬럼 순)."""
+        out = []
+        for col, m in self.mask.items():
+            message = " / ".join(self.messages[col])
+            for pos in np.flatnonzero(m):
+                out.append((self.index[pos], col, message))
+                if limit and len(out) >= limit:
+                    return out
+        return out
+
+
+def validate(frame: pd.DataFrame, rules=RULES) -> ValidationResult:
+    """frame 에 있는 컬럼의 규칙만 적용. 없는 컬럼의 규칙은 건너뜀."""
+    mask, messages = {}, {}
+    for rule in rules:
+        if any(c not in frame.columns for c in (rule.column,) + rule.inputs):
+            continue
+        bad = rule.check(frame)
+        if bad.any():
+            mask[rule.column] = mask[rule.column] | bad if rule.column in mask else bad
+            messages.setdefault(rule.column, []).append(rule.message)
+    return ValidationResult(frame.index, mask, messages)
+